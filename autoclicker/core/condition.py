@@ -102,7 +102,7 @@ except ImportError:
          def file_exists(self, relative_path: str) -> bool: return os.path.exists(self.get_full_path(relative_path))
     def hex_to_rgb(hex_color: str) -> Tuple[int,int,int]: raise ImportError("color_utils not imported") # type: ignore
     def rgb_to_hex(rgb_color: Tuple[int,int,int]) -> str: raise ImportError("color_utils not imported") # type: ignore
-    def analyze_region_colors(img, targets, sampling) -> Dict[str, float]: return {}
+    def analyze_region_colors(img, targets, sampling, channel_order="RGB") -> Dict[str, float]: return {}
     ImageStorage = DummyImageStorage # type: ignore
 
 
@@ -1276,17 +1276,16 @@ class RegionColorCondition(Condition):
                 logger.debug("RegionColorCondition: Failed to capture region or captured empty image.")
                 return False
 
-            img_rgb = None
-            if region_image_np.shape[2] == 4: img_rgb = cv2.cvtColor(region_image_np, cv2.COLOR_BGRA2RGB)
-            elif region_image_np.shape[2] == 3: img_rgb = cv2.cvtColor(region_image_np, cv2.COLOR_BGR2RGB)
-            else: logger.warning(f"RegionColorCondition: Captured image has unexpected channel count: {region_image_np.shape[2]}"); return False
-            if img_rgb is None: return False
+            if region_image_np.ndim != 3 or region_image_np.shape[2] not in (3, 4):
+                logger.warning(f"RegionColorCondition: Captured image has unexpected shape: {region_image_np.shape}"); return False
+            # Match directly in the capture's BGR order instead of converting the whole region to RGB.
+            img_bgr = region_image_np[..., :3] if region_image_np.shape[2] == 4 else region_image_np
 
             targets_for_analysis: List[Tuple[Tuple[int,int,int], int]] = []
             for color_def in self.target_colors_list:
                 targets_for_analysis.append((color_def["rgb"], color_def["tolerance"]))
 
-            color_percentages = analyze_region_colors(img_rgb, targets_for_analysis, self.sampling_step)
+            color_percentages = analyze_region_colors(img_bgr, targets_for_analysis, self.sampling_step, channel_order="BGR")
             logger.debug(f"RegionColorCondition '{self.name}': Analyzed percentages: {color_percentages}")
 
             if self.condition_logic == "ANY_TARGET_MET_THRESHOLD":
@@ -159,20 +159,27 @@ class AIBrainManagementTab(ttk.Frame):
                 if self.monitored_conditions_tree.exists(iid_to_remove):
                     self.monitored_conditions_tree.delete(iid_to_remove)
 
+            ws_get = world_state.get
+            tree_insert = self.monitored_conditions_tree.insert
+            tree_set = self.monitored_conditions_tree.set
+            tree_item = self.monitored_conditions_tree.item
+
             for cond_obj in monitored_conditions:
                 if hasattr(cond_obj, 'id') and cond_obj.id in ids_to_add:
-                    current_state_val = world_state.get(cond_obj.id, False)
+                    cid = cond_obj.id
+                    current_state_val = ws_get(cid, False)
                     current_state_display = "TRUE" if current_state_val else "FALSE"
                     tag_to_apply = 'state_true' if current_state_val else 'state_false'
-                    self.monitored_conditions_tree.insert("", tk.END, iid=cond_obj.id, values=(cond_obj.name, cond_obj.id, cond_obj.type, current_state_display), tags=(tag_to_apply,))
+                    tree_insert("", tk.END, iid=cid, values=(cond_obj.name, cid, cond_obj.type, current_state_display), tags=(tag_to_apply,))
 
             for cond_obj in monitored_conditions:
                 if hasattr(cond_obj, 'id') and cond_obj.id in ids_to_update:
-                    current_state_val = world_state.get(cond_obj.id, False)
+                    cid = cond_obj.id
+                    current_state_val = ws_get(cid, False)
                     current_state_display = "TRUE" if current_state_val else "FALSE"
                     tag_to_apply = 'state_true' if current_state_val else 'state_false'
-                    self.monitored_conditions_tree.set(cond_obj.id, column="current_state", value=current_state_display)
-                    self.monitored_conditions_tree.item(cond_obj.id, tags=(tag_to_apply,))
+                    tree_set(cid, column="current_state", value=current_state_display)
+                    tree_item(cid, tags=(tag_to_apply,))
             if selected_iids:
                 valid_selection = [iid for iid in selected_iids if self.monitored_conditions_tree.exists(iid)]
                 if valid_selection:
@@ -210,24 +217,29 @@ class AIBrainManagementTab(ttk.Frame):
                 if self.ai_triggers_tree.exists(iid_to_remove):
                     self.ai_triggers_tree.delete(iid_to_remove)
 
+            fmt_cond_summary = self._format_ai_trigger_condition_summary
+            fmt_action_summary = self._format_trigger_action_summary
+            tree_insert = self.ai_triggers_tree.insert
+            tree_item = self.ai_triggers_tree.item
+
             for trigger_obj in ai_triggers_list:
                 if hasattr(trigger_obj, 'name') and trigger_obj.name in ids_to_add:
-                    cond_summary = self._format_ai_trigger_condition_summary(trigger_obj)
-                    action_summary = self._format_trigger_action_summary(trigger_obj)
+                    cond_summary = fmt_cond_summary(trigger_obj)
+                    action_summary = fmt_action_summary(trigger_obj)
                     enabled_text = "Yes" if trigger_obj.enabled else "No"
-                    tags = [] if trigger_obj.enabled else ['disabled']
-                    self.ai_triggers_tree.insert("", tk.END, iid=trigger_obj.name, values=(trigger_obj.name, cond_summary, action_summary, enabled_text), tags=tuple(tags))
+                    tags = () if trigger_obj.enabled else ('disabled',)
+                    tree_insert("", tk.END, iid=trigger_obj.name, values=(trigger_obj.name, cond_summary, action_summary, enabled_text), tags=tags)
 
             for trigger_obj in ai_triggers_list:
                 if hasattr(trigger_obj, 'name') and trigger_obj.name in ids_to_update:
-                    cond_summary = self._format_ai_trigger_condition_summary(trigger_obj)
-                    action_summary = self._format_trigger_action_summary(trigger_obj)
+                    cond_summary = fmt_cond_summary(trigger_obj)
+                    action_summary = fmt_action_summary(trigger_obj)
                     enabled_text = "Yes" if trigger_obj.enabled else "No"
-                    tags = [] if trigger_obj.enabled else ['disabled']
+                    tags = () if trigger_obj.enabled else ('disabled',)
 
-                    self.ai_triggers_tree.item(trigger_obj.name, 
-                                            values=(trigger_obj.name, cond_summary, action_summary, enabled_text), 
-                                            tags=tuple(tags))
+                    tree_item(trigger_obj.name, 
+                              values=(trigger_obj.name, cond_summary, action_summary, enabled_text), 
+                              tags=tags)
 
             if selected_iids:
                 valid_selection = [iid for iid in selected_iids if self.ai_triggers_tree.exists(iid)]
@@ -2,13 +2,17 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import logging
-from PIL import Image, ImageTk
+from PIL import Image
 import cv2
 import os
 import numpy as np
 import re
-import copy
-from typing import Callable, Optional, List, Dict, Any, Tuple
+import concurrent.futures
+import functools
+from typing import TYPE_CHECKING, Callable, Optional, List, Dict, Any, Set, Tuple
+
+if TYPE_CHECKING:
+    from PIL import ImageTk
 
 from utils.parsing_utils import parse_tuple_str
 
@@ -18,7 +22,7 @@ _UtilsSuccessfullyImported = False
 try:
     from utils.parsing_utils import parse_tuple_str
     from utils.color_utils import hex_to_rgb, rgb_to_hex
-    from utils.image_analysis import analyze_region_colors, get_top_n_colors_histogram_peaks, get_top_n_colors_kmeans
+    from utils.image_analysis import analyze_region_colors, get_top_n_colors_histogram_peaks, get_top_n_colors_kmeans, get_top_n_exact_colors
     _UtilsSuccessfullyImported = True
 except ImportError as e_utils:
     _UtilsSuccessfullyImported = False
@@ -31,7 +35,7 @@ except ImportError as e_utils:
     if 'rgb_to_hex' not in globals():
         def rgb_to_hex(r): return "#000000" # type: ignore
     if 'analyze_region_colors' not in globals():
-        def analyze_region_colors(i, t, s): # type: ignore
+        def analyze_region_colors(i, t, s, channel_order="RGB"): # type: ignore
             logger_cs_utils_fallback.warning("Using dummy analyze_region_colors")
             return {}
     if 'get_top_n_colors_histogram_peaks' not in globals():
@@ -42,6 +46,9 @@ except ImportError as e_utils:
         def get_top_n_colors_kmeans(i,n,s): # type: ignore
             logger_cs_utils_fallback.warning("Using dummy get_top_n_colors_kmeans")
             return []
+    if 'get_top_n_exact_colors' not in globals():
+        def get_top_n_exact_colors(i,n,s=1,m=None): # type: ignore
+            return None
 
 _BridgeImported = False
 try:
@@ -144,51 +151,193 @@ except ImportError:
     def preprocess_for_image_matching(img, params): return img # type: ignore
     def preprocess_for_ocr(img, params): return img # type: ignore
 
-_PytesseractAvailable_UI = False
-
-if _ConditionCoreImported:
+@functools.lru_cache(maxsize=1)
+def _get_pytesseract_ui() -> Optional[Any]:
+    if not _ConditionCoreImported: return None
     try:
         import pytesseract
         if hasattr(pytesseract.pytesseract, 'tesseract_cmd') and pytesseract.pytesseract.tesseract_cmd and os.path.exists(pytesseract.pytesseract.tesseract_cmd):
-            _PytesseractAvailable_UI = True
             try: pytesseract.get_tesseract_version()
-            except pytesseract.TesseractNotFoundError: _PytesseractAvailable_UI = False
-            except Exception: pass
-        else:
-            common_paths = [r'C:\Program Files\Tesseract-OCR\tesseract.exe', r'C:\Program Files (x86)\Tesseract-OCR\tesseract.exe']
-            found_path = next((p for p in common_paths if os.path.exists(p)), None)
-            if found_path: pytesseract.pytesseract.tesseract_cmd = found_path
-            try: pytesseract.get_tesseract_version(); _PytesseractAvailable_UI = True
-            except pytesseract.TesseractNotFoundError: logger.warning("ConditionSettings: Tesseract OCR not found or not configured.")
+            except pytesseract.TesseractNotFoundError: return None
             except Exception: pass
+            return pytesseract
+        common_paths = [r'C:\Program Files\Tesseract-OCR\tesseract.exe', r'C:\Program Files (x86)\Tesseract-OCR\tesseract.exe']
+        found_path = next((p for p in common_paths if os.path.exists(p)), None)
+        if found_path: pytesseract.pytesseract.tesseract_cmd = found_path
+        try: pytesseract.get_tesseract_version(); return pytesseract
+        except pytesseract.TesseractNotFoundError: logger.warning("ConditionSettings: Tesseract OCR not found or not configured.")
+        except Exception: pass
     except ImportError: logger.warning("ConditionSettings: Pytesseract library not found.")
     except Exception as e: logger.error(f"ConditionSettings: Error initializing Pytesseract: {e}")
+    return None
+
+
+def _is_odd_kernel_2(v_str: str) -> bool:
+    t = parse_tuple_str(v_str, 2, int)
+    return t is not None and all(k > 0 and k % 2 == 1 for k in t)
+
+def _is_positive_pair(v_str: str) -> bool:
+    t = parse_tuple_str(v_str, 2, int)
+    return t is not None and all(k > 0 for k in t)
+
+
+def _clone_json(obj: Any) -> Any:
+    if isinstance(obj, dict): return {k: _clone_json(v) for k, v in obj.items()}
+    if isinstance(obj, list): return [_clone_json(v) for v in obj]
+    return obj
 
 
+_INT_OR_PARTIAL_RE = re.compile(r'\s*[+-]?\d*\s*')
+_FLOAT_OR_PARTIAL_RE = re.compile(r'\s*[+-]?\d*\.?\d*\s*')
+_HEX6_RE = re.compile(r'#[0-9a-fA-F]{6}')
+
+@functools.lru_cache(maxsize=8)
+def _comma_sep_ints_re(expected_len: int) -> re.Pattern:
+    int_part = r'\s*[+-]?\d+\s*'
+    return re.compile(int_part + (',' + int_part) * (expected_len - 1))
+
 def is_integer_or_empty(value: str) -> bool:
-    if value == "": return True
-    try: int(value); return True
-    except ValueError: return False
+    return _INT_OR_PARTIAL_RE.fullmatch(value) is not None
 
 def is_float_or_empty(value: str) -> bool:
-    if value == "": return True
-    try: float(value); return True
-    except ValueError: return False
+    return _FLOAT_OR_PARTIAL_RE.fullmatch(value) is not None
 
 def is_comma_sep_ints(value: str, expected_len: int) -> bool:
     if value == "": return True
-    parts = value.split(',')
-    if len(parts) != expected_len: return False
-    try: [int(p.strip()) for p in parts]; return True
-    except ValueError: return False
+    if expected_len < 1: return False
+    return _comma_sep_ints_re(expected_len).fullmatch(value) is not None
+
+# Per-keystroke check, so partial pairs ("3", "3,") pass; get_settings validates the final value.
+_INT_TUPLE2_PARTIAL_FULLMATCH = re.compile(r'\s*[+-]?\d*\s*(,\s*[+-]?\d*\s*)?').fullmatch
+
+def _is_int_tuple2_or_empty(value: str) -> bool:
+    return _INT_TUPLE2_PARTIAL_FULLMATCH(value) is not None
+
+def _get_validate_commands(root: tk.Misc) -> Dict[str, str]:
+    # Registered on the Tk root so the Tcl commands outlive any single dialog.
+    vcmds = getattr(root, "_condition_settings_vcmds", None)
+    if vcmds is None:
+        vcmds = {
+            "int": root.register(is_integer_or_empty),
+            "float": root.register(is_float_or_empty),
+            "int_tuple2": root.register(_is_int_tuple2_or_empty),
+        }
+        root._condition_settings_vcmds = vcmds # type: ignore[attr-defined]
+    return vcmds
+
+
+def _set_var_raw(variable: tk.Variable, value: Any) -> None:
+    try: variable.set(value)
+    except: pass
+
+_VAR_SETTERS: Dict[type, Callable[[tk.Variable, Any], None]] = {
+    tk.BooleanVar: lambda v, x: v.set(bool(x)),
+    tk.StringVar: lambda v, x: v.set(str(x) if x is not None else ""),
+}
+
+# Widget-only entries in param_widgets that carry no condition parameter value.
+_SKIP_PARAM_KEYS = frozenset((
+    "preview_label", "recognized_text_label", "capture_button", "capture_region_btn", "browse_btn", "capture_save_btn",
+    "capture_ocr_btn", "preview_button", "separator", "browse_user_words_btn", "browse_anchor_btn", "capture_anchor_btn",
+    "capture_color_region_btn", "capture_overall_region_btn", "browse_ocr_user_words_btn", "multi_image_add_anchor_btn",
+    "multi_image_add_sub_btn", "multi_image_clear_button", "add_target_color_button", "edit_target_color_button",
+    "remove_target_color_button", "analyze_top_n_button", "analyze_targets_button",
+))
+
+_SWATCH_CACHE_MAX = 256
+_PREVIEW_PATH_KEYS = frozenset(("image_path", "anchor_image_path", "multi_anchor_image_path"))
+_BATCH_REFRESH_KEYS = _PREVIEW_PATH_KEYS | {"color_hex", "target_color_hex"}
+
+def _get_swatch_cache(root: tk.Misc) -> Dict[str, tk.PhotoImage]:
+    # Shared by every dialog on this root; trees keep their own references to the swatches they show.
+    cache = getattr(root, "_condition_settings_swatches", None)
+    if cache is None:
+        cache = {}
+        root._condition_settings_swatches = cache # type: ignore[attr-defined]
+    return cache
+
+
+# (kind, key, label, row, col, extra): extra is the BooleanVar attribute name for
+# "check" rows and the validator kind for "entry" rows.
+_IMAGE_PREPROCESSING_SPEC: Tuple[Tuple[str, str, str, int, int, Optional[str]], ...] = (
+    ("check", "grayscale", "Grayscale", 0, 0, "_grayscale_var"),
+    ("check", "binarization", "Binarization (Otsu)", 0, 2, "_binarization_var"),
+    ("check", "gaussian_blur", "Gaussian Blur", 1, 0, "_gaussian_blur_var"),
+    ("entry", "gaussian_blur_kernel", "Kernel(w,h):", 1, 1, "int_tuple2"),
+    ("check", "median_blur", "Median Blur", 1, 2, "_median_blur_var"),
+    ("entry", "median_blur_kernel", "Kernel(k):", 1, 3, "integer"),
+    ("check", "clahe", "CLAHE", 2, 0, "_clahe_var"),
+    ("entry", "clahe_clip_limit", "Clip Limit:", 2, 1, "float"),
+    ("entry", "clahe_tile_grid_size", "Tile(w,h):", 2, 3, "int_tuple2"),
+    ("check", "bilateral_filter", "Bilateral Filter", 3, 0, "_bilateral_filter_var"),
+    ("entry", "bilateral_d", "Diameter(d):", 3, 1, "integer"),
+    ("entry", "bilateral_sigma_color", "Sigma Color:", 4, 1, "float"),
+    ("entry", "bilateral_sigma_space", "Sigma Space:", 4, 3, "float"),
+    ("check", "canny_edges", "Canny Edges", 5, 0, "_canny_edges_var"),
+    ("entry", "canny_threshold1", "Threshold 1:", 5, 1, "float"),
+    ("entry", "canny_threshold2", "Threshold 2:", 5, 3, "float"),
+)
+
+
+_OCR_TEXT_TYPES = frozenset({TextOnScreenCondition.TYPE, TextInRelativeRegionCondition.TYPE})
+_COLOR_ANALYSIS_TYPES = frozenset({RegionColorCondition.TYPE})
+_REGION_CAPTURE_PREVIEW_TYPES = _OCR_TEXT_TYPES | _COLOR_ANALYSIS_TYPES
+_CAPTURE_TO_RGB_CODES = {1: cv2.COLOR_GRAY2RGB, 3: cv2.COLOR_BGR2RGB, 4: cv2.COLOR_BGRA2RGB}
+_MATCH_METHOD_D2I = {"Template": "template", "Feature": "feature"}
+_MATCH_METHOD_I2D = {"template": "Template", "feature": "Feature"}
+# Matching-method combobox keys and the condition type each one belongs to.
+_MATCH_METHOD_KEY_TYPES = {
+    "matching_method": ImageOnScreenCondition.TYPE,
+    "anchor_matching_method": TextInRelativeRegionCondition.TYPE,
+    "multi_anchor_match_method": MultiImageCondition.TYPE,
+    "multi_sub_image_match_method": MultiImageCondition.TYPE,
+}
+_REGION_PARAM_TYPES = frozenset({ColorAtPositionCondition.TYPE, ImageOnScreenCondition.TYPE, TextOnScreenCondition.TYPE, RegionColorCondition.TYPE, TextInRelativeRegionCondition.TYPE, MultiImageCondition.TYPE})
 
 
 class ConditionSettings(ttk.Frame):
+    _ANALYSIS_DEBOUNCE_MS = 150
+    _SCROLL_REFRESH_DELAY_MS = 30
+    _ANALYSIS_MAX_PIXELS = 200_000
+    _WRAPLENGTH_DELAY_MS = 50
+    _MI_ANCHOR_THUMB_MAX = 150
+    _MI_SUB_THUMB_SIZE = 80
+    _PREVIEW_IMAGE_CACHE_MAX = 8
+    _EXACT_TOP_N_MAX_DISTINCT = 256
+    _analysis_pool: Optional[concurrent.futures.ThreadPoolExecutor] = None
+    _preview_pool: Optional[concurrent.futures.ThreadPoolExecutor] = None
+    _filter_cache: Dict[frozenset, Tuple[Dict[str, Any], List[str], Dict[str, str]]] = {}
+    _default_params_cache: Dict[str, Dict[str, Any]] = {}
+    _PARAM_UI_BUILDER_NAMES: Dict[str, str] = {
+        NoneCondition.TYPE: "_create_none_params",
+        ColorAtPositionCondition.TYPE: "_create_color_at_position_params",
+        ImageOnScreenCondition.TYPE: "_create_image_on_screen_params",
+        TextOnScreenCondition.TYPE: "_create_text_on_screen_params",
+        WindowExistsCondition.TYPE: "_create_window_exists_params",
+        ProcessExistsCondition.TYPE: "_create_process_exists_params",
+        TextInRelativeRegionCondition.TYPE: "_create_text_in_relative_region_params",
+        RegionColorCondition.TYPE: "_create_region_color_params",
+        MultiImageCondition.TYPE: "_create_multi_image_params_ui",
+    }
+    _PAGE_WIDGET_DEFAULTS: Dict[str, Any] = {"_ref_point_widgets": ()}
+    _PARAM_COLLECTOR_NAMES: Dict[str, str] = {
+        ColorAtPositionCondition.TYPE: "_collect_color_at_position_params",
+        ImageOnScreenCondition.TYPE: "_collect_image_on_screen_params",
+        TextOnScreenCondition.TYPE: "_collect_text_on_screen_params",
+        WindowExistsCondition.TYPE: "_collect_window_exists_params",
+        ProcessExistsCondition.TYPE: "_collect_process_exists_params",
+        RegionColorCondition.TYPE: "_collect_region_color_params",
+        TextInRelativeRegionCondition.TYPE: "_collect_text_in_relative_region_params",
+        MultiImageCondition.TYPE: "_collect_multi_image_params",
+    }
+
     def __init__(self, master, condition_data: Optional[Dict[str, Any]] = None,
                  image_storage: Optional[ImageStorage] = None, # type: ignore
                  exclude_types: Optional[List[str]] = None):
         super().__init__(master)
         self.exclude_types = exclude_types if isinstance(exclude_types, list) else []
+        self._widgets_alive = True
+        self.bind("<Destroy>", self._on_self_destroy, add='+')
 
         self.canvas: Optional[tk.Canvas] = None
         self.param_frame: Optional[ttk.Frame] = None
@@ -196,6 +345,11 @@ class ConditionSettings(ttk.Frame):
         self._filtered_action_condition_types_display: List[str] = []
         self._filtered_action_condition_display_to_internal_map: Dict[str, str] = {}
         self.param_widgets: Dict[str, List[Any]] = {}
+        self._widget_role_cache: Dict[str, Tuple[List[Any], Tuple[Any, Any, Any]]] = {}
+        self._prefix_key_cache: Optional[Tuple[Dict[str, List[Any]], int, Dict[str, List[str]]]] = None
+        self._params_dirty = True
+        self._cached_ui_params: Optional[Tuple[Dict[str, List[Any]], Dict[str, Any]]] = None
+        self._dirty_traced_vars: set = set()
 
         self.grid_rowconfigure(0, weight=0) 
         self.grid_rowconfigure(1, weight=1) 
@@ -211,24 +365,38 @@ class ConditionSettings(ttk.Frame):
             error_label.grid(row=0, column=0, columnspan=3, padx=10, pady=10, sticky="nsew") # columnspan=3 để chiếm cả 3 cột đã định nghĩa
             logger.critical(error_msg)
 
-        self.vcmd_integer = self.register(is_integer_or_empty)
-        self.vcmd_float = self.register(is_float_or_empty)
-        self.vcmd_int_tuple2 = self.register(lambda P: is_comma_sep_ints(P, 2))
+        vcmds = _get_validate_commands(self._root())
+        self.vcmd_integer = vcmds["int"]
+        self.vcmd_float = vcmds["float"]
+        self.vcmd_int_tuple2 = vcmds["int_tuple2"]
+        self._entry_validate_options: Dict[str, Dict[str, Any]] = {
+            name: {"validate": "key", "validatecommand": (vcmd, "%P")}
+            for name, vcmd in (("integer", self.vcmd_integer), ("float", self.vcmd_float), ("int_tuple2", self.vcmd_int_tuple2))
+        }
 
-        self.initial_condition_data = copy.deepcopy(condition_data or {"type": NoneCondition.TYPE, "params": {}, "name": "", "id": None})
+        self.initial_condition_data = _clone_json(condition_data) if condition_data else {"type": NoneCondition.TYPE, "params": {}, "name": "", "id": None}
         if _ConditionCoreImported:
             self._current_condition_obj: Condition = create_condition(self.initial_condition_data)
         else:
             self._current_condition_obj: Condition = type("DummyCondFull", (object,), {"type":NoneCondition.TYPE, "params":{}, "id": self.initial_condition_data.get("id"), "name": self.initial_condition_data.get("name"), "is_monitored_by_ai_brain": False, "to_dict": lambda: self.initial_condition_data})() # type: ignore
 
         self.image_storage = image_storage if isinstance(image_storage, ImageStorage) else None # type: ignore
+        self._cwd_abs = os.path.abspath(".")
+        self._storage_abs = os.path.abspath(self.image_storage.storage_dir) if self.image_storage is not None else self._cwd_abs
+        self._cwd_prefix = os.path.join(self._cwd_abs, "")
         if not self.image_storage and _CaptureDepsImported:
              logger.warning("ConditionSettings initialized without a valid ImageStorage instance.")
 
         self._current_preview_image_pil: Optional[Image.Image] = None
-        self._current_preview_image_tk: Optional[ImageTk.PhotoImage] = None
+        self._preview_rgb_cache: Optional[Tuple[Image.Image, np.ndarray]] = None
+        self._preview_source_bgr: Optional[np.ndarray] = None
+        self._preview_image_cache: Dict[Tuple[str, float], Image.Image] = {}
+        self._current_preview_image_tk: Optional["ImageTk.PhotoImage"] = None
         self._last_captured_region_np: Optional[np.ndarray] = None
+        self._last_capture_pil: Optional[Tuple[np.ndarray, Optional[Image.Image]]] = None
+        self._last_capture_rgb_cache: Optional[Tuple[np.ndarray, np.ndarray]] = None
         self._recognized_text_var = tk.StringVar(value="Recognized text preview...")
+        self._ocr_preview_config_cache: Dict[Tuple[Any, Any, Any, Any], str] = {}
 
         self._grayscale_var = tk.BooleanVar()
         self._binarization_var = tk.BooleanVar()
@@ -248,26 +416,79 @@ class ConditionSettings(ttk.Frame):
         self._ocr_pp_adaptive_threshold_var = tk.BooleanVar()
         self._ocr_pp_median_blur_var = tk.BooleanVar()
 
-        self.target_color_swatch_images: List[ImageTk.PhotoImage] = []
-        self.analysis_swatch_images: List[ImageTk.PhotoImage] = []
+        self.target_color_swatch_images: List[tk.PhotoImage] = []
+        self._tc_tree_rows: Tuple[Optional[ttk.Treeview], List[Tuple[str, Optional[str], tuple, Optional[tk.PhotoImage]]]] = (None, [])
+        self._tc_iid_index: Dict[str, int] = {}
+        self.analysis_swatch_images: List[tk.PhotoImage] = []
+        self._swatch_cache: Dict[str, tk.PhotoImage] = _get_swatch_cache(self._root())
+        self._analysis_after_id: Optional[str] = None
+        self._analysis_future: Optional[concurrent.futures.Future] = None
+        self._analysis_generation = 0
+        self._preview_future: Optional[concurrent.futures.Future] = None
+        self._preview_generation = 0
+        self._ocr_future: Optional[concurrent.futures.Future] = None
+        self._ocr_generation = 0
+        self._analysis_scratch: Optional[np.ndarray] = None
+        self._analysis_scratch_future: Optional[concurrent.futures.Future] = None
+        self._analysis_cache_image: Optional[np.ndarray] = None
+        self._analysis_cache_key: Optional[tuple] = None
+        self._analysis_cache_results: Optional[List[Tuple[Tuple[int,int,int], float]]] = None
+        self._analysis_pending_cache: Optional[Tuple[np.ndarray, tuple]] = None
+        self._last_built_type: Optional[str] = None
+        self._scroll_refresh_after_id: Optional[str] = None
+        self._wheel_bound_widgets: Set[str] = set()
+        self._param_page_cache: Dict[str, Tuple[ttk.Frame, Dict[str, list], Dict[str, Any], int]] = {}
+        self._page_widgets: Dict[str, Any] = {}
+        self._param_page_type: Optional[str] = None
+        self._param_page_last_row = 0
+        self._wraplength_after_id: Optional[str] = None
+        self._display_retry_after_id: Optional[str] = None
+        self._last_swatch_state: Tuple[str, str] = ("", "")
+        self._ref_point_widgets: Tuple[tk.Widget, ...] = ()
+        self._pending_wraplength = 240
 
         self.multi_image_anchor_preview_image_pil: Optional[Image.Image] = None
-        self.multi_image_anchor_preview_image_tk: Optional[ImageTk.PhotoImage] = None
+        self.multi_image_anchor_preview_image_tk: Optional["ImageTk.PhotoImage"] = None
+        self.multi_image_anchor_thumb_pil: Optional[Image.Image] = None
         self.multi_image_sub_images_data: List[Dict[str, Any]] = []
+        self._mi_redraw_pending = False
+        self._mi_last_fp: Optional[tuple] = None
+        self._mi_canvas_items: Tuple[Optional[tk.Canvas], Optional[int], List[int]] = (None, None, [])
+        self._mi_last_fp_refs: List[Any] = []
+        self._mi_anchor_thumb: Optional[Tuple[Image.Image, int, "ImageTk.PhotoImage"]] = None
 
         self.grid_rowconfigure(1, weight=1)
         self.grid_columnconfigure(1, weight=1)
 
         ttk.Label(self, text="Condition Type:").grid(row=0, column=0, padx=5, pady=(5,0), sticky=tk.W)
 
-        self._filtered_condition_type_settings: Dict[str, Any] = {
-            k: v for k, v in CORE_CONDITION_TYPE_SETTINGS.items() if k not in self.exclude_types
+        filter_key = frozenset(self.exclude_types)
+        cached_filter = ConditionSettings._filter_cache.get(filter_key)
+        if cached_filter is None:
+            filtered_settings: Dict[str, Any] = {
+                k: v for k, v in CORE_CONDITION_TYPE_SETTINGS.items() if k not in filter_key
+            }
+            cached_filter = (
+                filtered_settings,
+                [settings["display_name"] for settings in filtered_settings.values()],
+                {settings["display_name"]: type_key for type_key, settings in filtered_settings.items()},
+            )
+            ConditionSettings._filter_cache[filter_key] = cached_filter
+        # Shared between instances with the same exclude_types; treat as read-only.
+        self._filtered_condition_type_settings: Dict[str, Any] = cached_filter[0]
+        self._filtered_action_condition_types_display: List[str] = cached_filter[1]
+        self._filtered_action_condition_display_to_internal_map: Dict[str, str] = cached_filter[2]
+        self._param_ui_builders: Dict[str, Callable[[], None]] = {
+            type_key: getattr(self, method_name) for type_key, method_name in self._PARAM_UI_BUILDER_NAMES.items()
+            if type_key in self._filtered_condition_type_settings and hasattr(self, method_name)
+        }
+        self._param_collectors: Dict[str, Callable[[Callable[..., Any], Dict[str, Any]], None]] = {
+            type_key: getattr(self, method_name) for type_key, method_name in self._PARAM_COLLECTOR_NAMES.items()
+            if type_key in self._filtered_condition_type_settings
         }
-        self._filtered_action_condition_types_display: List[str] = [
-            settings["display_name"] for settings in self._filtered_condition_type_settings.values()
-        ]
-        self._filtered_action_condition_display_to_internal_map: Dict[str, str] = {
-            settings["display_name"]: type_key for type_key, settings in self._filtered_condition_type_settings.items()
+        self._type_table: Dict[str, Tuple[bool, Optional[Callable[[], None]]]] = {
+            type_key: (bool(settings.get("show_preview", False)), self._param_ui_builders.get(type_key))
+            for type_key, settings in self._filtered_condition_type_settings.items()
         }
 
         initial_display_type = self._filtered_action_condition_types_display[0] if self._filtered_action_condition_types_display else "Error: No Types"
@@ -275,6 +496,8 @@ class ConditionSettings(ttk.Frame):
             initial_display_type = self._filtered_condition_type_settings[self._current_condition_obj.type]["display_name"]
 
         self.type_var = tk.StringVar(value=initial_display_type)
+        self._current_type_internal = self._filtered_action_condition_display_to_internal_map.get(initial_display_type, NoneCondition.TYPE)
+        self.type_var.trace_add('write', self._on_type_var_changed)
         self.type_combobox = ttk.Combobox(self, textvariable=self.type_var,
                                           values=self._filtered_action_condition_types_display,
                                           state="readonly", width=30)
@@ -298,35 +521,56 @@ class ConditionSettings(ttk.Frame):
             self._on_type_selected()
 
     def _on_param_frame_configure(self, event: Optional[tk.Event] = None) -> None:
-        if self.canvas and self.canvas.winfo_exists(): 
-            self.canvas.after_idle(self._update_scroll_region)
+        self._request_scroll_refresh()
+
+    def _on_self_destroy(self, event: tk.Event) -> None:
+        if event.widget is self: self._widgets_alive = False
 
     def _on_canvas_configure(self, event: Optional[tk.Event] = None) -> None:
-        if not (self.canvas and self.canvas.winfo_exists()): return 
+        if not (self._widgets_alive and self.canvas): return 
         canvas_width = self.canvas.winfo_width()
         if hasattr(self,'_param_frame_window_id') and self._param_frame_window_id:
              if canvas_width > 1 :
                 self.canvas.itemconfigure(self._param_frame_window_id, width=canvas_width)
-        self.canvas.after_idle(self._update_scroll_region)
+        self._request_scroll_refresh()
+
+    def _request_scroll_refresh(self) -> None:
+        if self._scroll_refresh_after_id is not None: return
+        try: self._scroll_refresh_after_id = self.after(self._SCROLL_REFRESH_DELAY_MS, self._do_scroll_refresh)
+        except tk.TclError: self._scroll_refresh_after_id = None
+
+    def _do_scroll_refresh(self) -> None:
+        self._scroll_refresh_after_id = None
+        self._update_scroll_region()
 
     def _update_scroll_region(self) -> None:
-        if hasattr(self,'canvas') and self.canvas and self.canvas.winfo_exists() and \
-           hasattr(self,'param_frame') and self.param_frame and self.param_frame.winfo_exists():
+        # canvas and the current param_frame live exactly as long as self.
+        if self._widgets_alive and self.canvas and self.param_frame:
             self.param_frame.update_idletasks()
             content_height = self.param_frame.winfo_reqheight()
             canvas_width = self.canvas.winfo_width()
             self.canvas.configure(scrollregion=(0, 0, canvas_width, max(1, content_height)))
 
     def _bind_mouse_wheel(self, widget: tk.Widget) -> None:
-        if widget and widget.winfo_exists():
+        if widget and str(widget) not in self._wheel_bound_widgets and widget.winfo_exists():
+            self._wheel_bound_widgets.add(str(widget))
             try:
                 widget.bind("<MouseWheel>", self._on_mousewheel, add='+');
                 widget.bind("<Button-4>", self._on_mousewheel, add='+');
                 widget.bind("<Button-5>", self._on_mousewheel, add='+')
             except tk.TclError: pass
 
+    def _bind_new_widget_wheel(self, *widgets: tk.Widget) -> None:
+        bound = self._wheel_bound_widgets
+        for widget in widgets:
+            bound.add(str(widget))
+            widget.bind("<MouseWheel>", self._on_mousewheel, add='+')
+            widget.bind("<Button-4>", self._on_mousewheel, add='+')
+            widget.bind("<Button-5>", self._on_mousewheel, add='+')
+
     def _unbind_mouse_wheel(self, widget: tk.Widget) -> None:
          if widget and widget.winfo_exists():
+            self._wheel_bound_widgets.discard(str(widget))
             try:
                 widget.unbind("<MouseWheel>");
                 widget.unbind("<Button-4>");
@@ -344,20 +588,61 @@ class ConditionSettings(ttk.Frame):
             except tk.TclError: pass
         return None
 
+    def _get_swatch_photo(self, hex_color: str) -> tk.PhotoImage:
+        photo = self._swatch_cache.get(hex_color)
+        if photo is None:
+            photo = tk.PhotoImage(master=self, width=16, height=12)
+            photo.put("#%02x%02x%02x" % hex_to_rgb(hex_color), to=(0, 0, 16, 12))
+            if len(self._swatch_cache) >= _SWATCH_CACHE_MAX: self._swatch_cache.pop(next(iter(self._swatch_cache)))
+            self._swatch_cache[hex_color] = photo
+        return photo
+
     def _add_swatch_to_tree(self, tree_widget: ttk.Treeview, image_list_ref: list, hex_color: str, values_tuple: tuple) -> None:
         if not (tree_widget and tree_widget.winfo_exists()):
             logger.warning("_add_swatch_to_tree: Tree widget does not exist.")
             return
         try:
-            r, g, b = hex_to_rgb(hex_color)
-            swatch_img_pil = Image.new("RGB", (16, 12), (r, g, b))
-            photo = ImageTk.PhotoImage(swatch_img_pil)
+            photo = self._get_swatch_photo(hex_color)
             image_list_ref.append(photo)
             tree_widget.insert("", tk.END, image=photo, values=values_tuple)
         except Exception as e:
             logger.error(f"Error creating/adding swatch for {hex_color}: {e}", exc_info=True)
             tree_widget.insert("", tk.END, text="ERR", values=values_tuple)
 
+    def _request_color_analysis(self, *args: Any, **kwargs: Any) -> None:
+        if self._analysis_after_id:
+            try: self.after_cancel(self._analysis_after_id)
+            except tk.TclError: pass
+        self._analysis_after_id = self.after(self._ANALYSIS_DEBOUNCE_MS, lambda: self._run_requested_color_analysis(*args, **kwargs))
+
+    def _run_color_analysis_now(self, *args: Any, **kwargs: Any) -> None:
+        # Explicit button clicks skip the debounce; any queued request is superseded.
+        if self._analysis_after_id:
+            try: self.after_cancel(self._analysis_after_id)
+            except tk.TclError: pass
+            self._analysis_after_id = None
+        self._update_color_analysis_display(*args, **kwargs)
+
+    def _cancel_color_analysis(self) -> None:
+        if self._analysis_after_id:
+            try: self.after_cancel(self._analysis_after_id)
+            except tk.TclError: pass
+            self._analysis_after_id = None
+        self._analysis_generation += 1
+        if self._analysis_future is not None:
+            self._analysis_future.cancel()
+            self._analysis_future = None
+
+    def _run_requested_color_analysis(self, *args: Any, **kwargs: Any) -> None:
+        self._analysis_after_id = None
+        self._update_color_analysis_display(*args, **kwargs)
+
+    @classmethod
+    def _get_analysis_pool(cls) -> concurrent.futures.ThreadPoolExecutor:
+        if cls._analysis_pool is None:
+            cls._analysis_pool = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="ColorAnalysis")
+        return cls._analysis_pool
+
     def _update_color_analysis_display(self, image_for_analysis_np_rgb: Optional[np.ndarray],
                                       colors_to_analyze_defs: Optional[List[Dict[str,Any]]] = None,
                                       analyze_top_n: Optional[int] = None):
@@ -366,68 +651,179 @@ class ConditionSettings(ttk.Frame):
             logger.debug("Color analysis tree not found or not visible, skipping update.")
             return
 
-        for item in self.color_analysis_tree.get_children():
-            self.color_analysis_tree.delete(item)
-        self.analysis_swatch_images.clear()
+        self._analysis_generation += 1
+        if self._analysis_future is not None:
+            self._analysis_future.cancel()
+            self._analysis_future = None
 
         if image_for_analysis_np_rgb is None:
-            if analyze_top_n is not None or colors_to_analyze_defs is not None:
-                self._add_swatch_to_tree(self.color_analysis_tree, self.analysis_swatch_images, "#808080", ("N/A", "No image in preview"))
+            placeholder = ("#808080", ("N/A", "No image in preview")) if analyze_top_n is not None or colors_to_analyze_defs is not None else None
+            self._render_analysis_results(None, placeholder=placeholder)
             return
 
+        sampling_str = self._get_widget_value("sampling_step", "1")
+        sampling = int(sampling_str) if sampling_str and sampling_str.isdigit() else 1
+        sampling = max(1, sampling)
+
+        defs_key = tuple((d.get("hex"), d.get("tolerance")) for d in colors_to_analyze_defs) if colors_to_analyze_defs is not None else None
+        cache_key = (sampling, defs_key, analyze_top_n)
+        if self._analysis_cache_results is not None and cache_key == self._analysis_cache_key and \
+           self._is_same_analysis_image(image_for_analysis_np_rgb):
+            logger.debug("Color analysis inputs unchanged, re-rendering cached results.")
+            self._render_analysis_results(self._analysis_cache_results)
+            return
+        self._analysis_pending_cache = (image_for_analysis_np_rgb, cache_key) if isinstance(image_for_analysis_np_rgb, np.ndarray) else None
+
+        if isinstance(image_for_analysis_np_rgb, np.ndarray) and image_for_analysis_np_rgb.ndim == 3:
+            sampling = self._effective_analysis_step(image_for_analysis_np_rgb.shape[0], image_for_analysis_np_rgb.shape[1], sampling)
+        if sampling > 1 and isinstance(image_for_analysis_np_rgb, np.ndarray) and image_for_analysis_np_rgb.ndim == 3:
+            image_for_analysis_np_rgb = self._downsample_into_scratch(image_for_analysis_np_rgb, sampling)
+            sampling = 1
+
+        generation = self._analysis_generation
+        future = self._get_analysis_pool().submit(self._compute_color_analysis, image_for_analysis_np_rgb, colors_to_analyze_defs, analyze_top_n, sampling)
+        self._analysis_future = future
+        if image_for_analysis_np_rgb is self._analysis_scratch: self._analysis_scratch_future = future
+        future.add_done_callback(lambda f: self._schedule_analysis_render(generation, f))
+
+    @classmethod
+    def _effective_analysis_step(cls, height: int, width: int, sampling: int) -> int:
+        # Large previews are decimated further by stride (not resampled), so no blended
+        # colours are introduced and the percentages stay representative of the region.
+        while -(-height // sampling) * -(-width // sampling) > cls._ANALYSIS_MAX_PIXELS:
+            sampling += 1
+        return sampling
+
+    def _is_same_analysis_image(self, image: Any) -> bool:
+        cached = self._analysis_cache_image
+        if cached is None: return False
+        if cached is image: return True
+        return isinstance(image, np.ndarray) and image.shape == cached.shape and image.dtype == cached.dtype and np.array_equal(image, cached)
+
+    def _invalidate_color_analysis_cache(self) -> None:
+        self._analysis_cache_image = None
+        self._analysis_cache_key = None
+        self._analysis_cache_results = None
+        self._analysis_pending_cache = None
+
+    def _downsample_into_scratch(self, image_np: np.ndarray, sampling: int) -> np.ndarray:
+        sampled_view = image_np[::sampling, ::sampling]
+        scratch = self._analysis_scratch
+        # A superseded job may still be reading the buffer on the worker even though its result will be
+        # discarded by the generation check; never overwrite it under a job that has not finished.
+        owner = self._analysis_scratch_future
+        if scratch is None or scratch.shape != sampled_view.shape or scratch.dtype != sampled_view.dtype or \
+           (owner is not None and not owner.done()):
+            scratch = np.empty(sampled_view.shape, dtype=sampled_view.dtype)
+            self._analysis_scratch = scratch
+        np.copyto(scratch, sampled_view)
+        return scratch
+
+    @staticmethod
+    def _compute_color_analysis(image_np_rgb: np.ndarray,
+                                colors_to_analyze_defs: Optional[List[Dict[str,Any]]],
+                                analyze_top_n: Optional[int],
+                                sampling: int) -> List[Tuple[Tuple[int,int,int], float]]:
         analysis_results_tuples: List[Tuple[Tuple[int,int,int], float]] = []
-        try:
-            sampling_str = self._get_widget_value("sampling_step", "1")
-            sampling = int(sampling_str) if sampling_str and sampling_str.isdigit() else 1
-            sampling = max(1, sampling)
+        if colors_to_analyze_defs is not None:
+            logger.debug(f"Analyzing target colors: {colors_to_analyze_defs}")
+            targets_for_func: List[Tuple[Tuple[int,int,int], int]] = []
+            for color_def in colors_to_analyze_defs:
+                try:
+                    rgb_tuple_val = color_def.get("rgb")
+                    if not (isinstance(rgb_tuple_val, tuple) and len(rgb_tuple_val) == 3):
+                        rgb_tuple_val = hex_to_rgb(str(color_def.get("hex")))
+
+                    tol = int(color_def.get("tolerance", 10))
+                    targets_for_func.append((rgb_tuple_val, tol))
+                except (ValueError, TypeError) as e_conv:
+                    logger.warning(f"Skipping invalid target color definition for analysis: {color_def}, error: {e_conv}")
+                    continue
 
-            if colors_to_analyze_defs is not None:
-                logger.debug(f"Analyzing target colors: {colors_to_analyze_defs}")
-                targets_for_func: List[Tuple[Tuple[int,int,int], int]] = []
+            if targets_for_func:
+                percentages_dict = analyze_region_colors(image_np_rgb, targets_for_func, sampling)
                 for color_def in colors_to_analyze_defs:
-                    try:
-                        rgb_tuple_val = color_def.get("rgb")
-                        if not (isinstance(rgb_tuple_val, tuple) and len(rgb_tuple_val) == 3):
-                            rgb_tuple_val = hex_to_rgb(str(color_def.get("hex")))
-
-                        tol = int(color_def.get("tolerance", 10))
-                        targets_for_func.append((rgb_tuple_val, tol))
-                    except (ValueError, TypeError) as e_conv:
-                        logger.warning(f"Skipping invalid target color definition for analysis: {color_def}, error: {e_conv}")
-                        continue
-
-                if targets_for_func:
-                    percentages_dict = analyze_region_colors(image_for_analysis_np_rgb, targets_for_func, sampling)
-                    for color_def in colors_to_analyze_defs:
-                        hex_key = str(color_def.get("hex"))
-                        rgb_val = color_def.get("rgb")
-                        if not rgb_val:
-                            try: rgb_val = hex_to_rgb(hex_key)
-                            except: continue
-                        analysis_results_tuples.append((rgb_val, percentages_dict.get(hex_key, 0.0)))
-                else:
-                    logger.debug("No valid target colors provided to analyze_region_colors function.")
+                    hex_key = str(color_def.get("hex"))
+                    rgb_val = color_def.get("rgb")
+                    if not rgb_val:
+                        try: rgb_val = hex_to_rgb(hex_key)
+                        except: continue
+                    analysis_results_tuples.append((rgb_val, percentages_dict.get(hex_key, 0.0)))
+            else:
+                logger.debug("No valid target colors provided to analyze_region_colors function.")
 
-            elif analyze_top_n is not None and analyze_top_n > 0:
-                logger.debug(f"Analyzing Top {analyze_top_n} colors.")
+        elif analyze_top_n is not None and analyze_top_n > 0:
+            logger.debug(f"Analyzing Top {analyze_top_n} colors.")
+            exact_results = get_top_n_exact_colors(image_np_rgb, analyze_top_n, sampling, ConditionSettings._EXACT_TOP_N_MAX_DISTINCT)
+            if exact_results is not None:
+                analysis_results_tuples = exact_results
+            else:
                 bins_p_channel = 16
                 peak_dist_f = 1.0
-                analysis_results_tuples = get_top_n_colors_histogram_peaks(image_for_analysis_np_rgb, analyze_top_n, bins_p_channel, sampling, peak_dist_f)
+                analysis_results_tuples = get_top_n_colors_histogram_peaks(image_np_rgb, analyze_top_n, bins_p_channel, sampling, peak_dist_f)
+        return analysis_results_tuples
+
+    def _schedule_analysis_render(self, generation: int, future: concurrent.futures.Future) -> None:
+        # Runs on the worker thread (or inline if already done); hand the result back to Tk.
+        if future.cancelled(): return
+        try:
+            self.after(0, self._on_color_analysis_done, generation, future)
+        except (tk.TclError, RuntimeError) as e:
+            logger.debug(f"Could not schedule color analysis render (widget likely destroyed): {e}")
+
+    def _on_color_analysis_done(self, generation: int, future: concurrent.futures.Future) -> None:
+        if generation != self._analysis_generation:
+            logger.debug("Discarding stale color analysis result.")
+            return
+        self._analysis_future = None
+        try:
+            results = future.result()
+        except Exception as e:
+            logger.error(f"Error during color analysis display update logic: {e}", exc_info=True)
+            self._render_analysis_results(None, placeholder=("#FF0000", ("Error", "Analysis failed")))
+            return
+        if self._analysis_pending_cache is not None:
+            self._analysis_cache_image, self._analysis_cache_key = self._analysis_pending_cache
+            self._analysis_cache_results = results
+            self._analysis_pending_cache = None
+        self._render_analysis_results(results)
+
+    def _render_analysis_results(self, analysis_results_tuples: Optional[List[Tuple[Tuple[int,int,int], float]]],
+                                 placeholder: Optional[Tuple[str, tuple]] = None) -> None:
+        if not (hasattr(self, 'color_analysis_tree') and self.color_analysis_tree and self.color_analysis_tree.winfo_exists()):
+            return
+
+        tree = self.color_analysis_tree
+        children = tree.get_children()
+        if children: tree.delete(*children)
+        self.analysis_swatch_images.clear()
+
+        if analysis_results_tuples is None:
+            if placeholder: self._add_swatch_to_tree(tree, self.analysis_swatch_images, placeholder[0], placeholder[1])
+            return
 
+        try:
             if not analysis_results_tuples:
                 logger.debug("No analysis results to display (empty list from analysis function).")
-                self._add_swatch_to_tree(self.color_analysis_tree, self.analysis_swatch_images, "#808080", ("N/A", "No dominant colors or error."))
+                self._add_swatch_to_tree(tree, self.analysis_swatch_images, "#808080", ("N/A", "No dominant colors or error."))
             else:
                 logger.debug(f"Displaying {len(analysis_results_tuples)} analysis results in tree.")
-                for (r,g,b), percentage in analysis_results_tuples:
-                    hex_color = rgb_to_hex((r,g,b))
-                    self._add_swatch_to_tree(self.color_analysis_tree, self.analysis_swatch_images, hex_color, (hex_color, f"{percentage:.2f}%"))
+                rows = [(rgb_to_hex(tuple(rgb)), percentage) for rgb, percentage in analysis_results_tuples]
+                get_photo = self._get_swatch_photo; tree_insert = tree.insert
+                photos = [get_photo(hex_color) for hex_color, _ in rows]
+                self.analysis_swatch_images.extend(photos)
+                for (hex_color, percentage), photo in zip(rows, photos):
+                    tree_insert("", tk.END, image=photo, values=(hex_color, f"{percentage:.2f}%"))
         except Exception as e:
             logger.error(f"Error during color analysis display update logic: {e}", exc_info=True)
-            self._add_swatch_to_tree(self.color_analysis_tree, self.analysis_swatch_images, "#FF0000", ("Error", "Analysis failed"))
+            self._add_swatch_to_tree(tree, self.analysis_swatch_images, "#FF0000", ("Error", "Analysis failed"))
+
 
+    def _on_type_var_changed(self, *_: Any) -> None:
+        # Hot preview paths read the internal type from here instead of round-tripping through Tcl.
+        self._current_type_internal = self._filtered_action_condition_display_to_internal_map.get(self.type_var.get(), NoneCondition.TYPE)
 
-    def _on_type_selected(self, event: Optional[tk.Event] = None) -> None:
+    def _on_type_selected(self, event: Optional[tk.Event] = None, force: bool = False) -> None:
         if not hasattr(self, '_filtered_action_condition_display_to_internal_map') or \
            not self._filtered_action_condition_display_to_internal_map:
             logger.error("ConditionSettings._on_type_selected: Filtered type map not initialized. Cannot proceed.")
@@ -440,13 +836,14 @@ class ConditionSettings(ttk.Frame):
         selected_internal_type = self._filtered_action_condition_display_to_internal_map.get(selected_display_key, NoneCondition.TYPE)
         logger.debug(f"ConditionSettings: Type selected: '{selected_display_key}' (Internal: '{selected_internal_type}')")
 
+        if not force and selected_internal_type == self._last_built_type and \
+           self.param_frame and self.param_frame.winfo_exists() and self.param_frame.winfo_children():
+            return
+        self._last_built_type = None; self._params_dirty = True
+
+        cached_page = None
         if hasattr(self, 'param_frame') and self.param_frame and self.param_frame.winfo_exists():
-            for widget in list(self.param_frame.winfo_children()):
-                self._unbind_mouse_wheel(widget)
-                try:
-                    widget.destroy()
-                except tk.TclError: pass
-                except Exception as e: logger.warning(f"Error destroying old param widget {widget}: {e}")
+            cached_page = self._swap_param_page(selected_internal_type)
         else:
             if self.canvas and self.canvas.winfo_exists():
                 self.param_frame = ttk.Frame(self.canvas)
@@ -461,29 +858,32 @@ class ConditionSettings(ttk.Frame):
                  return
 
 
-        self.param_widgets = {}
+        if cached_page is None: self.param_widgets = {}
         self.target_color_swatch_images.clear()
         self.analysis_swatch_images.clear()
-        self.multi_image_sub_images_data.clear()
-        self.multi_image_anchor_preview_image_pil = None
+        self.multi_image_sub_images_data = []
+        self._set_multi_image_anchor(None)
         self.multi_image_anchor_preview_image_tk = None
 
 
-        if hasattr(self, 'param_frame') and self.param_frame and self.param_frame.winfo_exists():
+        if cached_page is None and hasattr(self, 'param_frame') and self.param_frame and self.param_frame.winfo_exists():
             cols, rows = self.param_frame.grid_size()
-            for i in range(cols): self.param_frame.grid_columnconfigure(i, weight=0)
-            for i in range(rows): self.param_frame.grid_rowconfigure(i, weight=0)
+            if cols: self.param_frame.grid_columnconfigure(tuple(range(cols)), weight=0)
+            if rows: self.param_frame.grid_rowconfigure(tuple(range(rows)), weight=0)
 
 
-        create_func = self._filtered_condition_type_settings.get(selected_internal_type, {}).get("create_params_ui")
+        show_preview_area, create_func = self._type_table.get(selected_internal_type, (False, None))
         last_param_row_index = 0
 
-        if create_func and callable(create_func):
+        if cached_page is not None:
+            last_param_row_index = cached_page[3]
+            self._param_page_type = selected_internal_type
+        elif create_func:
             try:
-                create_func(self)
+                create_func()
                 if hasattr(self, 'param_frame') and self.param_frame and self.param_frame.winfo_exists():
-                    self.param_frame.update_idletasks()
                     last_param_row_index = self.param_frame.grid_size()[1]
+                self._param_page_type = selected_internal_type
             except Exception as e:
                  logger.error(f"Error creating UI for condition type '{selected_internal_type}': {e}.", exc_info=True)
                  if hasattr(self, 'param_frame') and self.param_frame and self.param_frame.winfo_exists():
@@ -495,8 +895,8 @@ class ConditionSettings(ttk.Frame):
                  no_param_label.grid(row=0, column=0, columnspan=4, sticky="w", padx=5, pady=5)
                  self.param_widgets["_no_params_label_"] = [no_param_label]
              last_param_row_index = 1
-
-        show_preview_area = self._filtered_condition_type_settings.get(selected_internal_type, {}).get("show_preview", False)
+             self._param_page_type = selected_internal_type
+        self._param_page_last_row = last_param_row_index
 
         if not (hasattr(self, '_preview_container_frame') and self._preview_container_frame and self._preview_container_frame.winfo_exists()):
             self._create_preview_area_widgets()
@@ -509,7 +909,7 @@ class ConditionSettings(ttk.Frame):
                 self._preview_container_frame.grid(row=last_param_row_index, column=0, columnspan=4, padx=5, pady=10, sticky="nsew")
                 last_param_row_index += 1
             
-            if selected_internal_type == TextOnScreenCondition.TYPE or selected_internal_type == TextInRelativeRegionCondition.TYPE:
+            if selected_internal_type in _OCR_TEXT_TYPES:
                 if hasattr(self, 'recognized_text_label') and self.recognized_text_label.winfo_exists():
                      self.recognized_text_label.grid()
                 self._recognized_text_var.set("Recognized text preview...")
@@ -523,13 +923,18 @@ class ConditionSettings(ttk.Frame):
             self._clear_preview()
             self._recognized_text_var.set("")
 
-        if selected_internal_type == RegionColorCondition.TYPE and show_preview_area:
+        if show_preview_area and selected_internal_type in _COLOR_ANALYSIS_TYPES:
             if hasattr(self, '_color_analysis_frame_container') and self._color_analysis_frame_container: 
                 self._color_analysis_frame_container.grid(row=last_param_row_index, column=0, columnspan=4, padx=5, pady=5, sticky="ew")
-            self.after_idle(lambda: self._update_color_analysis_display(None))
+            self._request_color_analysis(None)
         elif hasattr(self, '_color_analysis_frame_container') and self._color_analysis_frame_container: 
             self._color_analysis_frame_container.grid_remove()
-            self.after_idle(lambda: self._update_color_analysis_display(None))
+            self._cancel_color_analysis()
+            tree = getattr(self, 'color_analysis_tree', None)
+            if tree and tree.winfo_exists():
+                children = tree.get_children()
+                if children: tree.delete(*children)
+            self.analysis_swatch_images.clear()
 
         params_to_populate = {}
         if self._current_condition_obj and hasattr(self._current_condition_obj, 'type') and self._current_condition_obj.type == selected_internal_type:
@@ -539,38 +944,102 @@ class ConditionSettings(ttk.Frame):
             existing_name = self._current_condition_obj.name if self._current_condition_obj and hasattr(self._current_condition_obj, 'name') else None
             existing_is_monitored = self._current_condition_obj.is_monitored_by_ai_brain if self._current_condition_obj and hasattr(self._current_condition_obj, 'is_monitored_by_ai_brain') else False
 
-            temp_default_cond_data = {
-                "type": selected_internal_type, "params": {}, "id": existing_id, "name": existing_name,
-                "is_monitored_by_ai_brain": existing_is_monitored
-            }
-            default_cond_for_new_type = create_condition(temp_default_cond_data) # type: ignore
-            params_to_populate = default_cond_for_new_type.params if default_cond_for_new_type and hasattr(default_cond_for_new_type, 'params') else {}
-            if not (self.initial_condition_data and self.initial_condition_data.get("type") == selected_internal_type):
-                 self._current_condition_obj = default_cond_for_new_type # type: ignore
+            if self.initial_condition_data and self.initial_condition_data.get("type") == selected_internal_type:
+                params_to_populate = _clone_json(self._default_params_for_type(selected_internal_type))
+            else:
+                temp_default_cond_data = {
+                    "type": selected_internal_type, "params": {}, "id": existing_id, "name": existing_name,
+                    "is_monitored_by_ai_brain": existing_is_monitored
+                }
+                default_cond_for_new_type = create_condition(temp_default_cond_data) # type: ignore
+                params_to_populate = default_cond_for_new_type.params if default_cond_for_new_type and hasattr(default_cond_for_new_type, 'params') else {}
+                self._current_condition_obj = default_cond_for_new_type # type: ignore
 
 
         self._populate_params(params_to_populate)
+        self._last_built_type = selected_internal_type
 
-        if hasattr(self, 'canvas') and self.canvas and self.canvas.winfo_exists(): 
-            self.canvas.after_idle(self._update_scroll_region)
+        self._request_scroll_refresh()
+
+    def _swap_param_page(self, new_type: str) -> Optional[Tuple[ttk.Frame, Dict[str, list], Dict[str, Any], int]]:
+        old_page = self.param_frame
+        if self._param_page_type is not None:
+            widget_attrs = self._detach_page_widgets()
+            self._param_page_cache[self._param_page_type] = (old_page, self.param_widgets, widget_attrs, self._param_page_last_row)
+        else:
+            # A page whose builder failed is not cached, but whatever it managed to store on self
+            # still has to be dropped before its widgets are destroyed.
+            self._detach_page_widgets()
+            for widget in old_page.winfo_children():
+                try: widget.destroy()
+                except tk.TclError: pass
+                except Exception as e: logger.warning(f"Error destroying old param widget {widget}: {e}")
+        self._param_page_type = None
+
+        cached_page = self._param_page_cache.pop(new_type, None)
+        if cached_page is not None:
+            page = cached_page[0]
+            for name, value in cached_page[2].items(): setattr(self, name, value)
+            self._page_widgets = cached_page[2]
+            self.param_widgets = cached_page[1]
+        elif old_page.winfo_children():
+            page = ttk.Frame(self.canvas)
+            page.bind("<Configure>", self._on_param_frame_configure)
+            self._bind_mouse_wheel(page)
+        else:
+            page = old_page
+
+        if page is not old_page:
+            self.canvas.itemconfigure(self._param_frame_window_id, window=page)
+            if not old_page.winfo_children(): old_page.destroy()
+        self.param_frame = page
+        return cached_page
+
+    def _page_widget(self, name: str, value: Any) -> Any:
+        # Builders register every widget attribute they store on self, so it can travel with its page.
+        self._page_widgets[name] = value
+        return value
+
+    def _detach_page_widgets(self) -> Dict[str, Any]:
+        # Reset the current page's registered attributes so the next page builds its own.
+        page_widgets = self._page_widgets; self._page_widgets = {}
+        for name in page_widgets:
+            if name in self._PAGE_WIDGET_DEFAULTS: setattr(self, name, self._PAGE_WIDGET_DEFAULTS[name])
+            elif name in vars(self): delattr(self, name)
+        return page_widgets
 
     def _create_preview_area_widgets(self):
         if not (self.param_frame and self.param_frame.winfo_exists()): return
-        self._preview_container_frame = ttk.Frame(self.param_frame)
+        self._preview_container_frame = self._page_widget("_preview_container_frame", ttk.Frame(self.param_frame))
         self._preview_container_frame.grid_columnconfigure(0, weight=1)
         preview_width, preview_height = 250, 180
-        self.preview_label = ttk.Label(self._preview_container_frame, text="Preview Area", anchor="center", relief="sunken", borderwidth=1, justify=tk.CENTER)
-        self.preview_label.grid(row=0, column=0, rowspan=2, padx=(0,5), pady=0, sticky="nsew")
-        self.preview_label.config(width=int(preview_width / 7.5))
-        self.preview_label.grid_propagate(False)
-        self.preview_button = ttk.Button(self._preview_container_frame, text="Preview Processing", command=self._trigger_preview_preprocessing)
+        preview_box = ttk.Frame(self._preview_container_frame, width=preview_width, height=preview_height)
+        preview_box.grid(row=0, column=0, rowspan=2, padx=(0,5), pady=0, sticky="nsw")
+        preview_box.grid_propagate(False)
+        preview_box.grid_rowconfigure(0, weight=1); preview_box.grid_columnconfigure(0, weight=1)
+        self.preview_label = self._page_widget("preview_label", ttk.Label(preview_box, text="Preview Area", anchor="center", relief="sunken", borderwidth=1, justify=tk.CENTER))
+        self.preview_label.grid(row=0, column=0, sticky="nsew")
+        self.preview_button = self._page_widget("preview_button", ttk.Button(self._preview_container_frame, text="Preview Processing", command=self._trigger_preview_preprocessing))
         self.preview_button.grid(row=0, column=1, padx=(5, 0), pady=(0,2), sticky="ne")
-        self.recognized_text_label = ttk.Label(self._preview_container_frame, textvariable=self._recognized_text_var, anchor="nw", wraplength=preview_width-10, justify=tk.LEFT, relief="sunken", borderwidth=1)
+        self.recognized_text_label = self._page_widget("recognized_text_label", ttk.Label(self._preview_container_frame, textvariable=self._recognized_text_var, anchor="nw", wraplength=preview_width-10, justify=tk.LEFT, relief="sunken", borderwidth=1))
         self.recognized_text_label.grid(row=2, column=0, columnspan=2, padx=0, pady=(5,0), sticky="nsew")
+        self._preview_container_frame.bind("<Configure>", self._on_preview_container_configure)
         self.param_widgets["_preview_label_widget_"] = [self.preview_label]
         self.param_widgets["_preview_button_widget_"] = [self.preview_button]
         self.param_widgets["_recognized_text_label_widget_"] = [self.recognized_text_label]
 
+    def _on_preview_container_configure(self, event: tk.Event) -> None:
+        self._pending_wraplength = max(50, event.width - 10)
+        if self._wraplength_after_id is None:
+            self._wraplength_after_id = self.after(self._WRAPLENGTH_DELAY_MS, self._apply_recognized_text_wraplength)
+
+    def _apply_recognized_text_wraplength(self) -> None:
+        self._wraplength_after_id = None
+        label = getattr(self, 'recognized_text_label', None)
+        if not (label and label.winfo_exists()): return
+        if str(label.cget("wraplength")) != str(self._pending_wraplength):
+            label.config(wraplength=self._pending_wraplength)
+
     def _analyze_top_n_colors_in_preview(self):
         if not (hasattr(self, '_current_preview_image_pil') and self._current_preview_image_pil):
             messagebox.showinfo("Info", "No image in preview to analyze. Please capture or load an image first.", parent=self)
@@ -597,13 +1066,13 @@ class ConditionSettings(ttk.Frame):
             return
 
         try:
-            image_np_rgb = np.array(self._current_preview_image_pil.convert("RGB"))
+            image_np_rgb = self._get_preview_rgb()
         except Exception as e_conv:
             logger.error(f"Error converting preview PIL image to NumPy for Top N analysis: {e_conv}")
             messagebox.showerror("Image Error", "Could not process preview image for color analysis.", parent=self)
             return
 
-        self.after_idle(lambda: self._update_color_analysis_display(image_np_rgb, analyze_top_n=n_colors))
+        self._run_color_analysis_now(image_np_rgb, analyze_top_n=n_colors)
 
     def _analyze_target_colors_in_preview(self):
         if not (hasattr(self, '_current_preview_image_pil') and self._current_preview_image_pil):
@@ -616,24 +1085,24 @@ class ConditionSettings(ttk.Frame):
 
         if not target_colors_from_params or not isinstance(target_colors_from_params, list):
             messagebox.showinfo("Info", "No target colors are currently defined for this condition. Add some target colors first.", parent=self)
-            self.after_idle(lambda: self._update_color_analysis_display(None))
+            self._request_color_analysis(None)
             return
 
         try:
-            image_np_rgb = np.array(self._current_preview_image_pil.convert("RGB"))
+            image_np_rgb = self._get_preview_rgb()
         except Exception as e_conv:
             logger.error(f"Error converting preview PIL image to NumPy for target color analysis: {e_conv}")
             messagebox.showerror("Image Error", "Could not process preview image for color analysis.", parent=self)
             return
 
-        self.after_idle(lambda: self._update_color_analysis_display(image_np_rgb, colors_to_analyze_defs=target_colors_from_params))
+        self._run_color_analysis_now(image_np_rgb, colors_to_analyze_defs=target_colors_from_params)
 
     def _create_color_analysis_area_widgets(self):
         if not (self.param_frame and self.param_frame.winfo_exists()): return
-        self._color_analysis_frame_container = ttk.Frame(self.param_frame)
-        self._color_analysis_frame = ttk.LabelFrame(self._color_analysis_frame_container, text="Color Analysis of Preview")
+        self._color_analysis_frame_container = self._page_widget("_color_analysis_frame_container", ttk.Frame(self.param_frame))
+        self._color_analysis_frame = self._page_widget("_color_analysis_frame", ttk.LabelFrame(self._color_analysis_frame_container, text="Color Analysis of Preview"))
         self._color_analysis_frame.pack(fill=tk.BOTH, expand=True, padx=0, pady=0)
-        self.color_analysis_tree = ttk.Treeview(self._color_analysis_frame, columns=("hex", "percentage"), show="headings", height=5)
+        self.color_analysis_tree = self._page_widget("color_analysis_tree", ttk.Treeview(self._color_analysis_frame, columns=("hex", "percentage"), show="headings", height=5))
         self.color_analysis_tree.heading("#0", text="Color"); self.color_analysis_tree.column("#0", width=40, anchor="center", stretch=False)
         self.color_analysis_tree.heading("hex", text="HEX"); self.color_analysis_tree.column("hex", width=80, anchor="w")
         self.color_analysis_tree.heading("percentage", text="% Preview"); self.color_analysis_tree.column("percentage", width=100, anchor="e")
@@ -645,52 +1114,55 @@ class ConditionSettings(ttk.Frame):
         top_n_frame = ttk.Frame(self._color_analysis_frame)
         top_n_frame.pack(fill=tk.X, pady=5, padx=5)
         ttk.Label(top_n_frame, text="N:").pack(side=tk.LEFT, padx=(0,2))
-        self.top_n_entry = ttk.Entry(top_n_frame, width=4, validate="key", validatecommand=(self.vcmd_integer, "%P"))
+        self.top_n_entry = self._page_widget("top_n_entry", ttk.Entry(top_n_frame, width=4, validate="key", validatecommand=(self.vcmd_integer, "%P")))
         self.top_n_entry.insert(0, "5")
         self.top_n_entry.pack(side=tk.LEFT, padx=2)
-        self.analyze_top_n_button = ttk.Button(top_n_frame, text="Find Top N", command=self._analyze_top_n_colors_in_preview)
+        self.analyze_top_n_button = self._page_widget("analyze_top_n_button", ttk.Button(top_n_frame, text="Find Top N", command=self._analyze_top_n_colors_in_preview))
         self.analyze_top_n_button.pack(side=tk.LEFT, padx=5)
-        self.analyze_targets_button = ttk.Button(top_n_frame, text="Analyze Targets", command=self._analyze_target_colors_in_preview)
+        self.analyze_targets_button = self._page_widget("analyze_targets_button", ttk.Button(top_n_frame, text="Analyze Targets", command=self._analyze_target_colors_in_preview))
         self.analyze_targets_button.pack(side=tk.LEFT, padx=5)
 
+    def _build_params_from_spec(self, spec: Tuple[Tuple[str, str, str, int, int, Optional[str]], ...], master: ttk.Frame) -> None:
+        validate_options = self._entry_validate_options
+        param_widgets = self.param_widgets; bind_wheel = self._bind_new_widget_wheel; track = self._track_param_var
+        for kind, key, text, row, col, extra in spec:
+            if kind == "check":
+                variable = getattr(self, extra) if extra else tk.BooleanVar()
+                checkbox = ttk.Checkbutton(master, text=text, variable=variable)
+                checkbox.grid(row=row, column=col, padx=5, pady=1, sticky=tk.W)
+                param_widgets[key] = [checkbox, variable]
+                track(variable); bind_wheel(checkbox)
+            else:
+                label = ttk.Label(master, text=text)
+                label.grid(row=row, column=col, padx=5, pady=2, sticky=tk.W)
+                entry = self._traced_entry(master, width=6, **validate_options.get(extra, {}))
+                entry.grid(row=row, column=col + 1, padx=5, pady=2, sticky=tk.W)
+                param_widgets[key] = [label, entry]
+                bind_wheel(entry, label)
+
     def _add_param_entry(self, key: str, text: str, row: int, col: int = 0, master: Optional[ttk.Frame] = None, **kwargs: Any) -> ttk.Entry:
-        parent = master if master and master.winfo_exists() else self.param_frame 
-        if not (parent and parent.winfo_exists()):
-            logger.error(f"_add_param_entry: Parent widget for key '{key}' does not exist.")
-            return ttk.Entry(self) 
+        parent = master if master is not None else self.param_frame
 
         label = ttk.Label(parent, text=text)
         label.grid(row=row, column=col, padx=kwargs.get("padx", 5), pady=kwargs.get("pady", 2), sticky=tk.W)
-        entry = ttk.Entry(parent, width=kwargs.get("width", 15))
-        validate = kwargs.get("validate", None)
-        if validate == "integer": entry.config(validate="key", validatecommand=(self.vcmd_integer, "%P"))
-        elif validate == "float": entry.config(validate="key", validatecommand=(self.vcmd_float, "%P"))
-        elif validate == "int_tuple2": entry.config(validate="key", validatecommand=(self.vcmd_int_tuple2, "%P"))
+        entry = self._traced_entry(parent, width=kwargs.get("width", 15), **self._entry_validate_options.get(kwargs.get("validate"), {}))
         entry.grid(row=row, column=col + 1, padx=kwargs.get("padx", 5), pady=kwargs.get("pady", 2), sticky=kwargs.get("sticky", tk.EW))
         self.param_widgets[key] = [label, entry]
-        self._bind_mouse_wheel(entry); self._bind_mouse_wheel(label)
+        self._bind_new_widget_wheel(entry, label)
         return entry
 
     def _add_param_checkbox(self, key: str, text: str, row: int, col: int = 0, master: Optional[ttk.Frame] = None, variable: Optional[tk.BooleanVar] = None, **kwargs: Any) -> Tuple[ttk.Checkbutton, tk.BooleanVar]:
-        parent = master if master and master.winfo_exists() else self.param_frame
-        if not (parent and parent.winfo_exists()):
-            logger.error(f"_add_param_checkbox: Parent widget for key '{key}' does not exist.")
-            dummy_var = tk.BooleanVar()
-            return ttk.Checkbutton(self, variable=dummy_var), dummy_var
+        parent = master if master is not None else self.param_frame
 
         if variable is None: variable = tk.BooleanVar()
         checkbox = ttk.Checkbutton(parent, text=text, variable=variable, command=kwargs.get("command", None))
         checkbox.grid(row=row, column=col, columnspan=kwargs.get("columnspan", 1), padx=kwargs.get("padx", 5), pady=kwargs.get("pady", 1), sticky=kwargs.get("sticky", tk.W))
         self.param_widgets[key] = [checkbox, variable]
-        self._bind_mouse_wheel(checkbox)
+        self._track_param_var(variable); self._bind_new_widget_wheel(checkbox)
         return checkbox, variable
 
     def _add_param_combobox(self, key: str, text: str, row: int, col: int = 0, master: Optional[ttk.Frame] = None, values: Optional[list] = None, variable: Optional[tk.StringVar] = None, **kwargs: Any) -> Tuple[ttk.Combobox, tk.StringVar]:
-         parent = master if master and master.winfo_exists() else self.param_frame
-         if not (parent and parent.winfo_exists()):
-            logger.error(f"_add_param_combobox: Parent widget for key '{key}' does not exist.")
-            dummy_var = tk.StringVar()
-            return ttk.Combobox(self, textvariable=dummy_var), dummy_var
+         parent = master if master is not None else self.param_frame
 
          label = ttk.Label(parent, text=text)
          label.grid(row=row, column=col, padx=kwargs.get("padx", 5), pady=kwargs.get("pady", 2), sticky=tk.W)
@@ -698,24 +1170,38 @@ class ConditionSettings(ttk.Frame):
          combobox = ttk.Combobox(parent, textvariable=variable, values=values or [], state=kwargs.get("state", "readonly"), width=kwargs.get("width", 18))
          combobox.grid(row=row, column=col + 1, padx=kwargs.get("padx", 5), pady=kwargs.get("pady", 2), sticky=kwargs.get("sticky", tk.EW))
          self.param_widgets[key] = [label, combobox, variable]
-         self._bind_mouse_wheel(combobox); self._bind_mouse_wheel(label)
+         self._track_param_var(variable); self._bind_new_widget_wheel(combobox, label)
          return combobox, variable
 
     def _add_param_button(self, key: str, text: str, row: int, col: int = 0, master: Optional[ttk.Frame] = None, command: Optional[Callable] = None, **kwargs: Any) -> ttk.Button:
-        parent = master if master and master.winfo_exists() else self.param_frame
-        if not (parent and parent.winfo_exists()):
-            logger.error(f"_add_param_button: Parent widget for key '{key}' does not exist.")
-            return ttk.Button(self)
+        parent = master if master is not None else self.param_frame
 
         button = ttk.Button(parent, text=text, command=command, width=kwargs.get("width", 15))
         button.grid(row=row, column=col, columnspan=kwargs.get("columnspan", 1), padx=kwargs.get("padx", 5), pady=kwargs.get("pady", 5), sticky=kwargs.get("sticky", tk.EW))
         self.param_widgets[key] = [button]
-        self._bind_mouse_wheel(button)
+        self._bind_new_widget_wheel(button)
         return button
 
+    def _track_param_var(self, variable: tk.Variable) -> None:
+        name = str(variable)
+        if name not in self._dirty_traced_vars:
+            self._dirty_traced_vars.add(name)
+            variable.trace_add("write", self._mark_params_dirty)
+
+    def _traced_entry(self, master: Any, **kwargs: Any) -> ttk.Entry:
+        # The variable only feeds the dirty flag; values are still read from the entry itself.
+        # It is kept on the widget so it is not collected (and its Tcl trace unset) while the entry lives.
+        variable = tk.StringVar()
+        entry = ttk.Entry(master, textvariable=variable, **kwargs)
+        entry._dirty_var = variable
+        variable.trace_add("write", self._mark_params_dirty)
+        return entry
+
+    def _mark_params_dirty(self, *_: Any) -> None:
+        self._params_dirty = True
+
     def _add_param_separator(self, row: int, col: int = 0, columnspan: int = 4, master: Optional[ttk.Frame] = None) -> None:
-        parent = master if master and master.winfo_exists() else self.param_frame
-        if not (parent and parent.winfo_exists()): return
+        parent = master if master is not None else self.param_frame
         sep = ttk.Separator(parent, orient=tk.HORIZONTAL)
         sep.grid(row=row, column=col, columnspan=columnspan, padx=5, pady=5, sticky=tk.EW)
 
@@ -726,12 +1212,12 @@ class ConditionSettings(ttk.Frame):
     def _create_color_at_position_params(self) -> None:
         if not (self.param_frame and self.param_frame.winfo_exists()): return
         frame = self.param_frame
-        frame.grid_columnconfigure(1, weight=0); frame.grid_columnconfigure(2, weight=0)
+        frame.grid_columnconfigure((1, 2), weight=0)
         row = 0
         self._add_param_entry("abs_color_x", "X Coordinate (Abs):", row, col=0, master=frame, validate="integer", width=7)
         self._add_param_entry("abs_color_y", "Y Coordinate (Abs):", row, col=2, master=frame, validate="integer", width=7); row += 1
         hex_entry = self._add_param_entry("color_hex", "Target Color (Hex):", row, col=0, master=frame, width=9)
-        self.color_swatch = tk.Label(frame, text="    ", bg="#000000", relief="sunken", borderwidth=1)
+        self.color_swatch = self._page_widget("color_swatch", tk.Label(frame, text="    ", bg="#000000", relief="sunken", borderwidth=1))
         self.color_swatch.grid(row=row, column=2, padx=(0,5), pady=2, sticky="w")
         if hex_entry: hex_entry.bind("<KeyRelease>", self._update_color_swatch); hex_entry.bind("<FocusOut>", self._update_color_swatch); row += 1
         self._add_param_entry("tolerance", "Tolerance (0-765):", row, col=0, master=frame, validate="integer", width=7); row += 1
@@ -739,23 +1225,28 @@ class ConditionSettings(ttk.Frame):
              self._add_param_button("capture_button", "Pick Color Point", row=row, col=0, master=frame, columnspan=3, command=lambda: self._start_coordinate_capture(num_points=1))
 
     def _update_color_swatch(self, event: Optional[tk.Event] = None) -> None:
-        hex_widget_info = self.param_widgets.get("color_hex")
-        hex_entry = self._find_widget_in_list(hex_widget_info, ttk.Entry)
+        hex_entry = (self._widget_roles("color_hex") or (None, None, None))[1]
         if hex_entry and hasattr(self, 'color_swatch') and self.color_swatch.winfo_exists():
             hex_value = hex_entry.get().strip()
+            swatch_state = (str(self.color_swatch), hex_value)
+            if swatch_state == self._last_swatch_state: return
+            self._last_swatch_state = swatch_state
             try:
                 if not hex_value.startswith('#'): hex_value = '#' + hex_value
-                if len(hex_value) == 4: hex_value = '#' + ''.join([c*2 for c in hex_value[1:]])
-                if re.fullmatch(r'#[0-9a-fA-F]{6}', hex_value): self.color_swatch.config(bg=hex_value)
-                else: self.color_swatch.config(bg="SystemButtonFace")
+                if len(hex_value) == 4: _, r, g, b = hex_value; hex_value = f"#{r}{r}{g}{g}{b}{b}"
+                self._set_swatch_bg(self.color_swatch, hex_value if _HEX6_RE.fullmatch(hex_value) else "SystemButtonFace")
             except tk.TclError: self.color_swatch.config(bg="SystemButtonFace")
 
+    @staticmethod
+    def _set_swatch_bg(swatch: tk.Label, new_bg: str) -> None:
+        if swatch.cget("bg") != new_bg: swatch.config(bg=new_bg)
+
     def _create_image_on_screen_params(self) -> None:
         if not (self.param_frame and self.param_frame.winfo_exists()): return
         parent = self.param_frame; parent.grid_columnconfigure(1, weight=1); current_row = 0
         region_frame = ttk.LabelFrame(parent, text="Search Region", padding=5)
         region_frame.grid(row=current_row, column=0, columnspan=4, padx=5, pady=5, sticky="ew"); current_row += 1
-        region_frame.grid_columnconfigure(1, weight=0); region_frame.grid_columnconfigure(3, weight=0); region_frame.grid_columnconfigure(4, weight=0)
+        region_frame.grid_columnconfigure((1, 3, 4), weight=0)
         self._add_param_entry("region_x1", "X1:", 0, col=0, master=region_frame, validate="integer", width=6)
         self._add_param_entry("region_y1", "Y1:", 1, col=0, master=region_frame, validate="integer", width=6)
         self._add_param_entry("region_x2", "X2:", 0, col=2, master=region_frame, validate="integer", width=6)
@@ -771,7 +1262,7 @@ class ConditionSettings(ttk.Frame):
 
         match_frame = ttk.LabelFrame(parent, text="Matching & Selection", padding=5)
         match_frame.grid(row=current_row, column=0, columnspan=4, padx=5, pady=5, sticky="ew"); current_row += 1
-        match_frame.grid_columnconfigure(1, weight=1); match_frame.grid_columnconfigure(3, weight=1); match_row = 0
+        match_frame.grid_columnconfigure((1, 3), weight=1); match_row = 0
         self._add_param_combobox("matching_method", "Method:", match_row, col=0, master=match_frame, values=["Template", "Feature"], width=10)
         self._add_param_entry("threshold", "Threshold:", match_row, col=2, master=match_frame, validate="float", width=6); match_row += 1
         self._add_param_combobox("template_matching_method", "Template Alg:", match_row, col=0, master=match_frame, values=["TM_CCOEFF_NORMED", "TM_CCORR_NORMED", "TM_SQDIFF_NORMED"], width=18)
@@ -781,8 +1272,9 @@ class ConditionSettings(ttk.Frame):
                                          "closest_to_center_search_region", "closest_to_last_click", "closest_to_point"],
                                  width=20)
         match_row += 1
-        self.ref_point_x_entry = self._add_param_entry("reference_point_x", "Ref X (for closest_to_point):", match_row, col=0, master=match_frame, validate="integer", width=6)
-        self.ref_point_y_entry = self._add_param_entry("reference_point_y", "Ref Y:", match_row, col=2, master=match_frame, validate="integer", width=6)
+        self.ref_point_x_entry = self._page_widget("ref_point_x_entry", self._add_param_entry("reference_point_x", "Ref X (for closest_to_point):", match_row, col=0, master=match_frame, validate="integer", width=6))
+        self.ref_point_y_entry = self._page_widget("ref_point_y_entry", self._add_param_entry("reference_point_y", "Ref Y:", match_row, col=2, master=match_frame, validate="integer", width=6))
+        self._ref_point_widgets = self._page_widget("_ref_point_widgets", (*self.param_widgets["reference_point_x"], *self.param_widgets["reference_point_y"]))
         self._toggle_ref_point_visibility()
         if self.param_widgets.get("selection_strategy"):
             combo_widget = self._find_widget_in_list(self.param_widgets["selection_strategy"], ttk.Combobox)
@@ -797,67 +1289,43 @@ class ConditionSettings(ttk.Frame):
 
         proc_frame = ttk.LabelFrame(parent, text="Preprocessing Options", padding=5)
         proc_frame.grid(row=current_row, column=0, columnspan=4, padx=5, pady=5, sticky="nsew"); current_row += 1
-        proc_frame.grid_columnconfigure(1, weight=0); proc_frame.grid_columnconfigure(3, weight=0); proc_row = 0
-        self._add_param_checkbox("grayscale", "Grayscale", proc_row, col=0, master=proc_frame, variable=self._grayscale_var, columnspan=1);
-        self._add_param_checkbox("binarization", "Binarization (Otsu)", proc_row, col=2, master=proc_frame, variable=self._binarization_var, columnspan=1); proc_row+=1
-        self._add_param_checkbox("gaussian_blur", "Gaussian Blur", proc_row, col=0, master=proc_frame, variable=self._gaussian_blur_var, columnspan=1);
-        self._add_param_entry("gaussian_blur_kernel", "Kernel(w,h):", proc_row, col=1, master=proc_frame, validate="int_tuple2", width=6, sticky=tk.W);
-        self._add_param_checkbox("median_blur", "Median Blur", proc_row, col=2, master=proc_frame, variable=self._median_blur_var, columnspan=1);
-        self._add_param_entry("median_blur_kernel", "Kernel(k):", proc_row, col=3, master=proc_frame, validate="integer", width=6, sticky=tk.W); proc_row+=1
-        self._add_param_checkbox("clahe", "CLAHE", proc_row, col=0, master=proc_frame, variable=self._clahe_var, columnspan=1);
-        self._add_param_entry("clahe_clip_limit", "Clip Limit:", proc_row, col=1, master=proc_frame, validate="float", width=6, sticky=tk.W);
-        self._add_param_entry("clahe_tile_grid_size", "Tile(w,h):", proc_row, col=3, master=proc_frame, validate="int_tuple2", width=6, sticky=tk.W); proc_row+=1
-        self._add_param_checkbox("bilateral_filter", "Bilateral Filter", proc_row, col=0, master=proc_frame, variable=self._bilateral_filter_var, columnspan=1);
-        self._add_param_entry("bilateral_d", "Diameter(d):", proc_row, col=1, master=proc_frame, validate="integer", width=6, sticky=tk.W); proc_row+=1
-        self._add_param_entry("bilateral_sigma_color", "Sigma Color:", proc_row, col=1, master=proc_frame, validate="float", width=6, sticky=tk.W);
-        self._add_param_entry("bilateral_sigma_space", "Sigma Space:", proc_row, col=3, master=proc_frame, validate="float", width=6, sticky=tk.W); proc_row+=1
-        self._add_param_checkbox("canny_edges", "Canny Edges", proc_row, col=0, master=proc_frame, variable=self._canny_edges_var, columnspan=1);
-        self._add_param_entry("canny_threshold1", "Threshold 1:", proc_row, col=1, master=proc_frame, validate="float", width=6, sticky=tk.W);
-        self._add_param_entry("canny_threshold2", "Threshold 2:", proc_row, col=3, master=proc_frame, validate="float", width=6, sticky=tk.W); proc_row+=1
+        proc_frame.grid_columnconfigure((1, 3), weight=0)
+        self._build_params_from_spec(_IMAGE_PREPROCESSING_SPEC, proc_frame)
         self._bind_recursive_mousewheel(parent)
 
     def _toggle_ref_point_visibility(self, event=None):
         strategy = self._get_widget_value("selection_strategy", "first_found")
         show_ref_point = (strategy == "closest_to_point")
 
-        ref_x_widgets = self.param_widgets.get("reference_point_x")
-        ref_y_widgets = self.param_widgets.get("reference_point_y")
-
-        if ref_x_widgets and isinstance(ref_x_widgets, list):
-            for widget in ref_x_widgets:
-                if widget.winfo_exists():
-                    if show_ref_point: widget.grid()
-                    else: widget.grid_remove()
-        if ref_y_widgets and isinstance(ref_y_widgets, list):
-            for widget in ref_y_widgets:
-                if widget.winfo_exists():
-                    if show_ref_point: widget.grid()
-                    else: widget.grid_remove()
-        if self.param_frame and self.param_frame.winfo_exists(): 
-             self.param_frame.update_idletasks()
-             if self.canvas and self.canvas.winfo_exists():
-                 self.canvas.after_idle(self._update_scroll_region)
+        try:
+            for widget in self._ref_point_widgets: (widget.grid if show_ref_point else widget.grid_remove)()
+        except tk.TclError: pass
+        self._request_scroll_refresh()
+
 
+    def _cwd_relative(self, filepath: str) -> str:
+        abs_path = os.path.abspath(filepath)
+        if abs_path.startswith(self._cwd_prefix): rel_path = abs_path[len(self._cwd_prefix):]
+        else: rel_path = os.path.relpath(abs_path, self._cwd_abs)
+        return rel_path.replace('\\', '/')
 
     def _browse_image_path(self) -> None:
         if not self.image_storage: messagebox.showwarning("Warning", "Image storage location not configured.", parent=self); return
-        initial_dir = os.path.abspath(self.image_storage.storage_dir)
+        initial_dir = self._storage_abs
         filetypes = [("Image Files", "*.png *.jpg *.jpeg *.bmp *.gif"), ("All Files", "*.*")]
         filepath = filedialog.askopenfilename(title="Select Template Image", initialdir=initial_dir, filetypes=filetypes, parent=self)
         if filepath:
             try:
-                base_path = os.path.abspath(".")
-                rel_path = os.path.relpath(filepath, base_path)
-                rel_path_normalized = rel_path.replace('\\', '/')
+                rel_path_normalized = self._cwd_relative(filepath)
                 self._set_widget_value("image_path", rel_path_normalized)
             except ValueError:
                 self._set_widget_value("image_path", filepath)
             except Exception as e: messagebox.showerror("Error", f"Could not process image path: {e}", parent=self)
 
     def _browse_user_words_file_path(self) -> None:
-        initial_dir_text = os.path.abspath(".")
+        initial_dir_text = self._cwd_abs
         if self.image_storage:
-            initial_dir_text = os.path.abspath(self.image_storage.storage_dir)
+            initial_dir_text = self._storage_abs
 
         filepath = filedialog.askopenfilename(
             title="Select User Words File for OCR",
@@ -867,9 +1335,7 @@ class ConditionSettings(ttk.Frame):
         )
         if filepath:
             try:
-                base_path = os.path.abspath(".")
-                rel_path = os.path.relpath(filepath, base_path)
-                rel_path_normalized = rel_path.replace('\\', '/')
+                rel_path_normalized = self._cwd_relative(filepath)
                 self._set_widget_value("user_words_file_path", rel_path_normalized)
             except ValueError:
                 self._set_widget_value("user_words_file_path", filepath)
@@ -882,7 +1348,7 @@ class ConditionSettings(ttk.Frame):
         parent = self.param_frame; parent.grid_columnconfigure(1, weight=1); current_row = 0
         region_frame = ttk.LabelFrame(parent, text="Search Region", padding=5)
         region_frame.grid(row=current_row, column=0, columnspan=4, padx=5, pady=5, sticky="ew"); current_row += 1
-        region_frame.grid_columnconfigure(1, weight=0); region_frame.grid_columnconfigure(3, weight=0); region_frame.grid_columnconfigure(4, weight=0)
+        region_frame.grid_columnconfigure((1, 3, 4), weight=0)
         self._add_param_entry("region_x1", "X1:", 0, col=0, master=region_frame, validate="integer", width=6)
         self._add_param_entry("region_y1", "Y1:", 1, col=0, master=region_frame, validate="integer", width=6)
         self._add_param_entry("region_x2", "X2:", 0, col=2, master=region_frame, validate="integer", width=6)
@@ -904,7 +1370,7 @@ class ConditionSettings(ttk.Frame):
 
         proc_frame = ttk.LabelFrame(parent, text="OCR Preprocessing Options", padding=5)
         proc_frame.grid(row=current_row, column=0, columnspan=4, padx=5, pady=5, sticky="nsew"); current_row += 1
-        proc_frame.grid_columnconfigure(1, weight=0); proc_frame.grid_columnconfigure(3, weight=0); proc_row = 0
+        proc_frame.grid_columnconfigure((1, 3), weight=0); proc_row = 0
         self._add_param_checkbox("grayscale", "Grayscale", proc_row, col=0, master=proc_frame, variable=self._grayscale_var, columnspan=1);
         self._add_param_checkbox("adaptive_threshold", "Adaptive Threshold", proc_row, col=2, master=proc_frame, variable=self._adaptive_threshold_var, columnspan=1); proc_row+=1
         self._add_param_entry("ocr_upscale_factor", "Upscale Factor:", proc_row, col=0, master=proc_frame, validate="float", width=6, sticky=tk.W);
@@ -941,7 +1407,7 @@ class ConditionSettings(ttk.Frame):
 
         overall_region_frame = ttk.LabelFrame(parent, text="Overall Search Region (for Anchor Image)", padding=5)
         overall_region_frame.grid(row=current_main_row, column=0, columnspan=4, padx=5, pady=5, sticky="ew"); current_main_row += 1
-        overall_region_frame.grid_columnconfigure(1, weight=0); overall_region_frame.grid_columnconfigure(3, weight=0); overall_region_frame.grid_columnconfigure(4, weight=0)
+        overall_region_frame.grid_columnconfigure((1, 3, 4), weight=0)
         self._add_param_entry("region_x1", "X1:", 0, col=0, master=overall_region_frame, validate="integer", width=6)
         self._add_param_entry("region_y1", "Y1:", 1, col=0, master=overall_region_frame, validate="integer", width=6)
         self._add_param_entry("region_x2", "X2:", 0, col=2, master=overall_region_frame, validate="integer", width=6, sticky="w")
@@ -965,7 +1431,7 @@ class ConditionSettings(ttk.Frame):
 
         relative_frame = ttk.LabelFrame(parent, text="Relative OCR Region (from Anchor)", padding=5)
         relative_frame.grid(row=current_main_row, column=0, columnspan=4, padx=5, pady=5, sticky="ew"); current_main_row += 1
-        relative_frame.grid_columnconfigure(1, weight=0); relative_frame.grid_columnconfigure(3, weight=0); rel_row = 0
+        relative_frame.grid_columnconfigure((1, 3), weight=0); rel_row = 0
         self._add_param_entry("relative_x_offset", "X Offset:", rel_row, col=0, master=relative_frame, validate="integer", width=6)
         self._add_param_entry("relative_y_offset", "Y Offset:", rel_row, col=2, master=relative_frame, validate="integer", width=6); rel_row += 1
         self._add_param_entry("relative_width", "Width:", rel_row, col=0, master=relative_frame, validate="integer", width=6)
@@ -994,7 +1460,7 @@ class ConditionSettings(ttk.Frame):
 
         region_frame = ttk.LabelFrame(parent, text="Region to Analyze", padding=5)
         region_frame.grid(row=current_row, column=0, columnspan=4, padx=5, pady=5, sticky="ew"); current_row += 1
-        region_frame.grid_columnconfigure(1, weight=0); region_frame.grid_columnconfigure(3, weight=0); region_frame.grid_columnconfigure(4, weight=0)
+        region_frame.grid_columnconfigure((1, 3, 4), weight=0)
         self._add_param_entry("region_x1", "X1:", 0, col=0, master=region_frame, validate="integer", width=6)
         self._add_param_entry("region_y1", "Y1:", 1, col=0, master=region_frame, validate="integer", width=6)
         self._add_param_entry("region_x2", "X2:", 0, col=2, master=region_frame, validate="integer", width=6, sticky="w")
@@ -1012,7 +1478,7 @@ class ConditionSettings(ttk.Frame):
         tc_list_frame.grid(row=0, column=0, sticky="nsew", padx=(0,5))
         tc_list_frame.grid_rowconfigure(0, weight=1); tc_list_frame.grid_columnconfigure(0, weight=1)
 
-        self.target_colors_tree = ttk.Treeview(tc_list_frame, columns=("label", "hex", "tolerance", "threshold_pct"), show="headings", height=4, selectmode="browse")
+        self.target_colors_tree = self._page_widget("target_colors_tree", ttk.Treeview(tc_list_frame, columns=("label", "hex", "tolerance", "threshold_pct"), show="headings", height=4, selectmode="browse"))
         self.target_colors_tree.heading("#0", text="Swatch"); self.target_colors_tree.column("#0", width=40, stretch=False, anchor="center")
         self.target_colors_tree.heading("label", text="Label"); self.target_colors_tree.column("label", width=120)
         self.target_colors_tree.heading("hex", text="HEX"); self.target_colors_tree.column("hex", width=80, anchor="center")
@@ -1026,11 +1492,11 @@ class ConditionSettings(ttk.Frame):
 
         tc_button_frame = ttk.Frame(target_colors_frame)
         tc_button_frame.grid(row=0, column=1, sticky="ns", padx=(5,0))
-        self.add_target_color_button = ttk.Button(tc_button_frame, text="Add", command=self._add_target_color_dialog, width=8)
+        self.add_target_color_button = self._page_widget("add_target_color_button", ttk.Button(tc_button_frame, text="Add", command=self._add_target_color_dialog, width=8))
         self.add_target_color_button.pack(pady=2, fill=tk.X)
-        self.edit_target_color_button = ttk.Button(tc_button_frame, text="Edit", command=self._edit_target_color_dialog, width=8, state=tk.DISABLED)
+        self.edit_target_color_button = self._page_widget("edit_target_color_button", ttk.Button(tc_button_frame, text="Edit", command=self._edit_target_color_dialog, width=8, state=tk.DISABLED))
         self.edit_target_color_button.pack(pady=2, fill=tk.X)
-        self.remove_target_color_button = ttk.Button(tc_button_frame, text="Del", command=self._remove_target_color, width=8, state=tk.DISABLED)
+        self.remove_target_color_button = self._page_widget("remove_target_color_button", ttk.Button(tc_button_frame, text="Del", command=self._remove_target_color, width=8, state=tk.DISABLED))
         self.remove_target_color_button.pack(pady=2, fill=tk.X)
 
         logic_params_frame = ttk.LabelFrame(parent, text="Logic & General Thresholds", padding=5)
@@ -1052,7 +1518,7 @@ class ConditionSettings(ttk.Frame):
 
         overall_region_frame = ttk.LabelFrame(parent, text="Overall Search Region (for Anchor Image - Optional)", padding=5)
         overall_region_frame.grid(row=current_row, column=0, columnspan=2, padx=5, pady=5, sticky="ew"); current_row += 1
-        overall_region_frame.grid_columnconfigure(1, weight=0); overall_region_frame.grid_columnconfigure(3, weight=0); overall_region_frame.grid_columnconfigure(4, weight=0)
+        overall_region_frame.grid_columnconfigure((1, 3, 4), weight=0)
         self._add_param_entry("region_x1", "X1:", 0, col=0, master=overall_region_frame, validate="integer", width=6)
         self._add_param_entry("region_y1", "Y1:", 1, col=0, master=overall_region_frame, validate="integer", width=6)
         self._add_param_entry("region_x2", "X2 (-1 for full):", 0, col=2, master=overall_region_frame, validate="integer", width=10, sticky="w")
@@ -1068,14 +1534,14 @@ class ConditionSettings(ttk.Frame):
         parent.grid_rowconfigure(current_row -1, weight=1) 
         canvas_frame.grid_columnconfigure(0, weight=1); canvas_frame.grid_rowconfigure(0, weight=1)
 
-        self.multi_image_canvas = tk.Canvas(canvas_frame, bg="lightgrey", width=400, height=300, relief="sunken", borderwidth=1)
+        self.multi_image_canvas = self._page_widget("multi_image_canvas", tk.Canvas(canvas_frame, bg="lightgrey", width=400, height=300, relief="sunken", borderwidth=1))
         self.multi_image_canvas.grid(row=0, column=0, sticky="nsew", padx=5, pady=5)
 
         mi_controls_frame = ttk.Frame(canvas_frame)
         mi_controls_frame.grid(row=0, column=1, rowspan=2, sticky="ns", padx=(5,0)) 
         self._add_param_button("multi_image_add_anchor_btn", "Set/Change Anchor Image", row=0, col=0, master=mi_controls_frame, command=self._multi_image_set_anchor_image, width=20)
         self._add_param_button("multi_image_add_sub_btn", "Add Sub-Image", row=1, col=0, master=mi_controls_frame, command=self._multi_image_add_sub_image, width=20)
-        self.multi_image_clear_button = ttk.Button(mi_controls_frame, text="Clear Canvas", command=self._multi_image_clear_canvas, width=20)
+        self.multi_image_clear_button = self._page_widget("multi_image_clear_button", ttk.Button(mi_controls_frame, text="Clear Canvas", command=self._multi_image_clear_canvas, width=20))
         self.multi_image_clear_button.grid(row=2, column=0, padx=5, pady=5, sticky=tk.EW)
 
         mi_details_frame = ttk.LabelFrame(parent, text="Image Details & Parameters", padding=5)
@@ -1112,18 +1578,17 @@ class ConditionSettings(ttk.Frame):
     def _multi_image_set_anchor_image(self):
         if not self.image_storage: messagebox.showwarning("Setup", "Image storage not configured.", parent=self); return
         filepath = filedialog.askopenfilename(title="Select Anchor Image for Pattern",
-                                            initialdir=os.path.abspath(self.image_storage.storage_dir),
+                                            initialdir=self._storage_abs,
                                             filetypes=[("Image Files", "*.png *.jpg *.bmp"), ("All Files", "*.*")],
                                             parent=self)
         if filepath:
             try:
-                rel_path = os.path.relpath(filepath, os.path.abspath("."))
-                self._set_widget_value("multi_anchor_image_path", rel_path.replace('\\', '/'))
-                self.multi_image_anchor_preview_image_pil = Image.open(filepath)
+                self._set_widget_value("multi_anchor_image_path", self._cwd_relative(filepath))
+                self._set_multi_image_anchor(Image.open(filepath))
                 self._multi_image_redraw_canvas()
             except Exception as e:
                 messagebox.showerror("Error", f"Could not load anchor image: {e}", parent=self)
-                self.multi_image_anchor_preview_image_pil = None
+                self._set_multi_image_anchor(None)
                 self._multi_image_redraw_canvas()
 
 
@@ -1134,19 +1599,19 @@ class ConditionSettings(ttk.Frame):
              return
 
         filepath = filedialog.askopenfilename(title="Select Sub-Image for Pattern",
-                                            initialdir=os.path.abspath(self.image_storage.storage_dir),
+                                            initialdir=self._storage_abs,
                                             filetypes=[("Image Files", "*.png *.jpg *.bmp"), ("All Files", "*.*")],
                                             parent=self)
         if filepath:
             try:
-                rel_path = os.path.relpath(filepath, os.path.abspath("."))
-                normalized_path = rel_path.replace('\\', '/')
+                normalized_path = self._cwd_relative(filepath)
 
                 new_sub_image_pil = Image.open(filepath)
 
                 self.multi_image_sub_images_data.append({
                     "path": normalized_path,
                     "pil_image": new_sub_image_pil, 
+                    "pil_thumb": self._make_multi_image_thumb(new_sub_image_pil, self._MI_SUB_THUMB_SIZE),
                     "offset_x_from_anchor": 0, 
                     "offset_y_from_anchor": 0, 
                     "canvas_item_id": None, 
@@ -1159,102 +1624,232 @@ class ConditionSettings(ttk.Frame):
                 messagebox.showerror("Error", f"Could not load sub-image: {e}", parent=self)
 
 
+    @staticmethod
+    def _make_multi_image_thumb(pil_img: Image.Image, max_dim: int) -> Image.Image:
+        # JPEGs are decoded at reduced scale through a separate handle; draft() on pil_img
+        # itself would shrink the caller's full-resolution image as well.
+        filename = getattr(pil_img, "filename", "")
+        if pil_img.format == "JPEG" and filename:
+            try:
+                with Image.open(filename) as thumb_src:
+                    thumb_src.draft(None, (max_dim * 3, max_dim * 3))
+                    thumb_src.thumbnail((max_dim, max_dim), Image.Resampling.LANCZOS, reducing_gap=3.0)
+                    return thumb_src
+            except Exception as e: logger.debug(f"Draft thumbnail failed for {filename}, using full decode: {e}")
+        img_copy = pil_img.copy()
+        img_copy.thumbnail((max_dim, max_dim), Image.Resampling.LANCZOS, reducing_gap=3.0)
+        return img_copy
+
+    def _set_multi_image_anchor(self, pil_img: Optional[Image.Image]) -> None:
+        self.multi_image_anchor_preview_image_pil = pil_img
+        self.multi_image_anchor_thumb_pil = self._make_multi_image_thumb(pil_img, self._MI_ANCHOR_THUMB_MAX) if pil_img is not None else None
+
     def _multi_image_clear_canvas(self):
-        self.multi_image_anchor_preview_image_pil = None
+        self._set_multi_image_anchor(None)
         self._set_widget_value("multi_anchor_image_path", "")
-        self.multi_image_sub_images_data.clear()
+        self.multi_image_sub_images_data = []
         self._multi_image_redraw_canvas()
 
     def _multi_image_redraw_canvas(self):
+        if self._mi_redraw_pending: return
+        self._mi_redraw_pending = True
+        self.after_idle(self._flush_mi_redraw)
+
+    def _flush_mi_redraw(self):
+        self._mi_redraw_pending = False
+        if self._widgets_alive: self._multi_image_redraw_canvas_now()
+
+    def _multi_image_redraw_canvas_now(self):
         if not (hasattr(self, 'multi_image_canvas') and self.multi_image_canvas.winfo_exists()):
             return
-        
-        self.multi_image_canvas.delete("all") 
-        self.multi_image_anchor_preview_image_tk = None 
+        from PIL import ImageTk
 
         canvas_width = self.multi_image_canvas.winfo_width()
         canvas_height = self.multi_image_canvas.winfo_height()
+        # The fingerprint holds ids; the objects themselves are kept in _mi_last_fp_refs so
+        # those ids cannot be recycled while it is stored.
+        fp_refs = [self.multi_image_anchor_preview_image_pil] + [d.get("pil_image") for d in self.multi_image_sub_images_data]
+        fp = (str(self.multi_image_canvas), canvas_width, canvas_height, tuple(map(id, fp_refs)),
+              tuple((d.get("offset_x_from_anchor", 0), d.get("offset_y_from_anchor", 0)) for d in self.multi_image_sub_images_data))
+        if fp == self._mi_last_fp: return
+        self._mi_last_fp = None; self._mi_last_fp_refs = []
+
         if canvas_width <=1 or canvas_height <=1 :
              self.multi_image_canvas.after(100, self._multi_image_redraw_canvas) 
              return
 
+        # Items are reused across redraws (coords/itemconfigure) instead of delete("all") + create.
+        canvas = self.multi_image_canvas
+        pool_canvas, anchor_item, sub_items = self._mi_canvas_items
+        if pool_canvas is not canvas: anchor_item, sub_items = None, []
+        canvas.delete("anchor_error")
+        self.multi_image_anchor_preview_image_tk = None 
+
+        anchor_drawn = False
         if self.multi_image_anchor_preview_image_pil:
             try:
-                img_copy = self.multi_image_anchor_preview_image_pil.copy()
-                max_dim = min(canvas_width // 2, canvas_height // 2, 150)
-                img_copy.thumbnail((max_dim, max_dim), Image.Resampling.LANCZOS)
-
-                self.multi_image_anchor_preview_image_tk = ImageTk.PhotoImage(img_copy)
+                anchor_pil = self.multi_image_anchor_thumb_pil or self.multi_image_anchor_preview_image_pil
+                max_dim = min(canvas_width // 2, canvas_height // 2, self._MI_ANCHOR_THUMB_MAX)
+                cached_thumb = self._mi_anchor_thumb
+                if cached_thumb is not None and cached_thumb[0] is anchor_pil and cached_thumb[1] == max_dim:
+                    self.multi_image_anchor_preview_image_tk = cached_thumb[2]
+                else:
+                    if max(anchor_pil.size) > max_dim: anchor_display = self._make_multi_image_thumb(anchor_pil, max_dim)
+                    else: anchor_display = anchor_pil
+                    self.multi_image_anchor_preview_image_tk = ImageTk.PhotoImage(anchor_display)
+                    self._mi_anchor_thumb = (anchor_pil, max_dim, self.multi_image_anchor_preview_image_tk)
                 anchor_canvas_x = 20 
                 anchor_canvas_y = 20
-                self.multi_image_canvas.create_image(anchor_canvas_x, anchor_canvas_y,
-                                                     anchor=tk.NW,
-                                                     image=self.multi_image_anchor_preview_image_tk,
-                                                     tags=("anchor_image",))
+                if anchor_item is None:
+                    anchor_item = canvas.create_image(anchor_canvas_x, anchor_canvas_y,
+                                                      anchor=tk.NW,
+                                                      image=self.multi_image_anchor_preview_image_tk,
+                                                      tags=("anchor_image",))
+                else:
+                    canvas.coords(anchor_item, anchor_canvas_x, anchor_canvas_y)
+                    canvas.itemconfigure(anchor_item, image=self.multi_image_anchor_preview_image_tk)
                 self.multi_image_anchor_canvas_pos = (anchor_canvas_x, anchor_canvas_y)
+                anchor_drawn = True
             except Exception as e:
                 logger.error(f"Error displaying anchor image on canvas: {e}")
-                self.multi_image_canvas.create_text(10,10, text="Error: Anchor Preview", anchor=tk.NW, fill="red")
+                canvas.create_text(10,10, text="Error: Anchor Preview", anchor=tk.NW, fill="red", tags=("anchor_error",))
+        if not anchor_drawn and anchor_item is not None:
+            canvas.delete(anchor_item); anchor_item = None
 
         current_y_offset_display = (self.multi_image_anchor_preview_image_tk.height() + 30) if hasattr(self, 'multi_image_anchor_preview_image_tk') and self.multi_image_anchor_preview_image_tk else 20
 
 
+        anchor_pos = getattr(self, "multi_image_anchor_canvas_pos", None)
+        create_image = canvas.create_image
+        drawn_items: List[int] = []
         for i, sub_data in enumerate(self.multi_image_sub_images_data):
             pil_img = sub_data.get("pil_image")
             if pil_img:
                 try:
-                    img_copy = pil_img.copy()
-                    img_copy.thumbnail((80,80), Image.Resampling.LANCZOS) 
-                    photo_img = ImageTk.PhotoImage(img_copy)
-                    sub_data["_tk_image_ref"] = photo_img
-
-                    sub_canvas_x = self.multi_image_anchor_canvas_pos[0] + sub_data.get("offset_x_from_anchor", 0) if hasattr(self, "multi_image_anchor_canvas_pos") else 20
-                    sub_canvas_y = self.multi_image_anchor_canvas_pos[1] + sub_data.get("offset_y_from_anchor", 0) if hasattr(self, "multi_image_anchor_canvas_pos") else current_y_offset_display
+                    photo_img = sub_data.get("_tk_image_ref")
+                    if photo_img is None or sub_data.get("_tk_image_src") is not pil_img:
+                        thumb = sub_data.get("pil_thumb")
+                        if thumb is None:
+                            thumb = sub_data["pil_thumb"] = self._make_multi_image_thumb(pil_img, self._MI_SUB_THUMB_SIZE)
+                        photo_img = ImageTk.PhotoImage(thumb)
+                        sub_data["_tk_image_ref"] = photo_img
+                        sub_data["_tk_image_src"] = pil_img
+
+                    if anchor_pos is not None:
+                        sub_canvas_x = anchor_pos[0] + sub_data.get("offset_x_from_anchor", 0)
+                        sub_canvas_y = anchor_pos[1] + sub_data.get("offset_y_from_anchor", 0)
+                    else: sub_canvas_x, sub_canvas_y = 20, current_y_offset_display
 
                     sub_data["current_canvas_x"] = sub_canvas_x 
                     sub_data["current_canvas_y"] = sub_canvas_y
 
-                    canvas_item_id = self.multi_image_canvas.create_image(
-                        sub_canvas_x, sub_canvas_y,
-                        anchor=tk.NW,
-                        image=photo_img,
-                        tags=(f"sub_image_{i}", "sub_image") 
-                    )
+                    item_tags = (f"sub_image_{i}", "sub_image")
+                    if len(drawn_items) < len(sub_items):
+                        canvas_item_id = sub_items[len(drawn_items)]
+                        canvas.coords(canvas_item_id, sub_canvas_x, sub_canvas_y)
+                        canvas.itemconfigure(canvas_item_id, image=photo_img, tags=item_tags)
+                    else:
+                        canvas_item_id = create_image(
+                            sub_canvas_x, sub_canvas_y,
+                            anchor=tk.NW,
+                            image=photo_img,
+                            tags=item_tags
+                        )
+                    drawn_items.append(canvas_item_id)
                     sub_data["canvas_item_id"] = canvas_item_id
                     current_y_offset_display += 30
                 except Exception as e:
                     logger.error(f"Error displaying sub-image {sub_data.get('path')} on canvas: {e}")
+        if len(sub_items) > len(drawn_items): canvas.delete(*sub_items[len(drawn_items):])
+        self._mi_canvas_items = (canvas, anchor_item, drawn_items)
 
-        if self.canvas and self.canvas.winfo_exists():
-            self.canvas.after_idle(self._update_scroll_region)
+        self._mi_last_fp = fp; self._mi_last_fp_refs = fp_refs
+        self._request_scroll_refresh()
 
     def _on_target_color_select(self, event=None):
-        if not (hasattr(self, 'target_colors_tree') and self.target_colors_tree.winfo_exists()): return
-        selected_ids = self.target_colors_tree.selection()
+        tree = getattr(self, 'target_colors_tree', None)
+        if not (self._widgets_alive and tree and tree.winfo_exists()): return
+        selected_ids = tree.selection()
         can_edit_remove = tk.NORMAL if selected_ids else tk.DISABLED
         if hasattr(self, 'edit_target_color_button'): self.edit_target_color_button.config(state=can_edit_remove)
         if hasattr(self, 'remove_target_color_button'): self.remove_target_color_button.config(state=can_edit_remove)
 
     def _populate_target_colors_treeview(self):
-        if not (hasattr(self, 'target_colors_tree') and self.target_colors_tree.winfo_exists()): return
-        for item in self.target_colors_tree.get_children(): self.target_colors_tree.delete(item)
-        self.target_color_swatch_images.clear()
+        if not self._widgets_alive: return
+        tree = getattr(self, 'target_colors_tree', None)
+        if not (tree and tree.winfo_exists()): return
 
         target_colors_data = []
         if self._current_condition_obj and hasattr(self._current_condition_obj, 'params') and isinstance(self._current_condition_obj.params, dict):
             target_colors_data = self._current_condition_obj.params.get("target_colors", [])
-        
+
         if not target_colors_data:
-            self.target_colors_tree.insert("", tk.END, values=("(No target colors defined)", "", "", ""))
+            new_rows = [(None, ("(No target colors defined)", "", "", ""))]
         else:
-            for color_def in target_colors_data:
-                label = color_def.get("label", "N/A")
-                hex_val = color_def.get("hex", "#000000")
-                tolerance = color_def.get("tolerance", 10)
-                threshold_pct = color_def.get("threshold", 75.0)
-                self._add_swatch_to_tree(self.target_colors_tree, self.target_color_swatch_images, hex_val, (label, hex_val, tolerance, f"{threshold_pct:.1f}%"))
+            new_rows = [self._target_color_row(color_def) for color_def in target_colors_data]
+
+        # Diff against what this tree last rendered so an edit touches only the rows that changed.
+        rendered_tree, old_rows = self._tc_tree_rows
+        if rendered_tree is not tree:
+            children = tree.get_children()
+            if children: tree.delete(*children)
+            old_rows = []
+
+        self.target_color_swatch_images.clear()
+        get_photo = self._get_swatch_photo
+        photos: List[Optional[tk.PhotoImage]] = []
+        for hex_val, _ in new_rows:
+            photo = None
+            if hex_val is not None:
+                try: photo = get_photo(hex_val)
+                except Exception as e: logger.error(f"Error creating swatch for {hex_val}: {e}")
+            photos.append(photo)
+        self.target_color_swatch_images.extend(photo for photo in photos if photo is not None)
+
+        n_common = min(len(old_rows), len(new_rows))
+        rows: List[Tuple[str, Optional[str], tuple, Optional[tk.PhotoImage]]] = []
+        for (iid, old_hex, old_values, _), (hex_val, values), photo in zip(old_rows, new_rows, photos):
+            if old_hex != hex_val or old_values != values:
+                tree.item(iid, values=values, image=photo if photo is not None else "")
+            rows.append((iid, hex_val, values, photo))
+        if len(old_rows) > n_common:
+            tree.delete(*[row[0] for row in old_rows[n_common:]])
+        tree_insert = tree.insert
+        for (hex_val, values), photo in zip(new_rows[n_common:], photos[n_common:]):
+            iid = tree_insert("", tk.END, values=values, image=photo) if photo is not None else tree_insert("", tk.END, values=values)
+            rows.append((iid, hex_val, values, photo))
+        self._tc_tree_rows = (tree, rows)
+        self._tc_iid_index = {row[0]: i for i, row in enumerate(rows) if row[1] is not None}
         self._on_target_color_select()
 
+    @staticmethod
+    def _target_color_row(color_def: Dict[str, Any]) -> Tuple[str, tuple]:
+        hex_val = color_def.get("hex", "#000000")
+        threshold_pct = color_def.get("threshold", 75.0)
+        return hex_val, (color_def.get("label", "N/A"), hex_val, color_def.get("tolerance", 10), f"{threshold_pct:.1f}%")
+
+    def _update_target_color_row(self, index: int, color_def: Dict[str, Any]) -> None:
+        tree = getattr(self, 'target_colors_tree', None)
+        rendered_tree, rows = self._tc_tree_rows
+        if not (tree and rendered_tree is tree and 0 <= index < len(rows) and rows[index][1] is not None and tree.winfo_exists()):
+            self._populate_target_colors_treeview(); return
+        hex_val, values = self._target_color_row(color_def)
+        iid, old_hex, old_values, photo = rows[index]
+        if (old_hex, old_values) == (hex_val, values): return
+        if old_hex != hex_val:
+            try: photo = self._get_swatch_photo(hex_val)
+            except Exception as e:
+                logger.error(f"Error creating swatch for {hex_val}: {e}"); photo = None
+        tree.item(iid, values=values, image=photo if photo is not None else "")
+        rows[index] = (iid, hex_val, values, photo)
+
+    def _target_color_index_for_iid(self, iid: str, target_colors_data: List[Dict[str, Any]]) -> int:
+        rendered_tree, rows = self._tc_tree_rows
+        if rendered_tree is not getattr(self, 'target_colors_tree', None): return -1
+        idx = self._tc_iid_index.get(iid, -1)
+        if 0 <= idx < len(target_colors_data) and target_colors_data[idx].get("hex") == rows[idx][1]: return idx
+        return -1
+
     def _add_target_color_dialog(self, existing_color_data: Optional[Dict[str, Any]] = None, edit_index: Optional[int] = None):
         dialog_title = "Edit Target Color" if existing_color_data else "Add Target Color"
         color_dialog = tk.Toplevel(self)
@@ -1320,18 +1915,15 @@ class ConditionSettings(ttk.Frame):
                     
                     if edit_index is not None and 0 <= edit_index < len(self._current_condition_obj.params["target_colors"]):
                         self._current_condition_obj.params["target_colors"][edit_index] = color_data_entry
+                        self._update_target_color_row(edit_index, color_data_entry)
                     else:
                         self._current_condition_obj.params["target_colors"].append(color_data_entry)
-                    
-                    self._populate_target_colors_treeview()
-                    pil_image_for_analysis = None
-                    if hasattr(self, '_last_captured_region_np') and self._last_captured_region_np is not None:
-                        pil_image_for_analysis = self._numpy_to_pil(self._last_captured_region_np)
+                        self._populate_target_colors_treeview()
 
-                    self.after_idle(lambda: self._update_color_analysis_display(
-                        pil_image_for_analysis, 
+                    self._request_color_analysis(
+                        self._last_capture_rgb(), 
                         colors_to_analyze_defs=self._current_condition_obj.params["target_colors"]
-                    ))
+                    )
                     color_dialog.destroy()
                 else: messagebox.showerror("Error", "Parent condition object not found or invalid.", parent=color_dialog)
 
@@ -1342,12 +1934,13 @@ class ConditionSettings(ttk.Frame):
         ttk.Button(button_f, text="Save Color", command=on_save_color).pack(side=tk.LEFT, padx=5)
         ttk.Button(button_f, text="Cancel", command=color_dialog.destroy).pack(side=tk.LEFT, padx=5)
         
-        color_dialog.update_idletasks()
-        cd_w = color_dialog.winfo_reqwidth(); cd_h = color_dialog.winfo_reqheight()
-        self.update_idletasks()
-        parent_x = self.winfo_rootx(); parent_y = self.winfo_rooty(); parent_w = self.winfo_width(); parent_h = self.winfo_height()
-        x = parent_x + (parent_w // 2) - (cd_w // 2); y = parent_y + (parent_h // 2) - (cd_h // 2)
-        color_dialog.geometry(f"+{x}+{y}")
+        def _center():
+            if not (self._widgets_alive and color_dialog.winfo_exists()): return
+            cd_w = color_dialog.winfo_reqwidth(); cd_h = color_dialog.winfo_reqheight()
+            parent_x = self.winfo_rootx(); parent_y = self.winfo_rooty(); parent_w = self.winfo_width(); parent_h = self.winfo_height()
+            x = parent_x + (parent_w // 2) - (cd_w // 2); y = parent_y + (parent_h // 2) - (cd_h // 2)
+            color_dialog.geometry(f"+{x}+{y}")
+        color_dialog.after_idle(_center)
         label_entry.focus_set()
 
     def _edit_target_color_dialog(self):
@@ -1356,17 +1949,18 @@ class ConditionSettings(ttk.Frame):
         if not selected_items: return
         selected_iid = selected_items[0]
         
-        edit_idx = -1
         target_colors_data = self._current_condition_obj.params.get("target_colors", []) if self._current_condition_obj and hasattr(self._current_condition_obj, 'params') else []
-        try:
-            item_values = self.target_colors_tree.item(selected_iid, "values")
-            selected_hex_from_tree = item_values[1] 
-            for i, color_def in enumerate(target_colors_data):
-                if color_def.get("hex") == selected_hex_from_tree:
-                    edit_idx = i
-                    break
-        except tk.TclError:
-             pass
+        edit_idx = self._target_color_index_for_iid(selected_iid, target_colors_data)
+        if edit_idx == -1:
+            try:
+                item_values = self.target_colors_tree.item(selected_iid, "values")
+                selected_hex_from_tree = item_values[1] 
+                for i, color_def in enumerate(target_colors_data):
+                    if color_def.get("hex") == selected_hex_from_tree:
+                        edit_idx = i
+                        break
+            except tk.TclError:
+                 pass
         
         if edit_idx == -1: 
             try:
@@ -1400,6 +1994,9 @@ class ConditionSettings(ttk.Frame):
 
             hex_values_to_remove = set()
             for iid in selected_items_iids:
+                idx = self._target_color_index_for_iid(iid, target_colors_list)
+                if idx != -1:
+                    hex_values_to_remove.add(target_colors_list[idx].get("hex")); continue
                 try:
                     item_values = self.target_colors_tree.item(iid, "values")
                     if item_values and len(item_values) > 1:
@@ -1409,54 +2006,54 @@ class ConditionSettings(ttk.Frame):
 
             if not hex_values_to_remove: return
 
-            new_target_colors = [
-                color_def for color_def in target_colors_list
-                if color_def.get("hex") not in hex_values_to_remove
-            ]
+            remove = frozenset(hex_values_to_remove)
+            new_target_colors = [color_def for color_def in target_colors_list if color_def.get("hex") not in remove]
             
             if len(new_target_colors) < len(target_colors_list):
                 self._current_condition_obj.params["target_colors"] = new_target_colors
                 self._populate_target_colors_treeview()
-                self.after_idle(lambda: self._update_color_analysis_display(self._numpy_to_pil(self._last_captured_region_np), colors_to_analyze_defs=new_target_colors))
+                self._request_color_analysis(self._last_capture_rgb(), colors_to_analyze_defs=new_target_colors)
         self._on_target_color_select()
 
 
     def _update_specific_color_swatch(self, event: Optional[tk.Event], hex_entry_widget: ttk.Entry, swatch_label_widget: tk.Label) -> None:
         if hex_entry_widget and swatch_label_widget and hex_entry_widget.winfo_exists() and swatch_label_widget.winfo_exists():
             hex_value = hex_entry_widget.get().strip()
+            if getattr(swatch_label_widget, "_last_hex", None) == hex_value: return
+            swatch_label_widget._last_hex = hex_value # type: ignore[attr-defined]
             try:
                 if not hex_value.startswith('#'): hex_value = '#' + hex_value
-                if len(hex_value) == 4: hex_value = '#' + ''.join([c*2 for c in hex_value[1:]])
-                if re.fullmatch(r'#[0-9a-fA-F]{6}', hex_value): swatch_label_widget.config(bg=hex_value)
-                else: swatch_label_widget.config(bg="SystemButtonFace")
+                if len(hex_value) == 4: _, r, g, b = hex_value; hex_value = f"#{r}{r}{g}{g}{b}{b}"
+                self._set_swatch_bg(swatch_label_widget, hex_value if _HEX6_RE.fullmatch(hex_value) else "SystemButtonFace")
             except tk.TclError: swatch_label_widget.config(bg="SystemButtonFace")
 
     def _browse_specific_image_path(self, param_key: str) -> None:
         if not self.image_storage: messagebox.showwarning("Warning", "Image storage not configured.", parent=self); return
-        initial_dir = os.path.abspath(self.image_storage.storage_dir)
+        initial_dir = self._storage_abs
         filepath = filedialog.askopenfilename(title=f"Select Image for {param_key}", initialdir=initial_dir, filetypes=[("Image Files", "*.png *.jpg *.bmp"), ("All Files", "*.*")], parent=self)
         if filepath:
             try:
-                rel_path = os.path.relpath(filepath, os.path.abspath("."))
-                self._set_widget_value(param_key, rel_path.replace('\\', '/'))
+                self._set_widget_value(param_key, self._cwd_relative(filepath))
             except ValueError: self._set_widget_value(param_key, filepath)
             except Exception as e: messagebox.showerror("Error", f"Could not process path: {e}", parent=self)
 
     def _browse_specific_text_file(self, param_key: str) -> None:
-        initial_dir = os.path.abspath(".")
-        if self.image_storage : initial_dir = os.path.abspath(self.image_storage.storage_dir)
+        initial_dir = self._cwd_abs
+        if self.image_storage : initial_dir = self._storage_abs
         filepath = filedialog.askopenfilename(title=f"Select Text File for {param_key}", initialdir=initial_dir, filetypes=[("Text Files", "*.txt"), ("All Files", "*.*")], parent=self)
         if filepath:
             try:
-                rel_path = os.path.relpath(filepath, os.path.abspath("."))
-                self._set_widget_value(param_key, rel_path.replace('\\', '/'))
+                self._set_widget_value(param_key, self._cwd_relative(filepath))
             except ValueError: self._set_widget_value(param_key, filepath)
             except Exception as e: messagebox.showerror("Error", f"Could not process path: {e}", parent=self)
 
 
     def _bind_recursive_mousewheel(self, parent_widget: tk.Widget) -> None:
-        self._bind_mouse_wheel(parent_widget)
-        for child in parent_widget.winfo_children(): self._bind_recursive_mousewheel(child)
+        bind = self._bind_mouse_wheel
+        stack = [parent_widget]
+        while stack:
+            widget = stack.pop(); bind(widget)
+            stack.extend(widget.winfo_children())
 
     def _start_coordinate_capture(self, num_points: int) -> None:
         if not _CaptureDepsImported:
@@ -1476,15 +2073,12 @@ class ConditionSettings(ttk.Frame):
 
         if isinstance(result_data, tuple) and len(result_data) == 2 and isinstance(result_data[0], int):
              abs_x, abs_y = result_data
-             self._set_widget_value("abs_color_x", abs_x)
-             self._set_widget_value("abs_color_y", abs_y)
+             pairs: List[Tuple[str, Any]] = [("abs_color_x", abs_x), ("abs_color_y", abs_y)]
              try:
-                 if _BridgeImported:
-                     hex_color = os_interaction_client.get_pixel_color(abs_x, abs_y)
-                     self._set_widget_value("color_hex", hex_color)
-                     self.after_idle(self._update_color_swatch)
+                 if _BridgeImported: pairs.append(("color_hex", os_interaction_client.get_pixel_color(abs_x, abs_y)))
              except Exception as e:
                  logger.warning(f"Could not get/set color after picking point: {e}")
+             self._batch_set_widget_values(pairs)
         else:
             logger.warning(f"Received unexpected data format from CoordinateCaptureWindow: {result_data}")
 
@@ -1507,10 +2101,7 @@ class ConditionSettings(ttk.Frame):
             logger.info("Region capture cancelled or failed.")
             return
 
-        self._set_widget_value(f"{region_keys_prefix_to_set}region_x1", result_data.get("x1"))
-        self._set_widget_value(f"{region_keys_prefix_to_set}region_y1", result_data.get("y1"))
-        self._set_widget_value(f"{region_keys_prefix_to_set}region_x2", result_data.get("x2"))
-        self._set_widget_value(f"{region_keys_prefix_to_set}region_y2", result_data.get("y2"))
+        self._batch_set_widget_values([(f"{region_keys_prefix_to_set}region_{k}", result_data.get(k)) for k in ("x1", "y1", "x2", "y2")])
 
         img_np_captured = result_data.get("image_np")
         if img_np_captured is None:
@@ -1519,11 +2110,12 @@ class ConditionSettings(ttk.Frame):
             return
 
         self._last_captured_region_np = img_np_captured.copy()
-        current_type = self._filtered_action_condition_display_to_internal_map.get(self.type_var.get(), NoneCondition.TYPE)
-        show_preview_area = self._filtered_condition_type_settings.get(current_type, {}).get("show_preview", False)
+        self._invalidate_color_analysis_cache()
+        current_type = self._current_type_internal
+        show_preview_area = self._type_table.get(current_type, (False, None))[0]
 
         if show_preview_area and not is_multi_image_overall_capture : # Only update general preview if not for multi-image overall
-            self._display_pil_image(self._numpy_to_pil(img_np_captured))
+            self._display_pil_image(self._last_capture_to_pil(), source_bgr=self._last_captured_region_np)
 
         if save_new_image and self.image_storage:
             if (current_type == ImageOnScreenCondition.TYPE and image_path_key_to_set == "image_path") or \
@@ -1534,7 +2126,7 @@ class ConditionSettings(ttk.Frame):
                     saved_relative_path = self.image_storage.save_image(img_np_captured, base_name)
                     self._set_widget_value(image_path_key_to_set, saved_relative_path)
                     if image_path_key_to_set == "multi_anchor_image_path": # If it was for the anchor of multi-image
-                        self.multi_image_anchor_preview_image_pil = Image.open(self.image_storage.get_full_path(saved_relative_path))
+                        self._set_multi_image_anchor(Image.open(self.image_storage.get_full_path(saved_relative_path)))
                         self._multi_image_redraw_canvas()
 
                 except Exception as e:
@@ -1548,9 +2140,11 @@ class ConditionSettings(ttk.Frame):
             self._perform_ocr_preview(img_np_captured)
 
     def _trigger_preview_preprocessing(self) -> None:
-        current_type = self._filtered_action_condition_display_to_internal_map.get(self.type_var.get(), NoneCondition.TYPE)
+        current_type = self._current_type_internal
         if not _ImageProcessingAvailable_UI: messagebox.showerror("Error", "Image processing library (OpenCV) missing.", parent=self); return
-        source_image_np: Optional[np.ndarray] = None
+        # Either an ndarray or a file path; files are decoded on the worker thread.
+        source: Any = None
+        source_label = ""
         
         if current_type == ImageOnScreenCondition.TYPE:
             image_path = self._get_widget_value("image_path", "")
@@ -1558,13 +2152,10 @@ class ConditionSettings(ttk.Frame):
             if not self.image_storage: messagebox.showerror("Error", "Image storage unavailable.", parent=self); return
             full_path = self.image_storage.get_full_path(image_path)
             if not self.image_storage.file_exists(image_path): messagebox.showerror("Error", f"Image file not found:\n{full_path}", parent=self); return
-            try:
-                source_image_np = cv2.imread(full_path, cv2.IMREAD_UNCHANGED)
-                if source_image_np is None: raise ValueError("cv2.imread returned None")
-            except Exception as e: messagebox.showerror("Error", f"Failed to load image '{image_path}':\n{e}", parent=self); return
-        elif current_type == TextOnScreenCondition.TYPE or current_type == RegionColorCondition.TYPE or current_type == TextInRelativeRegionCondition.TYPE :
+            source = full_path; source_label = image_path
+        elif current_type in _REGION_CAPTURE_PREVIEW_TYPES:
             if self._last_captured_region_np is None: messagebox.showinfo("Info", "Please use 'Select Region' or 'Select & OCR' first to capture a region for preview.", parent=self); return
-            source_image_np = self._last_captured_region_np.copy()
+            source = self._last_captured_region_np.copy()
         elif current_type == MultiImageCondition.TYPE:
             # For MultiImage, preview might mean previewing the Anchor's preprocessing
             # Or previewing a selected Sub-Image's preprocessing.
@@ -1572,48 +2163,78 @@ class ConditionSettings(ttk.Frame):
             # For now, let's assume it previews the anchor if set.
             anchor_path = self._get_widget_value("multi_anchor_image_path", "")
             if anchor_path and self.image_storage and self.image_storage.file_exists(anchor_path):
-                full_anchor_path = self.image_storage.get_full_path(anchor_path)
-                try: source_image_np = cv2.imread(full_anchor_path, cv2.IMREAD_UNCHANGED)
-                except: pass
-            if source_image_np is None:
+                source = self.image_storage.get_full_path(anchor_path); source_label = anchor_path
+            if source is None:
                  messagebox.showinfo("Info", "Set an anchor image for MultiImage to preview its processing.", parent=self); return
         else: return
 
-        if source_image_np is None: self._clear_preview(); self._recognized_text_var.set("Preview Error: No source."); return
-        
-        current_pp_params = self._get_current_ui_params()
-        processed_image_np: Optional[np.ndarray] = None
+        kind = "none"; params_to_use: Dict[str, Any] = {}
+        if current_type == ImageOnScreenCondition.TYPE or current_type == MultiImageCondition.TYPE: # Use image matching for MultiImage anchor/sub
+            kind = "matching"
+            if current_type == MultiImageCondition.TYPE:
+                 # TODO: This needs UI to select if previewing anchor or a sub-image and use respective params
+                 # For now, using general params as a placeholder
+                 params_to_use = self._get_prefixed_ui_params("multi_anchor_pp_")
+            if not params_to_use: params_to_use = self._get_current_ui_params() # Fallback
+        elif current_type in _OCR_TEXT_TYPES:
+            kind = "ocr"
+            params_to_use = self._get_prefixed_ui_params("ocr_pp_")
+            if not params_to_use:
+                params_to_use = {k:v for k,v in self._get_current_ui_params().items() if not k.startswith("anchor_pp_")}
+
+        self._preview_generation += 1
+        if self._preview_future is not None: self._preview_future.cancel()
+        self._cancel_ocr_preview()
+        generation = self._preview_generation
+        future = self._get_preview_pool().submit(self._run_preprocess_bg, source, params_to_use, kind)
+        self._preview_future = future
+        future.add_done_callback(lambda f: self._schedule_preview_render(generation, current_type, source_label, f))
+
+    @classmethod
+    def _get_preview_pool(cls) -> concurrent.futures.ThreadPoolExecutor:
+        if cls._preview_pool is None:
+            cls._preview_pool = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="PreviewPreprocess")
+        return cls._preview_pool
+
+    @staticmethod
+    def _run_preprocess_bg(source: Any, params: Dict[str, Any], kind: str) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+        if isinstance(source, str):
+            source = cv2.imread(source, cv2.IMREAD_UNCHANGED)
+            if source is None: return None, None
+        if kind == "matching": return source, preprocess_for_image_matching(source, params)
+        if kind == "ocr": return source, preprocess_for_ocr(source, params)
+        return source, source
+
+    def _schedule_preview_render(self, generation: int, current_type: str, source_label: str, future: concurrent.futures.Future) -> None:
+        if future.cancelled(): return
         try:
-            if current_type == ImageOnScreenCondition.TYPE or (current_type == MultiImageCondition.TYPE and source_image_np is not None): # Use image matching for MultiImage anchor/sub
-                # For MultiImage, decide if params are anchor-specific or sub-image common
-                params_to_use_for_multi = {}
-                if current_type == MultiImageCondition.TYPE:
-                     # TODO: This needs UI to select if previewing anchor or a sub-image and use respective params
-                     # For now, using general params as a placeholder
-                     params_to_use_for_multi = {k.replace("multi_anchor_pp_", ""):v for k,v in current_pp_params.items() if k.startswith("multi_anchor_pp_")}
-                     if not params_to_use_for_multi: params_to_use_for_multi = current_pp_params # Fallback
-
-                processed_image_np = preprocess_for_image_matching(source_image_np, current_pp_params if current_type != MultiImageCondition.TYPE else params_to_use_for_multi)
-
-            elif current_type == TextOnScreenCondition.TYPE or current_type == TextInRelativeRegionCondition.TYPE:
-                ocr_pp_params = {k.replace("ocr_pp_", ""): v for k,v in current_pp_params.items() if k.startswith("ocr_pp_")}
-                if not ocr_pp_params:
-                    ocr_pp_params = {k:v for k,v in current_pp_params.items() if not k.startswith("anchor_pp_")}
-                processed_image_np = preprocess_for_ocr(source_image_np, ocr_pp_params)
-            elif current_type == RegionColorCondition.TYPE:
-                processed_image_np = source_image_np
+            self.after(0, self._on_preview_processed, generation, current_type, source_label, future)
+        except (tk.TclError, RuntimeError) as e:
+            logger.debug(f"Could not schedule preview render (widget likely destroyed): {e}")
 
+    def _on_preview_processed(self, generation: int, current_type: str, source_label: str, future: concurrent.futures.Future) -> None:
+        if generation != self._preview_generation or not self._widgets_alive: return
+        self._preview_future = None
+        try:
+            source_image_np, processed_image_np = future.result()
+            if source_image_np is None:
+                if current_type == MultiImageCondition.TYPE: messagebox.showinfo("Info", "Set an anchor image for MultiImage to preview its processing.", parent=self)
+                else: messagebox.showerror("Error", f"Failed to load image '{source_label}':\ncv2.imread returned None", parent=self)
+                return
             if processed_image_np is None: messagebox.showerror("Processing Error", "Image preprocessing failed. Check logs.", parent=self); self._clear_preview(); self._recognized_text_var.set("Preview Error: Processing failed."); return
             
-            self._display_pil_image(self._numpy_to_pil(processed_image_np))
+            self._display_pil_image(self._numpy_to_pil(processed_image_np), source_bgr=processed_image_np)
             
-            if current_type == TextOnScreenCondition.TYPE or current_type == TextInRelativeRegionCondition.TYPE:
+            if current_type in _OCR_TEXT_TYPES:
                  self._perform_ocr_preview(processed_image_np)
-        except Exception as e: messagebox.showerror("Preview Error", f"Error during preview generation:\n{e}", parent=self); self._clear_preview();
-        if hasattr(self, '_recognized_text_var'): self._recognized_text_var.set("Preview Error.")
+        except Exception as e:
+            messagebox.showerror("Preview Error", f"Error during preview generation:\n{e}", parent=self); self._clear_preview()
+            if hasattr(self, '_recognized_text_var'): self._recognized_text_var.set("Preview Error.")
 
     def _perform_ocr_preview(self, img_np_processed: Optional[np.ndarray]) -> None:
-         if not (_ImageProcessingAvailable_UI and _PytesseractAvailable_UI):
+         self._cancel_ocr_preview()
+         pytesseract = _get_pytesseract_ui() if _ImageProcessingAvailable_UI else None
+         if pytesseract is None:
              self._recognized_text_var.set("OCR Preview: Dependencies missing (OpenCV or Tesseract)."); return
          if img_np_processed is None: self._recognized_text_var.set("OCR Preview: No image data."); return
          try:
@@ -1624,32 +2245,92 @@ class ConditionSettings(ttk.Frame):
                   whitelist = self._get_widget_value("ocr_char_whitelist", "")
                   user_words_path = self._get_widget_value("ocr_user_words_file_path", "") or self._get_widget_value("user_words_file_path", "")
 
-                  preview_config_parts = [f'--psm {psm}', '--oem 3', f'-l {lang}']
-                  if whitelist: preview_config_parts.append(f'-c tessedit_char_whitelist={whitelist}')
-                  if user_words_path:
-                      full_user_words_path = os.path.abspath(user_words_path)
-                      if os.path.exists(full_user_words_path): preview_config_parts.append(f'-c tessedit_user_words_file="{full_user_words_path}"')
-                      else: logger.warning(f"OCR Preview: User words file not found: {full_user_words_path}")
-                  
-                  preview_config_str = " ".join(preview_config_parts)
-                  recognized_text = pytesseract.image_to_string(img_pil_preview, config=preview_config_str)
-                  self._recognized_text_var.set(f"Preview: '{recognized_text.strip()}'")
+                  config_key = (lang, psm, whitelist, user_words_path)
+                  preview_config_str = self._ocr_preview_config_cache.get(config_key)
+                  if preview_config_str is None:
+                      preview_config_parts = [f'--psm {psm}', '--oem 3', f'-l {lang}']
+                      if whitelist: preview_config_parts.append(f'-c tessedit_char_whitelist={whitelist}')
+                      user_words_found = True
+                      if user_words_path:
+                          full_user_words_path = os.path.abspath(user_words_path)
+                          user_words_found = os.path.exists(full_user_words_path)
+                          if user_words_found: preview_config_parts.append(f'-c tessedit_user_words_file="{full_user_words_path}"')
+                          else: logger.warning(f"OCR Preview: User words file not found: {full_user_words_path}")
+                      preview_config_str = " ".join(preview_config_parts)
+                      # A missing user-words file is re-checked next time in case it gets created.
+                      if user_words_found: self._ocr_preview_config_cache[config_key] = preview_config_str
+                  self._recognized_text_var.set("OCR Preview: Recognizing...")
+                  generation = self._ocr_generation
+                  future = self._get_preview_pool().submit(pytesseract.image_to_string, img_pil_preview, config=preview_config_str)
+                  self._ocr_future = future
+                  future.add_done_callback(lambda f: self._schedule_ocr_preview_result(generation, f))
              else: self._recognized_text_var.set("OCR Preview: Image conversion failed.")
-         except pytesseract.TesseractNotFoundError: self._recognized_text_var.set("OCR Preview: Tesseract not found or not configured.")
          except Exception as e: self._recognized_text_var.set(f"OCR Preview Error: {str(e)[:100]}")
 
+    def _cancel_ocr_preview(self) -> None:
+        self._ocr_generation += 1
+        if self._ocr_future is not None: self._ocr_future.cancel(); self._ocr_future = None
+
+    def _schedule_ocr_preview_result(self, generation: int, future: concurrent.futures.Future) -> None:
+        if future.cancelled(): return
+        try:
+            self.after(0, self._on_ocr_preview_done, generation, future)
+        except (tk.TclError, RuntimeError) as e:
+            logger.debug(f"Could not schedule OCR preview result (widget likely destroyed): {e}")
+
+    def _on_ocr_preview_done(self, generation: int, future: concurrent.futures.Future) -> None:
+        if generation != self._ocr_generation or not self._widgets_alive: return
+        self._ocr_future = None
+        pytesseract = _get_pytesseract_ui()
+        try: self._recognized_text_var.set(f"Preview: '{future.result().strip()}'")
+        except Exception as e:
+            if pytesseract is not None and isinstance(e, pytesseract.TesseractNotFoundError): self._recognized_text_var.set("OCR Preview: Tesseract not found or not configured.")
+            else: self._recognized_text_var.set(f"OCR Preview Error: {str(e)[:100]}")
+
+
+    def _last_capture_rgb(self) -> Optional[np.ndarray]:
+        src = self._last_captured_region_np
+        if src is None: return None
+        # Bridge captures are decoded with IMREAD_UNCHANGED, so BGRA and grayscale frames show up too.
+        code = _CAPTURE_TO_RGB_CODES.get(src.shape[2] if src.ndim == 3 else 1) if src.dtype == np.uint8 and src.ndim in (2, 3) else None
+        if code is None: return self._get_preview_rgb()
+        cached = self._last_capture_rgb_cache
+        if cached is not None and cached[0] is src: return cached[1]
+        rgb_np = cv2.cvtColor(src, code); rgb_np.flags.writeable = False
+        self._last_capture_rgb_cache = (src, rgb_np)
+        return rgb_np
+
+    def _last_capture_to_pil(self) -> Optional[Image.Image]:
+        # Adding/removing target colours re-analyses the same capture; convert it once.
+        src = self._last_captured_region_np
+        cached = self._last_capture_pil
+        if cached is not None and cached[0] is src: return cached[1]
+        pil_image = self._numpy_to_pil(src)
+        self._last_capture_pil = (src, pil_image) if src is not None else None
+        return pil_image
 
     def _numpy_to_pil(self, img_np: Optional[np.ndarray]) -> Optional[Image.Image]:
         if img_np is None: return None
         try:
             if img_np.ndim == 3:
                 if img_np.shape[2] == 4: return Image.fromarray(cv2.cvtColor(img_np, cv2.COLOR_BGRA2RGBA))
-                elif img_np.shape[2] == 3: return Image.fromarray(cv2.cvtColor(img_np, cv2.COLOR_BGR2RGB))
-            elif img_np.ndim == 2: return Image.fromarray(img_np, 'L')
+                elif img_np.shape[2] == 3:
+                    # Pillow stores RGB padded to 4 bytes/pixel, so one copy is unavoidable; the raw "BGR"
+                    # unpacker swaps channels during that copy, so no intermediate RGB array.
+                    if img_np.dtype == np.uint8: return Image.frombuffer("RGB", (img_np.shape[1], img_np.shape[0]), np.ascontiguousarray(img_np), "raw", "BGR", 0, 1)
+                    return Image.fromarray(cv2.cvtColor(img_np, cv2.COLOR_BGR2RGB))
+            elif img_np.ndim == 2:
+                # Contiguous 8-bit grayscale maps straight onto the ndarray (the image keeps it alive).
+                if img_np.dtype == np.uint8 and img_np.flags.c_contiguous: return Image.frombuffer("L", (img_np.shape[1], img_np.shape[0]), img_np, "raw", "L", 0, 1)
+                return Image.fromarray(img_np, 'L')
             return None
         except Exception as e: logger.error(f"Error converting numpy to PIL: {e}"); return None
 
-    def _display_pil_image(self, img_pil: Optional[Image.Image]) -> None:
+    def _display_pil_image(self, img_pil: Optional[Image.Image], source_bgr: Optional[np.ndarray] = None) -> None:
+        if self._display_retry_after_id is not None:
+            try: self.after_cancel(self._display_retry_after_id)
+            except tk.TclError: pass
+            self._display_retry_after_id = None
         if not (hasattr(self, 'preview_label') and self.preview_label.winfo_exists()):
             logger.debug("_display_pil_image: Preview label does not exist.")
             return
@@ -1660,50 +2341,57 @@ class ConditionSettings(ttk.Frame):
             logger.debug("_display_pil_image: Received None for img_pil. Clearing preview.")
             self._clear_preview()
             self._current_preview_image_pil = None 
-            self.after_idle(lambda: self._update_color_analysis_display(None))
+            self._request_color_analysis(None)
             return
 
         try:
             self._current_preview_image_pil = img_pil.copy()
+            self._preview_source_bgr = source_bgr
 
-            img_display_thumb = img_pil.copy()
-            
             preview_widget.update_idletasks()
             widget_width = preview_widget.winfo_width()
             widget_height = preview_widget.winfo_height()
 
             if widget_width <= 1 or widget_height <= 1:
                 logger.debug(f"_display_pil_image: Preview label too small ({widget_width}x{widget_height}). Retrying display.")
-                self.after(50, lambda: self._display_pil_image(img_pil))
+                self._display_retry_after_id = self.after(50, self._display_pil_image, img_pil, source_bgr)
                 return
 
+            from PIL import ImageTk
             max_preview_size = (max(10, widget_width - 4), max(10, widget_height - 4))
+            # Integer box-reduce to within 2x of the target so LANCZOS only runs on a small image.
+            factor = min(img_pil.width // max_preview_size[0], img_pil.height // max_preview_size[1])
+            img_display_thumb = None
+            if factor >= 2:
+                try: img_display_thumb = img_pil.reduce(factor)
+                except ValueError: pass
+            if img_display_thumb is None: img_display_thumb = img_pil.copy()
             img_display_thumb.thumbnail(max_preview_size, Image.Resampling.LANCZOS)
             self._current_preview_image_tk = ImageTk.PhotoImage(img_display_thumb)
             preview_widget.config(image=self._current_preview_image_tk, text="")
             logger.debug(f"_display_pil_image: Image displayed. Thumbnail size: {img_display_thumb.size}")
 
 
-            current_type = self._filtered_action_condition_display_to_internal_map.get(self.type_var.get(), NoneCondition.TYPE)
+            current_type = self._current_type_internal
             if current_type == RegionColorCondition.TYPE:
                 if self._current_preview_image_pil:
-                    img_np_rgb_for_analysis = np.array(self._current_preview_image_pil.convert("RGB"))
+                    img_np_rgb_for_analysis = self._get_preview_rgb()
                     target_colors_defs = []
                     if self._current_condition_obj and hasattr(self._current_condition_obj, 'params'):
                          target_colors_defs = self._current_condition_obj.params.get("target_colors", [])
                     
                     logger.debug(f"_display_pil_image: Triggering color analysis for RegionColor with {len(target_colors_defs)} target(s).")
-                    self.after_idle(lambda: self._update_color_analysis_display(img_np_rgb_for_analysis, colors_to_analyze_defs=target_colors_defs))
+                    self._request_color_analysis(img_np_rgb_for_analysis, colors_to_analyze_defs=target_colors_defs)
                 else: 
                     logger.warning("_display_pil_image: _current_preview_image_pil is None despite img_pil being present. Cannot analyze.")
-                    self.after_idle(lambda: self._update_color_analysis_display(None))
+                    self._request_color_analysis(None)
     
 
         except Exception as e:
             preview_widget.config(text="Preview Err", image=''); self._current_preview_image_tk = None
             self._current_preview_image_pil = None
             logger.error(f"Error displaying PIL image: {e}", exc_info=True)
-            self.after_idle(lambda: self._update_color_analysis_display(None))
+            self._request_color_analysis(None)
 
     def _load_preview_image(self, relative_image_path: str) -> None:
         if not hasattr(self, 'preview_label') or not self.preview_label.winfo_exists(): return
@@ -1714,16 +2402,40 @@ class ConditionSettings(ttk.Frame):
              self.preview_label.config(text=f"Not Found:\n{os.path.basename(relative_image_path)}", image=''); self._current_preview_image_tk = None
              return
         try:
-            img_pil = Image.open(full_path)
-            self._current_preview_image_pil = img_pil.copy()
+            key = (full_path, os.path.getmtime(full_path))
+            cache = self._preview_image_cache
+            img_pil = cache.pop(key, None)
+            if img_pil is None:
+                with Image.open(full_path) as img_pil: img_pil.load()
+                if len(cache) >= self._PREVIEW_IMAGE_CACHE_MAX: cache.pop(next(iter(cache)))
+            cache[key] = img_pil
             self._display_pil_image(img_pil)
-            img_pil.close()
         except Exception as e:
             self.preview_label.config(text="Preview Err", image=''); self._current_preview_image_tk = None; self._current_preview_image_pil = None
             logger.error(f"Error loading preview image '{relative_image_path}': {e}")
 
+    def _get_preview_rgb(self) -> Optional[np.ndarray]:
+        pil_image = self._current_preview_image_pil
+        if pil_image is None: return None
+        cached = self._preview_rgb_cache
+        if cached is not None and cached[0] is pil_image: return cached[1]
+        # Previews built from a BGR ndarray are swapped straight from it (cv2) instead of read back out of PIL.
+        src = self._preview_source_bgr
+        if src is not None and src.ndim == 3 and src.shape[2] == 3 and src.dtype == np.uint8 and src.shape[:2] == (pil_image.height, pil_image.width):
+            if src is self._last_captured_region_np: rgb_np = self._last_capture_rgb()
+            else: rgb_np = cv2.cvtColor(src, cv2.COLOR_BGR2RGB); rgb_np.flags.writeable = False
+            self._preview_rgb_cache = (pil_image, rgb_np)
+            return rgb_np
+        rgb_np = np.asarray(pil_image if pil_image.mode == "RGB" else pil_image.convert("RGB"), dtype=np.uint8, order="C")
+        if rgb_np.flags.writeable:
+            try: rgb_np.flags.writeable = False
+            except ValueError: pass
+        self._preview_rgb_cache = (pil_image, rgb_np)
+        return rgb_np
+
     def _clear_preview(self, keep_text: bool = False) -> None:
         self._current_preview_image_pil = None; self._current_preview_image_tk = None
+        self._preview_rgb_cache = None; self._preview_source_bgr = None
         if hasattr(self, 'preview_label') and self.preview_label.winfo_exists():
             self.preview_label.config(image='')
             if not keep_text: self.preview_label.config(text='Preview Area')
@@ -1734,216 +2446,263 @@ class ConditionSettings(ttk.Frame):
                 if isinstance(w, widget_type): return w
         return None
 
-    def _get_widget_value(self, key: str, default: Any = None) -> Any:
+    def _widget_roles(self, key: str) -> Optional[Tuple[Optional[tk.Variable], Optional[ttk.Entry], Optional[ttk.Combobox]]]:
+        # (variable, entry, combobox) for a param key, resolved once per registered widget list.
         widget_info = self.param_widgets.get(key)
-        if not widget_info: return default
+        if not widget_info: return None
+        cached = self._widget_role_cache.get(key)
+        if cached is not None and cached[0] is widget_info: return cached[1]
+        find = self._find_widget_in_list
+        roles = (find(widget_info, tk.Variable), find(widget_info, ttk.Entry), find(widget_info, ttk.Combobox))
+        self._widget_role_cache[key] = (widget_info, roles)
+        return roles
+
+    def _get_widget_value(self, key: str, default: Any = None) -> Any:
+        roles = self._widget_roles(key)
+        if roles is None: return default
+        variable, entry, combobox = roles
         try:
-            variable = self._find_widget_in_list(widget_info, tk.Variable)
             if variable: return variable.get()
-            entry = self._find_widget_in_list(widget_info, ttk.Entry)
             if entry: return entry.get()
-            combobox = self._find_widget_in_list(widget_info, ttk.Combobox)
             if combobox: return combobox.get()
             return default
         except Exception: return default
 
-    def _set_widget_value(self, key: str, value: Any, default: Any = "") -> None:
-         widget_info = self.param_widgets.get(key)
-         if not widget_info: return
+    def _set_widget_value(self, key: str, value: Any, default: Any = "", defer_callbacks: bool = False) -> None:
+         roles = self._widget_roles(key)
+         if roles is None: return
+         variable, entry, combobox = roles
          val_to_set = value if value is not None else default
          try:
-             variable = self._find_widget_in_list(widget_info, tk.Variable)
              if variable:
-                 if isinstance(variable, tk.BooleanVar): variable.set(bool(val_to_set))
-                 elif isinstance(variable, tk.StringVar): variable.set(str(val_to_set) if val_to_set is not None else "")
-                 else:
-                     try: variable.set(val_to_set)
-                     except: pass
+                 _VAR_SETTERS.get(type(variable), _set_var_raw)(variable, val_to_set)
+                 if defer_callbacks: return
                  if key == "color_hex" and hasattr(self, '_update_color_swatch'): self.after_idle(self._update_color_swatch)
                  elif key == "target_color_hex" and hasattr(self, '_update_specific_color_swatch') and hasattr(self, 'region_color_swatch') and self.region_color_swatch.winfo_exists():
-                      hex_entry_rc = self._find_widget_in_list(self.param_widgets.get("target_color_hex"), ttk.Entry)
-                      if hex_entry_rc: self.after_idle(lambda: self._update_specific_color_swatch(None, hex_entry_rc, self.region_color_swatch))
+                      if entry: self.after_idle(lambda: self._update_specific_color_swatch(None, entry, self.region_color_swatch))
                  return
-             entry = self._find_widget_in_list(widget_info, ttk.Entry)
              if entry:
                  entry.delete(0, tk.END); entry.insert(0, str(val_to_set) if val_to_set is not None else "")
+                 if defer_callbacks: return
                  if key == "color_hex" and hasattr(self, '_update_color_swatch'): self.after_idle(self._update_color_swatch)
                  elif key == "target_color_hex" and hasattr(self, '_update_specific_color_swatch') and hasattr(self, 'region_color_swatch') and self.region_color_swatch.winfo_exists():
                       self.after_idle(lambda: self._update_specific_color_swatch(None, entry, self.region_color_swatch))
 
-                 if key == "image_path" or key == "anchor_image_path" or key == "multi_anchor_image_path":
+                 if key in _PREVIEW_PATH_KEYS:
                      if val_to_set: self.after_idle(self._load_preview_image, str(val_to_set))
                      else: self.after_idle(self._clear_preview)
                  return
-             combobox = self._find_widget_in_list(widget_info, ttk.Combobox)
              if combobox: combobox.set(str(val_to_set) if val_to_set is not None else ""); return
          except Exception as e: logger.error(f"Error setting widget value for key '{key}': {e}")
 
+    def _batch_set_widget_values(self, pairs: List[Tuple[str, Any]]) -> None:
+        keys = set()
+        for key, value in pairs:
+            self._set_widget_value(key, value, defer_callbacks=True); keys.add(key)
+        if keys & _BATCH_REFRESH_KEYS: self.after_idle(self._post_batch_refresh, frozenset(keys))
+
+    def _post_batch_refresh(self, keys: frozenset) -> None:
+        if not self._widgets_alive: return
+        if "color_hex" in keys and hasattr(self, '_update_color_swatch'): self._update_color_swatch()
+        if "target_color_hex" in keys and hasattr(self, 'region_color_swatch') and self.region_color_swatch.winfo_exists():
+            hex_entry_rc = (self._widget_roles("target_color_hex") or (None, None, None))[1]
+            if hex_entry_rc: self._update_specific_color_swatch(None, hex_entry_rc, self.region_color_swatch)
+        for key in _PREVIEW_PATH_KEYS & keys:
+            val = self._get_widget_value(key, "")
+            if val: self._load_preview_image(str(val))
+            else: self._clear_preview()
+
+    def _param_keys_with_prefix(self, prefix: str) -> List[str]:
+        # Bucketed per param_widgets dict; the length check catches keys registered after the first lookup.
+        widgets = self.param_widgets
+        cache = self._prefix_key_cache
+        if cache is None or cache[0] is not widgets or cache[1] != len(widgets):
+            cache = self._prefix_key_cache = (widgets, len(widgets), {})
+        keys = cache[2].get(prefix)
+        if keys is None: keys = cache[2][prefix] = [k for k in widgets if k.startswith(prefix)]
+        return keys
+
+    def _get_prefixed_ui_params(self, prefix: str) -> Dict[str, Any]:
+        n = len(prefix); get_value = self._get_widget_value
+        return {k[n:]: get_value(k) for k in self._param_keys_with_prefix(prefix)}
+
     def _get_current_ui_params(self) -> Dict[str, Any]:
+        # Every param widget writes through a traced Tk variable, so an unchanged page can reuse the last sweep.
+        cached = self._cached_ui_params
+        if not self._params_dirty and cached is not None and cached[0] is self.param_widgets: return dict(cached[1])
         params: Dict[str, Any] = {}
         for key in self.param_widgets.keys():
-             if key.startswith("_") or key in ["preview_label", "recognized_text_label", "capture_button", "capture_region_btn", "browse_btn", "capture_save_btn", "capture_ocr_btn", "preview_button", "separator", "browse_user_words_btn", "browse_anchor_btn", "capture_anchor_btn", "capture_color_region_btn", "capture_overall_region_btn", "browse_ocr_user_words_btn", "multi_image_add_anchor_btn", "multi_image_add_sub_btn", "multi_image_clear_button", "add_target_color_button", "edit_target_color_button", "remove_target_color_button", "analyze_top_n_button", "analyze_targets_button"]:
+             if key[:1] == "_" or key in _SKIP_PARAM_KEYS:
                  continue
              params[key] = self._get_widget_value(key)
-        return params
+        self._cached_ui_params = (self.param_widgets, params); self._params_dirty = False
+        return dict(params)
 
     def get_settings(self) -> Dict[str, Any]:
         selected_display_key = self.type_var.get()
         condition_type = self._filtered_action_condition_display_to_internal_map.get(selected_display_key, NoneCondition.TYPE)
         params: Dict[str, Any] = {}
+        # Each widget is read from Tk at most once per save, and only if its key is actually collected.
+        raw_values: Dict[str, Any] = {}
+        get_widget_value = self._get_widget_value
         def get_val(key: str, type_func: Callable, default: Any = None, required: bool = False, validation_func: Optional[Callable[[Any], bool]] = None, error_msg: str = "") -> Any:
-            val_str_or_bool = self._get_widget_value(key)
+            if key in raw_values: val_str_or_bool = raw_values[key]
+            else: val_str_or_bool = raw_values[key] = get_widget_value(key)
             
-            if isinstance(val_str_or_bool, bool) and type_func == bool:
-                val = val_str_or_bool
-            elif val_str_or_bool is None or str(val_str_or_bool).strip() == "":
+            raw_type = type(val_str_or_bool)
+            if val_str_or_bool is None or (raw_type is str and not val_str_or_bool.strip()):
                 if required: raise ValueError(f"'{key}' cannot be empty. {error_msg}")
                 return default
+            if raw_type is type_func:
+                val = val_str_or_bool
             else:
-                try: val = type_func(str(val_str_or_bool))
+                try: val = type_func(val_str_or_bool if raw_type is str else str(val_str_or_bool))
                 except (ValueError, TypeError) as e: raise ValueError(f"Invalid value for '{key}': '{val_str_or_bool}'. Expected {type_func.__name__}. {error_msg} ({e})")
             
             if validation_func and not validation_func(val): raise ValueError(f"Validation failed for '{key}'. {error_msg}")
             return val
 
         try:
-            if condition_type in [ColorAtPositionCondition.TYPE, ImageOnScreenCondition.TYPE, TextOnScreenCondition.TYPE, RegionColorCondition.TYPE, TextInRelativeRegionCondition.TYPE, MultiImageCondition.TYPE]:
-                params["region_x1"] = get_val("region_x1", int, 0); params["region_y1"] = get_val("region_y1", int, 0)
-                x2_default = params["region_x1"] + 1
-                y2_default = params["region_y1"] + 1
-                if condition_type == MultiImageCondition.TYPE:
-                    x2_default = -1 
-                    y2_default = -1
-
-                x2 = get_val("region_x2", int, x2_default)
-                y2 = get_val("region_y2", int, y2_default)
+            if condition_type in _REGION_PARAM_TYPES:
+                x1 = params["region_x1"] = get_val("region_x1", int, 0); y1 = params["region_y1"] = get_val("region_y1", int, 0)
+                is_multi = condition_type == MultiImageCondition.TYPE
+                x2 = get_val("region_x2", int, -1 if is_multi else x1 + 1)
+                y2 = get_val("region_y2", int, -1 if is_multi else y1 + 1)
                 
-                if condition_type != MultiImageCondition.TYPE or (x2 != -1 and y2 != -1) :
-                    if x2 != -1 and x2 <= params["region_x1"]: raise ValueError(f"Region X2 must be > X1 or -1")
-                    if y2 != -1 and y2 <= params["region_y1"]: raise ValueError(f"Region Y2 must be > Y1 or -1")
+                if not is_multi or (x2 != -1 and y2 != -1) :
+                    if x2 != -1 and x2 <= x1: raise ValueError(f"Region X2 must be > X1 or -1")
+                    if y2 != -1 and y2 <= y1: raise ValueError(f"Region Y2 must be > Y1 or -1")
                 
                 params["region_x2"] = x2; params["region_y2"] = y2
 
-
-            if condition_type == ColorAtPositionCondition.TYPE:
-                params["abs_color_x"] = get_val("abs_color_x", int, 0); params["abs_color_y"] = get_val("abs_color_y", int, 0)
-                hex_val = get_val("color_hex", str, "#000000", required=True)
-                try: hex_to_rgb(hex_val)
-                except ValueError as hex_e: raise ValueError(f"Invalid Target Color format: {hex_e}")
-                params["color_hex"] = hex_val
-                params["tolerance"] = get_val("tolerance", int, 0, validation_func=lambda v: 0 <= v <= 765, error_msg="Tolerance must be 0-765")
-            elif condition_type == ImageOnScreenCondition.TYPE:
-                 params["image_path"] = get_val("image_path", str, "", required=True)
-                 method_display = get_val("matching_method", str, "Template"); params["matching_method"]={"Template":"template","Feature":"feature"}.get(method_display,"template")
-                 params["template_matching_method"]=get_val("template_matching_method",str,"TM_CCOEFF_NORMED")
-                 params["threshold"]=get_val("threshold",float,0.8, validation_func=lambda v: 0.0 <= v <= 1.0, error_msg="Threshold 0.0-1.0")
-                 params["orb_nfeatures"]=get_val("orb_nfeatures",int,500, validation_func=lambda v: v >= 50, error_msg="ORB Features >= 50")
-                 params["min_feature_matches"]=get_val("min_feature_matches",int,10, validation_func=lambda v: v >= 4, error_msg="Min Matches >= 4")
-                 params["homography_inlier_ratio"]=get_val("homography_inlier_ratio",float,0.8, validation_func=lambda v: 0.1 <= v <= 1.0, error_msg="Inlier Ratio 0.1-1.0")
-                 params["selection_strategy"] = get_val("selection_strategy", str, "first_found")
-                 if params["selection_strategy"] == "closest_to_point":
-                     ref_x = get_val("reference_point_x", int, None) 
-                     ref_y = get_val("reference_point_y", int, None)
-                     if ref_x is None or ref_y is None:
-                         raise ValueError("Reference X and Y are required for 'closest_to_point' strategy.")
-                     params["reference_point_for_closest_strategy"] = f"{ref_x},{ref_y}"
-                 else:
-                     params.pop("reference_point_for_closest_strategy", None)
-                     params.pop("reference_point_x", None) 
-                     params.pop("reference_point_y", None)
-
-                 params["grayscale"]=get_val("grayscale", bool, True); params["binarization"]=get_val("binarization", bool, False)
-                 params["gaussian_blur"]=get_val("gaussian_blur", bool, False); params["median_blur"]=get_val("median_blur", bool, False)
-                 params["clahe"]=get_val("clahe", bool, False); params["bilateral_filter"]=get_val("bilateral_filter", bool, False)
-                 params["canny_edges"]=get_val("canny_edges", bool, False)
-                 params["gaussian_blur_kernel"]=get_val("gaussian_blur_kernel", str, "3,3", validation_func=lambda v_str: parse_tuple_str(v_str, 2, int) is not None and all(k>0 and k%2==1 for k in parse_tuple_str(v_str,2,int) or [0,0]), error_msg="Kernel 'w,h', positive odd ints")
-                 params["median_blur_kernel"]=get_val("median_blur_kernel", int, 3, validation_func=lambda v: v > 0 and v % 2 == 1, error_msg="Kernel positive odd int")
-                 params["clahe_clip_limit"]=get_val("clahe_clip_limit", float, 2.0, validation_func=lambda v: v >= 1.0, error_msg="Clip limit >= 1.0")
-                 params["clahe_tile_grid_size"]=get_val("clahe_tile_grid_size", str, "8,8", validation_func=lambda v_str: parse_tuple_str(v_str, 2, int) is not None and all(k>0 for k in parse_tuple_str(v_str,2,int) or [0,0]), error_msg="Tile 'w,h', positive ints")
-                 params["bilateral_d"]=get_val("bilateral_d", int, 9)
-                 params["bilateral_sigma_color"]=get_val("bilateral_sigma_color", float, 75.0); params["bilateral_sigma_space"]=get_val("bilateral_sigma_space", float, 75.0)
-                 params["canny_threshold1"]=get_val("canny_threshold1", float, 50.0); params["canny_threshold2"]=get_val("canny_threshold2", float, 150.0)
-            elif condition_type == TextOnScreenCondition.TYPE:
-                 params["target_text"] = get_val("target_text", str, ""); params["use_regex"] = get_val("use_regex", bool, False)
-                 if not params["target_text"] and not params["use_regex"]: raise ValueError("Target text cannot be empty if not using regex.")
-                 params["case_sensitive"] = get_val("case_sensitive", bool, False)
-                 params["ocr_language"] = get_val("ocr_language", str, "eng", required=True)
-                 params["ocr_psm"] = get_val("ocr_psm", str, "6", validation_func=lambda v: v.isdigit() and 0 <= int(v) <= 13, error_msg="PSM must be 0-13")
-                 params["ocr_char_whitelist"] = get_val("ocr_char_whitelist", str, "")
-                 params["user_words_file_path"] = get_val("user_words_file_path", str, "")
-                 params["grayscale"] = get_val("grayscale", bool, True); params["adaptive_threshold"] = get_val("adaptive_threshold", bool, True)
-                 params["median_blur"] = get_val("median_blur", bool, True); params["gaussian_blur"] = get_val("gaussian_blur", bool, False)
-                 params["clahe"] = get_val("clahe", bool, False)
-                 params["ocr_upscale_factor"]=get_val("ocr_upscale_factor", float, 1.0, validation_func=lambda v: v >= 1.0, error_msg="Upscale Factor >= 1.0")
-                 params["median_blur_kernel"]=get_val("median_blur_kernel", int, 3, validation_func=lambda v: v > 0 and v % 2 == 1, error_msg="Kernel positive odd int")
-                 params["gaussian_blur_kernel"]=get_val("gaussian_blur_kernel", str, "3,3", validation_func=lambda v_str: parse_tuple_str(v_str, 2, int) is not None and all(k>0 and k%2==1 for k in parse_tuple_str(v_str,2,int) or [0,0]), error_msg="Kernel 'w,h', positive odd ints")
-                 params["clahe_clip_limit"]=get_val("clahe_clip_limit", float, 2.0, validation_func=lambda v: v >= 1.0, error_msg="Clip limit >= 1.0")
-                 params["clahe_tile_grid_size"]=get_val("clahe_tile_grid_size", str, "8,8", validation_func=lambda v_str: parse_tuple_str(v_str, 2, int) is not None and all(k>0 for k in parse_tuple_str(v_str,2,int) or [0,0]), error_msg="Tile 'w,h', positive ints")
-            elif condition_type == WindowExistsCondition.TYPE:
-                params["window_title"] = get_val("window_title", str, ""); params["window_class"] = get_val("window_class", str, "")
-                if not params["window_title"] and not params["window_class"]: raise ValueError("Either Window Title or Window Class must be provided.")
-            elif condition_type == ProcessExistsCondition.TYPE: params["process_name"] = get_val("process_name", str, "", required=True)
-            elif condition_type == RegionColorCondition.TYPE:
-                if self._current_condition_obj and hasattr(self._current_condition_obj, 'params') and isinstance(self._current_condition_obj.params, dict):
-                    params["target_colors"] = self._current_condition_obj.params.get("target_colors", [])
-                else:
-                    params["target_colors"] = []
-
-                if not params["target_colors"] and get_val("condition_logic",str) in ["ANY_TARGET_MET_THRESHOLD", "ALL_TARGETS_MET_THRESHOLD"]:
-                     raise ValueError("At least one target color must be defined for the selected logic in RegionColorCondition.")
-
-                params["match_percentage_threshold"] = get_val("match_percentage_threshold", float, 75.0, validation_func=lambda v: 0.0 <= v <= 100.0, error_msg="Match Percentage must be 0-100")
-                params["sampling_step"] = get_val("sampling_step", int, 1, validation_func=lambda v: v >= 1, error_msg="Sampling Step must be >= 1")
-                params["condition_logic"] = get_val("condition_logic", str, "ANY_TARGET_MET_THRESHOLD")
-            elif condition_type == TextInRelativeRegionCondition.TYPE:
-                params["anchor_image_path"] = get_val("anchor_image_path", str, "", required=True)
-                params["anchor_matching_method"] = {"Template":"template","Feature":"feature"}.get(get_val("anchor_matching_method",str,"Template"), "template")
-                params["anchor_threshold"] = get_val("anchor_threshold", float, 0.8, validation_func=lambda v:0.0<=v<=1.0)
-
-                params["text_to_find"] = get_val("text_to_find", str, "")
-                params["ocr_use_regex"] = get_val("ocr_use_regex", bool, False)
-                if not params["text_to_find"] and not params["ocr_use_regex"]: raise ValueError("Text to find (or Regex) is required for relative region.")
-                params["ocr_case_sensitive"] = get_val("ocr_case_sensitive", bool, False)
-                params["ocr_language"] = get_val("ocr_language", str, "eng", required=True)
-                params["ocr_psm"] = get_val("ocr_psm", str, "6", validation_func=lambda v: v.isdigit() and 0<=int(v)<=13)
-                params["ocr_char_whitelist"] = get_val("ocr_char_whitelist", str, "")
-                params["ocr_user_words_file_path"] = get_val("ocr_user_words_file_path", str, "")
-
-                params["relative_x_offset"] = get_val("relative_x_offset", int, 0)
-                params["relative_y_offset"] = get_val("relative_y_offset", int, 0)
-                params["relative_width"] = get_val("relative_width", int, 50, validation_func=lambda v: v > 0)
-                params["relative_height"] = get_val("relative_height", int, 20, validation_func=lambda v: v > 0)
-                params["relative_to_corner"] = get_val("relative_to_corner", str, "top_left")
-            elif condition_type == MultiImageCondition.TYPE:
-                params["anchor_image_path"] = get_val("multi_anchor_image_path", str, "", required=True, error_msg="Anchor image path is required for Multi-Image pattern.")
-                params["anchor_threshold"] = get_val("multi_anchor_threshold", float, 0.8, validation_func=lambda v: 0.0 <= v <= 1.0, error_msg="Anchor threshold must be between 0.0 and 1.0.")
-                params["anchor_matching_method"] = {"Template":"template","Feature":"feature"}.get(get_val("multi_anchor_match_method",str,"Template"), "template")
-                params["sub_image_threshold"] = get_val("multi_sub_image_threshold", float, 0.8, validation_func=lambda v: 0.0 <= v <= 1.0)
-                params["sub_image_matching_method"] = {"Template":"template","Feature":"feature"}.get(get_val("multi_sub_image_match_method",str,"Template"), "template")
-                params["position_tolerance_x"] = get_val("multi_pos_tolerance_x", int, 5, validation_func=lambda v: v >=0)
-                params["position_tolerance_y"] = get_val("multi_pos_tolerance_y", int, 5, validation_func=lambda v: v >=0)
-                
-                cleaned_sub_images = []
-                for sub_data_item in self.multi_image_sub_images_data:
-                    cleaned_item = {
-                        "path": sub_data_item.get("path"),
-                        "offset_x_from_anchor": sub_data_item.get("offset_x_from_anchor"),
-                        "offset_y_from_anchor": sub_data_item.get("offset_y_from_anchor"),
-                    }
-                    if cleaned_item["path"] is not None and cleaned_item["offset_x_from_anchor"] is not None and cleaned_item["offset_y_from_anchor"] is not None:
-                        cleaned_sub_images.append(cleaned_item)
-                params["sub_images"] = cleaned_sub_images
-                if not params["sub_images"]:
-                    logger.warning("MultiImageCondition: No valid sub-images defined, condition might not work as expected.")
-
-
+            collector = self._param_collectors.get(condition_type)
+            if collector: collector(get_val, params)
         except ValueError as e: raise e
         except Exception as e: raise ValueError(f"Unexpected error collecting settings: {e}")
         return {"type": condition_type, "params": params}
 
+    def _collect_color_at_position_params(self, get_val: Callable[..., Any], params: Dict[str, Any]) -> None:
+        params["abs_color_x"] = get_val("abs_color_x", int, 0); params["abs_color_y"] = get_val("abs_color_y", int, 0)
+        hex_val = get_val("color_hex", str, "#000000", required=True)
+        try: hex_to_rgb(hex_val)
+        except ValueError as hex_e: raise ValueError(f"Invalid Target Color format: {hex_e}")
+        params["color_hex"] = hex_val
+        params["tolerance"] = get_val("tolerance", int, 0, validation_func=lambda v: 0 <= v <= 765, error_msg="Tolerance must be 0-765")
+
+    def _collect_image_on_screen_params(self, get_val: Callable[..., Any], params: Dict[str, Any]) -> None:
+        params["image_path"] = get_val("image_path", str, "", required=True)
+        method_display = get_val("matching_method", str, "Template"); params["matching_method"]=_MATCH_METHOD_D2I.get(method_display,"template")
+        params["template_matching_method"]=get_val("template_matching_method",str,"TM_CCOEFF_NORMED")
+        params["threshold"]=get_val("threshold",float,0.8, validation_func=lambda v: 0.0 <= v <= 1.0, error_msg="Threshold 0.0-1.0")
+        params["orb_nfeatures"]=get_val("orb_nfeatures",int,500, validation_func=lambda v: v >= 50, error_msg="ORB Features >= 50")
+        params["min_feature_matches"]=get_val("min_feature_matches",int,10, validation_func=lambda v: v >= 4, error_msg="Min Matches >= 4")
+        params["homography_inlier_ratio"]=get_val("homography_inlier_ratio",float,0.8, validation_func=lambda v: 0.1 <= v <= 1.0, error_msg="Inlier Ratio 0.1-1.0")
+        params["selection_strategy"] = get_val("selection_strategy", str, "first_found")
+        if params["selection_strategy"] == "closest_to_point":
+            ref_x = get_val("reference_point_x", int, None) 
+            ref_y = get_val("reference_point_y", int, None)
+            if ref_x is None or ref_y is None:
+                raise ValueError("Reference X and Y are required for 'closest_to_point' strategy.")
+            params["reference_point_for_closest_strategy"] = f"{ref_x},{ref_y}"
+        else:
+            params.pop("reference_point_for_closest_strategy", None)
+            params.pop("reference_point_x", None) 
+            params.pop("reference_point_y", None)
+
+        params["grayscale"]=get_val("grayscale", bool, True); params["binarization"]=get_val("binarization", bool, False)
+        params["gaussian_blur"]=get_val("gaussian_blur", bool, False); params["median_blur"]=get_val("median_blur", bool, False)
+        params["clahe"]=get_val("clahe", bool, False); params["bilateral_filter"]=get_val("bilateral_filter", bool, False)
+        params["canny_edges"]=get_val("canny_edges", bool, False)
+        params["gaussian_blur_kernel"]=get_val("gaussian_blur_kernel", str, "3,3", validation_func=_is_odd_kernel_2, error_msg="Kernel 'w,h', positive odd ints")
+        params["median_blur_kernel"]=get_val("median_blur_kernel", int, 3, validation_func=lambda v: v > 0 and v % 2 == 1, error_msg="Kernel positive odd int")
+        params["clahe_clip_limit"]=get_val("clahe_clip_limit", float, 2.0, validation_func=lambda v: v >= 1.0, error_msg="Clip limit >= 1.0")
+        params["clahe_tile_grid_size"]=get_val("clahe_tile_grid_size", str, "8,8", validation_func=_is_positive_pair, error_msg="Tile 'w,h', positive ints")
+        params["bilateral_d"]=get_val("bilateral_d", int, 9)
+        params["bilateral_sigma_color"]=get_val("bilateral_sigma_color", float, 75.0); params["bilateral_sigma_space"]=get_val("bilateral_sigma_space", float, 75.0)
+        params["canny_threshold1"]=get_val("canny_threshold1", float, 50.0); params["canny_threshold2"]=get_val("canny_threshold2", float, 150.0)
+
+    def _collect_text_on_screen_params(self, get_val: Callable[..., Any], params: Dict[str, Any]) -> None:
+        params["target_text"] = get_val("target_text", str, ""); params["use_regex"] = get_val("use_regex", bool, False)
+        if not params["target_text"] and not params["use_regex"]: raise ValueError("Target text cannot be empty if not using regex.")
+        params["case_sensitive"] = get_val("case_sensitive", bool, False)
+        params["ocr_language"] = get_val("ocr_language", str, "eng", required=True)
+        params["ocr_psm"] = get_val("ocr_psm", str, "6", validation_func=lambda v: v.isdigit() and 0 <= int(v) <= 13, error_msg="PSM must be 0-13")
+        params["ocr_char_whitelist"] = get_val("ocr_char_whitelist", str, "")
+        params["user_words_file_path"] = get_val("user_words_file_path", str, "")
+        params["grayscale"] = get_val("grayscale", bool, True); params["adaptive_threshold"] = get_val("adaptive_threshold", bool, True)
+        params["median_blur"] = get_val("median_blur", bool, True); params["gaussian_blur"] = get_val("gaussian_blur", bool, False)
+        params["clahe"] = get_val("clahe", bool, False)
+        params["ocr_upscale_factor"]=get_val("ocr_upscale_factor", float, 1.0, validation_func=lambda v: v >= 1.0, error_msg="Upscale Factor >= 1.0")
+        params["median_blur_kernel"]=get_val("median_blur_kernel", int, 3, validation_func=lambda v: v > 0 and v % 2 == 1, error_msg="Kernel positive odd int")
+        params["gaussian_blur_kernel"]=get_val("gaussian_blur_kernel", str, "3,3", validation_func=_is_odd_kernel_2, error_msg="Kernel 'w,h', positive odd ints")
+        params["clahe_clip_limit"]=get_val("clahe_clip_limit", float, 2.0, validation_func=lambda v: v >= 1.0, error_msg="Clip limit >= 1.0")
+        params["clahe_tile_grid_size"]=get_val("clahe_tile_grid_size", str, "8,8", validation_func=_is_positive_pair, error_msg="Tile 'w,h', positive ints")
+
+    def _collect_window_exists_params(self, get_val: Callable[..., Any], params: Dict[str, Any]) -> None:
+        params["window_title"] = get_val("window_title", str, ""); params["window_class"] = get_val("window_class", str, "")
+        if not params["window_title"] and not params["window_class"]: raise ValueError("Either Window Title or Window Class must be provided.")
+
+    def _collect_process_exists_params(self, get_val: Callable[..., Any], params: Dict[str, Any]) -> None:
+        params["process_name"] = get_val("process_name", str, "", required=True)
+
+    def _collect_region_color_params(self, get_val: Callable[..., Any], params: Dict[str, Any]) -> None:
+        if self._current_condition_obj and hasattr(self._current_condition_obj, 'params') and isinstance(self._current_condition_obj.params, dict):
+            params["target_colors"] = self._current_condition_obj.params.get("target_colors", [])
+        else:
+            params["target_colors"] = []
+
+        if not params["target_colors"] and get_val("condition_logic",str) in ["ANY_TARGET_MET_THRESHOLD", "ALL_TARGETS_MET_THRESHOLD"]:
+             raise ValueError("At least one target color must be defined for the selected logic in RegionColorCondition.")
+
+        params["match_percentage_threshold"] = get_val("match_percentage_threshold", float, 75.0, validation_func=lambda v: 0.0 <= v <= 100.0, error_msg="Match Percentage must be 0-100")
+        params["sampling_step"] = get_val("sampling_step", int, 1, validation_func=lambda v: v >= 1, error_msg="Sampling Step must be >= 1")
+        params["condition_logic"] = get_val("condition_logic", str, "ANY_TARGET_MET_THRESHOLD")
+
+    def _collect_text_in_relative_region_params(self, get_val: Callable[..., Any], params: Dict[str, Any]) -> None:
+        params["anchor_image_path"] = get_val("anchor_image_path", str, "", required=True)
+        params["anchor_matching_method"] = _MATCH_METHOD_D2I.get(get_val("anchor_matching_method",str,"Template"), "template")
+        params["anchor_threshold"] = get_val("anchor_threshold", float, 0.8, validation_func=lambda v:0.0<=v<=1.0)
+
+        params["text_to_find"] = get_val("text_to_find", str, "")
+        params["ocr_use_regex"] = get_val("ocr_use_regex", bool, False)
+        if not params["text_to_find"] and not params["ocr_use_regex"]: raise ValueError("Text to find (or Regex) is required for relative region.")
+        params["ocr_case_sensitive"] = get_val("ocr_case_sensitive", bool, False)
+        params["ocr_language"] = get_val("ocr_language", str, "eng", required=True)
+        params["ocr_psm"] = get_val("ocr_psm", str, "6", validation_func=lambda v: v.isdigit() and 0<=int(v)<=13)
+        params["ocr_char_whitelist"] = get_val("ocr_char_whitelist", str, "")
+        params["ocr_user_words_file_path"] = get_val("ocr_user_words_file_path", str, "")
+
+        params["relative_x_offset"] = get_val("relative_x_offset", int, 0)
+        params["relative_y_offset"] = get_val("relative_y_offset", int, 0)
+        params["relative_width"] = get_val("relative_width", int, 50, validation_func=lambda v: v > 0)
+        params["relative_height"] = get_val("relative_height", int, 20, validation_func=lambda v: v > 0)
+        params["relative_to_corner"] = get_val("relative_to_corner", str, "top_left")
+
+    def _collect_multi_image_params(self, get_val: Callable[..., Any], params: Dict[str, Any]) -> None:
+        params["anchor_image_path"] = get_val("multi_anchor_image_path", str, "", required=True, error_msg="Anchor image path is required for Multi-Image pattern.")
+        params["anchor_threshold"] = get_val("multi_anchor_threshold", float, 0.8, validation_func=lambda v: 0.0 <= v <= 1.0, error_msg="Anchor threshold must be between 0.0 and 1.0.")
+        params["anchor_matching_method"] = _MATCH_METHOD_D2I.get(get_val("multi_anchor_match_method",str,"Template"), "template")
+        params["sub_image_threshold"] = get_val("multi_sub_image_threshold", float, 0.8, validation_func=lambda v: 0.0 <= v <= 1.0)
+        params["sub_image_matching_method"] = _MATCH_METHOD_D2I.get(get_val("multi_sub_image_match_method",str,"Template"), "template")
+        params["position_tolerance_x"] = get_val("multi_pos_tolerance_x", int, 5, validation_func=lambda v: v >=0)
+        params["position_tolerance_y"] = get_val("multi_pos_tolerance_y", int, 5, validation_func=lambda v: v >=0)
+
+        cleaned_sub_images = []
+        for sub_data_item in self.multi_image_sub_images_data:
+            cleaned_item = {
+                "path": sub_data_item.get("path"),
+                "offset_x_from_anchor": sub_data_item.get("offset_x_from_anchor"),
+                "offset_y_from_anchor": sub_data_item.get("offset_y_from_anchor"),
+            }
+            if cleaned_item["path"] is not None and cleaned_item["offset_x_from_anchor"] is not None and cleaned_item["offset_y_from_anchor"] is not None:
+                cleaned_sub_images.append(cleaned_item)
+        params["sub_images"] = cleaned_sub_images
+        if not params["sub_images"]:
+            logger.warning("MultiImageCondition: No valid sub-images defined, condition might not work as expected.")
+
     def set_settings(self, condition_data: Dict[str, Any]) -> None:
         if not isinstance(condition_data, dict): return
-        self.initial_condition_data = copy.deepcopy(condition_data)
+        self.initial_condition_data = _clone_json(condition_data)
         self._current_condition_obj = create_condition(condition_data)
         new_internal_type = self._current_condition_obj.type
 
@@ -1964,104 +2723,147 @@ class ConditionSettings(ttk.Frame):
 
         current_display_key = self.type_var.get()
         if new_display_key != current_display_key: self.type_var.set(new_display_key) 
-        else: self._on_type_selected() 
+        else: self._on_type_selected(force=True) 
 
     def _populate_params(self, params_data: Dict[str, Any]) -> None:
          if not isinstance(params_data, dict): params_data = {}
-         current_type = self._filtered_action_condition_display_to_internal_map.get(self.type_var.get(), NoneCondition.TYPE)
+         current_type = self._current_type_internal
          defaults = self._get_default_params_for_current_type()
          for key, widget_info_list in self.param_widgets.items():
-             if key.startswith("_") or key in ["preview_label", "recognized_text_label", "capture_button", "capture_region_btn", "browse_btn", "capture_save_btn", "capture_ocr_btn", "preview_button", "separator", "browse_user_words_btn", "browse_anchor_btn", "capture_anchor_btn", "capture_color_region_btn", "capture_overall_region_btn", "browse_ocr_user_words_btn", "multi_image_add_anchor_btn", "multi_image_add_sub_btn", "multi_image_clear_button", "add_target_color_button", "edit_target_color_button", "remove_target_color_button", "analyze_top_n_button", "analyze_targets_button"]:
+             if key[:1] == "_" or key in _SKIP_PARAM_KEYS:
                  continue
              default_value = defaults.get(key)
              value_to_set = params_data.get(key, default_value)
 
-             if key == "matching_method" and current_type == ImageOnScreenCondition.TYPE:
-                 method_internal = str(value_to_set if value_to_set is not None else defaults.get("matching_method","template")).lower()
-                 method_display = "Template"
-                 if method_internal == "feature": method_display = "Feature"
-                 self._set_widget_value(key, method_display)
-             elif key == "anchor_matching_method" and current_type == TextInRelativeRegionCondition.TYPE:
-                 method_internal_anchor = str(value_to_set if value_to_set is not None else defaults.get("anchor_matching_method","template")).lower()
-                 method_display_anchor = "Template"
-                 if method_internal_anchor == "feature": method_display_anchor = "Feature"
-                 self._set_widget_value(key, method_display_anchor)
-             elif key == "multi_anchor_match_method" and current_type == MultiImageCondition.TYPE:
-                 method_internal_multi_anchor = str(value_to_set if value_to_set is not None else defaults.get("multi_anchor_match_method","template")).lower()
-                 method_display_multi_anchor = "Template"
-                 if method_internal_multi_anchor == "feature": method_display_multi_anchor = "Feature"
-                 self._set_widget_value(key, method_display_multi_anchor)
-             elif key == "multi_sub_image_match_method" and current_type == MultiImageCondition.TYPE:
-                 method_internal_multi_sub = str(value_to_set if value_to_set is not None else defaults.get("multi_sub_image_match_method","template")).lower()
-                 method_display_multi_sub = "Template"
-                 if method_internal_multi_sub == "feature": method_display_multi_sub = "Feature"
-                 self._set_widget_value(key, method_display_multi_sub)
+             if _MATCH_METHOD_KEY_TYPES.get(key) == current_type:
+                 method_internal = str(value_to_set if value_to_set is not None else defaults.get(key, "template")).lower()
+                 self._set_widget_value(key, _MATCH_METHOD_I2D.get(method_internal, "Template"))
              elif key == "reference_point_for_closest_strategy" and current_type == ImageOnScreenCondition.TYPE:
                  ref_point_tuple = parse_tuple_str(str(value_to_set), 2, int)
                  self._set_widget_value("reference_point_x", ref_point_tuple[0] if ref_point_tuple else "")
                  self._set_widget_value("reference_point_y", ref_point_tuple[1] if ref_point_tuple else "")
              else: self._set_widget_value(key, value_to_set, default=default_value)
 
-         if current_type == ImageOnScreenCondition.TYPE:
-              image_path = params_data.get("image_path", "")
-              if self.image_storage: self.after_idle(self._load_preview_image, image_path)
-              else: self.after_idle(self._clear_preview)
-              self.after_idle(self._toggle_ref_point_visibility) 
-         elif current_type == TextOnScreenCondition.TYPE or current_type == RegionColorCondition.TYPE or current_type == TextInRelativeRegionCondition.TYPE:
-              self.after_idle(self._clear_preview)
-              if current_type == TextOnScreenCondition.TYPE or current_type == TextInRelativeRegionCondition.TYPE:
-                  self.after_idle(self._recognized_text_var.set, "Recognized text preview...")
-              elif current_type == RegionColorCondition.TYPE:
-                  if hasattr(self, '_recognized_text_var'): self.after_idle(self._recognized_text_var.set, "")
-                  self.after_idle(self._populate_target_colors_treeview) 
-         elif current_type == MultiImageCondition.TYPE:
+         if current_type == MultiImageCondition.TYPE:
              self.multi_image_sub_images_data = [] 
              sub_images_raw = params_data.get("sub_images", [])
              if isinstance(sub_images_raw, list) and self.image_storage:
+                 # Entries go in immediately (get_settings needs path/offsets); images are decoded off the Tk thread.
                  for sub_data in sub_images_raw:
                      if isinstance(sub_data, dict) and sub_data.get("path"):
-                         try:
-                             pil_img = Image.open(self.image_storage.get_full_path(sub_data["path"]))
-                             self.multi_image_sub_images_data.append({
-                                 "path": sub_data["path"],
-                                 "pil_image": pil_img,
-                                 "offset_x_from_anchor": int(sub_data.get("offset_x_from_anchor",0)),
-                                 "offset_y_from_anchor": int(sub_data.get("offset_y_from_anchor",0)),
-                                 "canvas_item_id": None,
-                                 "current_canvas_x": 0,
-                                 "current_canvas_y": 0
-                             })
-                         except Exception as e:
-                             logger.error(f"Failed to load sub-image {sub_data.get('path')} for MultiImage: {e}")
+                         self.multi_image_sub_images_data.append({
+                             "path": sub_data["path"],
+                             "pil_image": None,
+                             "pil_thumb": None,
+                             "offset_x_from_anchor": int(sub_data.get("offset_x_from_anchor",0)),
+                             "offset_y_from_anchor": int(sub_data.get("offset_y_from_anchor",0)),
+                             "canvas_item_id": None,
+                             "current_canvas_x": 0,
+                             "current_canvas_y": 0
+                         })
+                 if self.multi_image_sub_images_data: self._load_sub_images_async(self.multi_image_sub_images_data)
              anchor_path = params_data.get("multi_anchor_image_path", "")
              if anchor_path and self.image_storage:
-                 try: self.multi_image_anchor_preview_image_pil = Image.open(self.image_storage.get_full_path(anchor_path))
-                 except: self.multi_image_anchor_preview_image_pil = None
-             else: self.multi_image_anchor_preview_image_pil = None
-             self.after_idle(self._multi_image_redraw_canvas)
-             self.after_idle(self._clear_preview) 
-             if hasattr(self, '_recognized_text_var'): self.after_idle(self._recognized_text_var.set, "")
-
-         else:
-            self.after_idle(self._clear_preview)
-            if hasattr(self, '_recognized_text_var'): self.after_idle(self._recognized_text_var.set, "")
-
+                 try: self._set_multi_image_anchor(Image.open(self.image_storage.get_full_path(anchor_path)))
+                 except: self._set_multi_image_anchor(None)
+             else: self._set_multi_image_anchor(None)
+         self.after_idle(self._finalize_populate, current_type, params_data)
+
+    def _finalize_populate(self, current_type: str, params_data: Dict[str, Any]) -> None:
+         # Deferred preview/canvas refresh for _populate_params, run as one idle callback.
+         if not self._widgets_alive: return
+         if current_type == ImageOnScreenCondition.TYPE:
+              if self.image_storage: self._load_preview_image(params_data.get("image_path", ""))
+              else: self._clear_preview()
+              self._toggle_ref_point_visibility()
+              return
+         if current_type == MultiImageCondition.TYPE: self._multi_image_redraw_canvas()
+         self._clear_preview()
+         if hasattr(self, '_recognized_text_var'):
+             self._recognized_text_var.set("Recognized text preview..." if current_type in _OCR_TEXT_TYPES else "")
+         if current_type == RegionColorCondition.TYPE: self._populate_target_colors_treeview()
+
+
+    def _load_sub_images_async(self, entries: List[Dict[str, Any]]) -> None:
+        entries = tuple(entries) # snapshot: results are matched to these entry objects, not to list positions
+        full_paths = [self.image_storage.get_full_path(entry["path"]) for entry in entries] # type: ignore[union-attr]
+        future = self._get_preview_pool().submit(self._load_sub_images_bg, full_paths, self._MI_SUB_THUMB_SIZE)
+        def _deliver(f: concurrent.futures.Future) -> None:
+            try: self.after(0, self._finalize_sub_images, entries, f)
+            except (tk.TclError, RuntimeError) as e: logger.debug(f"Could not schedule sub-image load result (widget likely destroyed): {e}")
+        future.add_done_callback(_deliver)
+
+    @classmethod
+    def _load_sub_images_bg(cls, full_paths: List[str], thumb_size: int) -> List[Any]:
+        results: List[Any] = []
+        for full_path in full_paths:
+            try:
+                # Only the thumbnail is ever drawn, so the source is never fully decoded here:
+                # JPEGs are drafted straight to thumbnail scale and the thumb doubles as the entry's image.
+                with Image.open(full_path) as pil_img: thumb = cls._make_multi_image_thumb(pil_img, thumb_size)
+                results.append((thumb, thumb))
+            except Exception as e: results.append(e)
+        return results
+
+    def _finalize_sub_images(self, entries: Tuple[Dict[str, Any], ...], future: concurrent.futures.Future) -> None:
+        if not self._widgets_alive: return
+        try: results = future.result()
+        except Exception as e: logger.error(f"Failed to load sub-images for MultiImage: {e}"); return
+        current = self.multi_image_sub_images_data
+        live_ids = {id(entry) for entry in current}
+        failed_ids = set()
+        for entry, result in zip(entries, results):
+            if id(entry) not in live_ids: continue # removed (or list reset) while decoding
+            if isinstance(result, Exception):
+                logger.error(f"Failed to load sub-image {entry.get('path')} for MultiImage: {result}"); failed_ids.add(id(entry))
+            elif entry.get("pil_image") is None: entry["pil_image"], entry["pil_thumb"] = result
+        if failed_ids: current[:] = [entry for entry in current if id(entry) not in failed_ids]
+        self._multi_image_redraw_canvas()
 
     def _get_default_params_for_current_type(self) -> Dict[str, Any]:
-        current_type = self._filtered_action_condition_display_to_internal_map.get(self.type_var.get(), NoneCondition.TYPE)
-        try:
-             default_cond = create_condition({"type": current_type, "params": {}})
-             return default_cond.params if default_cond and hasattr(default_cond, 'params') and isinstance(default_cond.params, dict) else {}
-        except Exception: return {}
+        current_type = self._current_type_internal
+        return self._default_params_for_type(current_type)
+
+    @classmethod
+    def _default_params_for_type(cls, condition_type: str) -> Dict[str, Any]:
+        # Shared template; callers that may mutate the result must clone it first.
+        cached = cls._default_params_cache.get(condition_type)
+        if cached is None:
+            try:
+                 default_cond = create_condition({"type": condition_type, "params": {}})
+                 cached = default_cond.params if default_cond and hasattr(default_cond, 'params') and isinstance(default_cond.params, dict) else {}
+            except Exception: return {}
+            cls._default_params_cache[condition_type] = cached
+        return cached
 
     def destroy(self) -> None:
+         self._widgets_alive = False
          if hasattr(self, 'canvas') and self.canvas and self.canvas.winfo_exists(): 
              self._unbind_mouse_wheel(self.canvas)
          if hasattr(self, 'param_frame') and self.param_frame and self.param_frame.winfo_exists(): 
              for child in list(self.param_frame.winfo_children()): self._unbind_recursive_mousewheel(child)
+         self._cancel_color_analysis()
+         self._preview_generation += 1
+         if self._preview_future is not None: self._preview_future.cancel(); self._preview_future = None
+         self._cancel_ocr_preview()
+         for after_attr in ('_scroll_refresh_after_id', '_wraplength_after_id', '_display_retry_after_id'):
+             after_id = getattr(self, after_attr, None)
+             if after_id:
+                 try: self.after_cancel(after_id)
+                 except tk.TclError: pass
+                 setattr(self, after_attr, None)
+         self._invalidate_color_analysis_cache()
          super().destroy()
 
     def _unbind_recursive_mousewheel(self, widget: tk.Widget) -> None:
-        if widget and widget.winfo_exists():
-            self._unbind_mouse_wheel(widget)
-            for child in list(widget.winfo_children()): self._unbind_recursive_mousewheel(child)
+        # Only the root needs the existence check; winfo_children() lists live widgets.
+        if not (widget and widget.winfo_exists()): return
+        bound = self._wheel_bound_widgets
+        stack = [widget]
+        while stack:
+            current = stack.pop()
+            bound.discard(str(current))
+            try:
+                current.unbind("<MouseWheel>"); current.unbind("<Button-4>"); current.unbind("<Button-5>")
+            except tk.TclError: pass
+            stack.extend(current.winfo_children())
@@ -1,4 +1,5 @@
 # utils/color_utils.py
+import functools
 import logging
 
 logger = logging.getLogger(__name__)
@@ -18,7 +19,11 @@ def hex_to_rgb(hex_color: str) -> tuple[int, int, int]:
     """
     if not isinstance(hex_color, str):
          raise ValueError(f"Input must be a string, got {type(hex_color)}.")
+    return _hex_to_rgb_cached(hex_color)
 
+
+@functools.lru_cache(maxsize=4096)
+def _hex_to_rgb_cached(hex_color: str) -> tuple[int, int, int]:
     hex_color = hex_color.lstrip('#')
     if len(hex_color) == 3:
         hex_color = ''.join([c*2 for c in hex_color])
@@ -26,9 +31,7 @@ def hex_to_rgb(hex_color: str) -> tuple[int, int, int]:
         raise ValueError(f"Invalid hex color format: '{hex_color}'. Must be 3 or 6 hexadecimal characters.")
 
     try:
-        r = int(hex_color[0:2], 16)
-        g = int(hex_color[2:4], 16)
-        b = int(hex_color[4:6], 16)
+        r, g, b = bytes.fromhex(hex_color)
         return (r, g, b)
     except ValueError as e:
          raise ValueError(f"Invalid hexadecimal characters in color code '{hex_color}': {e}") from e
@@ -52,9 +55,13 @@ def rgb_to_hex(rgb_color: tuple[int, int, int]) -> str:
     """
     if not isinstance(rgb_color, tuple) or len(rgb_color) != 3:
         raise ValueError(f"Input must be a 3-element tuple, got {type(rgb_color)} with length {len(rgb_color) if isinstance(rgb_color, (list, tuple)) else 'N/A'}.")
+    return _rgb_to_hex_cached(*rgb_color)
+
 
+@functools.lru_cache(maxsize=4096, typed=True)
+def _rgb_to_hex_cached(r: int, g: int, b: int) -> str:
+    rgb_color = (r, g, b)
     try:
-        r, g, b = rgb_color
         if not all(isinstance(c, int) and 0 <= c <= 255 for c in [r, g, b]):
             raise ValueError(f"Tuple elements must be integers between 0 and 255, got: {rgb_color}.")
 
@@ -20,11 +20,56 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+def _count_first_matches_inrange(
+    sampled_image: np.ndarray,
+    target_colors_with_tolerance: List[Tuple[Tuple[int, int, int], int]]
+) -> List[int]:
+    # One cv2.inRange pass per target; pixels already credited to an earlier
+    # target are masked out so each pixel counts toward its first match only.
+    sampled_image = np.ascontiguousarray(sampled_image)
+    unmatched_mask = np.full(sampled_image.shape[:2], 255, dtype=np.uint8)
+    counts: List[int] = []
+    for target_rgb_tuple, tolerance in target_colors_with_tolerance:
+        target_arr = np.asarray(target_rgb_tuple, dtype=np.int32)
+        lower = np.clip(target_arr - tolerance, 0, 255)
+        upper = np.clip(target_arr + tolerance, 0, 255)
+        if tolerance < 0 or np.any(lower > upper):
+            counts.append(0)
+            continue
+        in_range_mask = cv2.inRange(sampled_image, lower.astype(np.uint8), upper.astype(np.uint8))
+        cv2.bitwise_and(in_range_mask, unmatched_mask, dst=in_range_mask)
+        counts.append(cv2.countNonZero(in_range_mask))
+        cv2.subtract(unmatched_mask, in_range_mask, dst=unmatched_mask)
+    return counts
+
+
+def _count_first_matches_broadcast(
+    sampled_image: np.ndarray,
+    target_colors_with_tolerance: List[Tuple[Tuple[int, int, int], int]]
+) -> List[int]:
+    # Channel values are clamped to [0, 255] so every difference fits in int16,
+    # halving the (P, T, 3) intermediate compared to int32.
+    pixels = np.clip(sampled_image.reshape(-1, 3), 0, 255).astype(np.int16)
+    targets_arr = np.clip(np.asarray([t[0] for t in target_colors_with_tolerance]), 0, 255).astype(np.int16)
+    tolerances_arr = np.clip(np.asarray([t[1] for t in target_colors_with_tolerance]), -1, 255).astype(np.int16)
+
+    # (P, T) mask: pixel p lies within tolerance of target t on every channel,
+    # i.e. its largest per-channel delta is within tolerance.
+    match_mask = np.abs(pixels[:, None, :] - targets_arr[None, :, :]).max(axis=-1) <= tolerances_arr[None, :]
+    # A pixel is only credited to the first target it matches, as in the per-pixel loop.
+    any_match = match_mask.any(axis=1)
+    first_match_idx = match_mask.argmax(axis=1)[any_match]
+    return np.bincount(first_match_idx, minlength=len(target_colors_with_tolerance)).tolist()
+
+
 def analyze_region_colors(
     image_np_rgb: Optional[np.ndarray],
     target_colors_with_tolerance: List[Tuple[Tuple[int, int, int], int]],
-    sampling_step: int = 1
+    sampling_step: int = 1,
+    channel_order: str = "RGB"
 ) -> Dict[str, float]:
+    # channel_order="BGR" lets callers pass OpenCV captures as-is; targets stay RGB
+    # (and so do the returned hex keys), only the matching is done in BGR order.
     if image_np_rgb is None:
         logger.debug("analyze_region_colors: Input image_np_rgb is None.")
         return {}
@@ -43,35 +88,32 @@ def analyze_region_colors(
         logger.warning(f"analyze_region_colors: Invalid sampling_step {sampling_step}, using 1.")
         sampling_step = 1
 
+    hex_keys: List[str] = []
     color_pixel_counts: Dict[str, int] = {}
     for target_rgb_tuple, _ in target_colors_with_tolerance:
         try:
             hex_key = rgb_to_hex(target_rgb_tuple)
-            color_pixel_counts[hex_key] = 0
         except Exception as e_hex:
             logger.error(f"analyze_region_colors: Error converting target RGB {target_rgb_tuple} to HEX: {e_hex}")
-            color_pixel_counts[f"ERROR_RGB({target_rgb_tuple[0]},{target_rgb_tuple[1]},{target_rgb_tuple[2]})"] = 0
-
-
-    total_sampled_pixels = 0
-
-    for r_idx in range(0, height, sampling_step):
-        for c_idx in range(0, width, sampling_step):
-            total_sampled_pixels += 1
-            px_r, px_g, px_b = image_np_rgb[r_idx, c_idx]
+            hex_key = f"ERROR_RGB({target_rgb_tuple[0]},{target_rgb_tuple[1]},{target_rgb_tuple[2]})"
+        hex_keys.append(hex_key)
+        color_pixel_counts[hex_key] = 0
+
+    sampled_image = image_np_rgb[::sampling_step, ::sampling_step]
+    total_sampled_pixels = sampled_image.shape[0] * sampled_image.shape[1]
+
+    if total_sampled_pixels > 0:
+        match_targets = target_colors_with_tolerance
+        if channel_order == "BGR":
+            match_targets = [((rgb[2], rgb[1], rgb[0]), tol) for rgb, tol in target_colors_with_tolerance]
+        if sampled_image.dtype == np.uint8:
+            per_target_counts = _count_first_matches_inrange(sampled_image, match_targets)
+        else:
+            per_target_counts = _count_first_matches_broadcast(sampled_image, match_targets)
 
-            for target_rgb_tuple, tolerance in target_colors_with_tolerance:
-                target_r, target_g, target_b = target_rgb_tuple
-                if (abs(px_r - target_r) <= tolerance and
-                    abs(px_g - target_g) <= tolerance and
-                    abs(px_b - target_b) <= tolerance):
-                    try:
-                        hex_key = rgb_to_hex(target_rgb_tuple)
-                        if hex_key in color_pixel_counts: 
-                           color_pixel_counts[hex_key] += 1
-                    except Exception:
-                        pass
-                    break 
+        for hex_key, count in zip(hex_keys, per_target_counts):
+            if not hex_key.startswith("ERROR_RGB"):
+                color_pixel_counts[hex_key] += count
 
     if total_sampled_pixels == 0:
         logger.debug("analyze_region_colors: No pixels were sampled.")
@@ -85,6 +127,23 @@ def analyze_region_colors(
     return percentages
 
 
+def _histogram_3d_flat(sampled_image: np.ndarray, num_bins_per_channel: int) -> np.ndarray:
+    if sampled_image.dtype == np.uint8:
+        try:
+            hist = cv2.calcHist([np.ascontiguousarray(sampled_image)], [0, 1, 2], None,
+                                [num_bins_per_channel] * 3, [0, 256, 0, 256, 0, 256])
+            return np.rint(hist.ravel()).astype(np.int64)
+        except cv2.error as e:
+            logger.warning(f"_histogram_3d_flat: cv2.calcHist failed ({e}), falling back to NumPy.")
+
+    # Quantize each channel to its bin index exactly as a uniform [0, 256) histogram
+    # would, then pack (r, g, b) bin indices into one key so a single bincount pass
+    # yields the same flattened 3D histogram layout as calcHist.
+    quantized = (np.clip(sampled_image, 0, 255).astype(np.uint32) * num_bins_per_channel) >> 8
+    packed_keys = (quantized[..., 0] * num_bins_per_channel + quantized[..., 1]) * num_bins_per_channel + quantized[..., 2]
+    return np.bincount(packed_keys.ravel(), minlength=num_bins_per_channel ** 3)
+
+
 def get_top_n_colors_histogram_peaks(
     image_np_rgb: Optional[np.ndarray],
     n_colors: int,
@@ -129,71 +188,49 @@ def get_top_n_colors_histogram_peaks(
         logger.debug("get_top_n_colors_histogram_peaks: No pixels in sample for histogram.")
         return []
 
-    try:
-        hist = cv2.calcHist(
-            [sampled_image],
-            [0, 1, 2],
-            None,
-            [num_bins_per_channel, num_bins_per_channel, num_bins_per_channel],
-            [0, 256, 0, 256, 0, 256]
-        )
-        logger.debug(f"Histogram calculated. Shape: {hist.shape}, Max value: {np.max(hist)}")
-    except cv2.error as e:
-        logger.error(f"Error calculating 3D histogram: {e}")
-        return []
-    except Exception as e_hist:
-        logger.error(f"Unexpected error during histogram calculation: {e_hist}", exc_info=True)
-        return []
+    hist_flat = _histogram_3d_flat(sampled_image, num_bins_per_channel)
+    logger.debug(f"Histogram calculated. Bins: {hist_flat.shape[0]}, Max value: {hist_flat.max()}")
 
-    hist_flat = hist.flatten()
-    significant_bin_indices_flat = np.where(hist_flat > 0)[0]
+    significant_bin_indices_flat = np.flatnonzero(hist_flat)
 
     if significant_bin_indices_flat.size == 0:
         logger.debug("No significant bins (count > 0) found in histogram.")
         return []
 
-    significant_bin_values = hist_flat[significant_bin_indices_flat]
-    sorted_indices_of_significant_flat = significant_bin_indices_flat[np.argsort(significant_bin_values)[::-1]]
-
     bin_width = 256.0 / num_bins_per_channel
     peak_min_bin_index_dist = int(max(1, peak_min_distance_factor))
 
+    if peak_min_bin_index_dist <= 1 and significant_bin_indices_flat.size > n_colors:
+        # Distinct bins can never be "too close" at distance 1, so only the N largest matter.
+        top_candidates = significant_bin_indices_flat[np.argpartition(-hist_flat[significant_bin_indices_flat], n_colors - 1)[:n_colors]]
+        sorted_indices_of_significant_flat = top_candidates[np.argsort(-hist_flat[top_candidates], kind="stable")]
+    else:
+        sorted_indices_of_significant_flat = significant_bin_indices_flat[np.argsort(-hist_flat[significant_bin_indices_flat], kind="stable")]
 
+    bins_sq = num_bins_per_channel * num_bins_per_channel
+    extracted_bin_indices: List[Tuple[int, int, int]] = []
     extracted_colors_with_counts = []
-    for flat_idx in sorted_indices_of_significant_flat:
-        r_idx = flat_idx // (num_bins_per_channel * num_bins_per_channel)
-        remainder = flat_idx % (num_bins_per_channel * num_bins_per_channel)
+    for flat_idx in sorted_indices_of_significant_flat.tolist():
+        r_idx = flat_idx // bins_sq
+        remainder = flat_idx % bins_sq
         g_idx = remainder // num_bins_per_channel
         b_idx = remainder % num_bins_per_channel
 
-        r_val = int((r_idx + 0.5) * bin_width)
-        g_val = int((g_idx + 0.5) * bin_width)
-        b_val = int((b_idx + 0.5) * bin_width)
-        current_color_rgb = (r_val, g_val, b_val)
-        count = hist[r_idx, g_idx, b_idx]
-
         is_too_close_to_existing = False
-        for existing_rgb, _ in extracted_colors_with_counts:
-
-            existing_r_idx = int(existing_rgb[0] / bin_width)
-            existing_g_idx = int(existing_rgb[1] / bin_width)
-            existing_b_idx = int(existing_rgb[2] / bin_width)
-
-            dist_r = abs(r_idx - existing_r_idx)
-            dist_g = abs(g_idx - existing_g_idx)
-            dist_b = abs(b_idx - existing_b_idx)
-
-            if dist_r < peak_min_bin_index_dist and \
-               dist_g < peak_min_bin_index_dist and \
-               dist_b < peak_min_bin_index_dist:
+        for existing_r_idx, existing_g_idx, existing_b_idx in extracted_bin_indices:
+            if abs(r_idx - existing_r_idx) < peak_min_bin_index_dist and \
+               abs(g_idx - existing_g_idx) < peak_min_bin_index_dist and \
+               abs(b_idx - existing_b_idx) < peak_min_bin_index_dist:
                 is_too_close_to_existing = True
                 break
-        
+
         if not is_too_close_to_existing:
-            extracted_colors_with_counts.append((current_color_rgb, count))
-            if len(extracted_colors_with_counts) >= n_colors: 
+            current_color_rgb = (int((r_idx + 0.5) * bin_width), int((g_idx + 0.5) * bin_width), int((b_idx + 0.5) * bin_width))
+            extracted_bin_indices.append((r_idx, g_idx, b_idx))
+            extracted_colors_with_counts.append((current_color_rgb, int(hist_flat[flat_idx])))
+            if len(extracted_colors_with_counts) >= n_colors:
                 break
-    
+
     if not extracted_colors_with_counts:
         logger.debug("No distinct dominant colors extracted after proximity filtering.")
         return []
@@ -208,6 +245,67 @@ def get_top_n_colors_histogram_peaks(
     logger.debug(f"Final top {len(final_top_colors_with_percentage)} colors (Histogram Peaks): {final_top_colors_with_percentage}")
     return final_top_colors_with_percentage
 
+_EXACT_PROBE_PIXELS = 4096
+
+def _pack_rgb_keys(pixels_rgb: np.ndarray) -> np.ndarray:
+    # Packs (N, 3) RGB pixels into 24-bit uint32 keys (R<<16 | G<<8 | B).
+    # Exact tallies stay on np.unique: a bincount over 24-bit keys needs a 2^24-entry
+    # output, which costs far more than sorting the <=200k-pixel analysis samples.
+    pixels_u32 = (pixels_rgb if pixels_rgb.dtype == np.uint8 else np.clip(pixels_rgb, 0, 255)).astype(np.uint32)
+    return (pixels_u32[:, 0] << 16) | (pixels_u32[:, 1] << 8) | pixels_u32[:, 2]
+
+def get_top_n_exact_colors(
+    image_np_rgb: Optional[np.ndarray],
+    n_colors: int,
+    sampling_step: int = 1,
+    max_distinct_colors: Optional[int] = None,
+) -> Optional[List[Tuple[Tuple[int, int, int], float]]]:
+    # Returns None when the sample holds more than max_distinct_colors distinct
+    # colors, so callers can fall back to a binned method for noisy images.
+    if image_np_rgb is None:
+        logger.debug("get_top_n_exact_colors: Input image_np_rgb is None.")
+        return []
+    if not isinstance(image_np_rgb, np.ndarray) or image_np_rgb.ndim != 3 or image_np_rgb.shape[2] != 3:
+        logger.warning(f"get_top_n_exact_colors: Input image is not a valid RGB numpy array. Shape: {image_np_rgb.shape if isinstance(image_np_rgb, np.ndarray) else type(image_np_rgb)}")
+        return []
+    if n_colors <= 0:
+        logger.warning(f"get_top_n_exact_colors: n_colors must be positive, got {n_colors}.")
+        return []
+    if sampling_step < 1:
+        logger.warning(f"get_top_n_exact_colors: Invalid sampling_step {sampling_step}, using 1.")
+        sampling_step = 1
+
+    pixels = image_np_rgb[::sampling_step, ::sampling_step].reshape(-1, 3)
+    total_pixels_in_sample = pixels.shape[0]
+    if total_pixels_in_sample == 0:
+        logger.debug("get_top_n_exact_colors: No pixels in sample.")
+        return []
+
+    if max_distinct_colors is not None and total_pixels_in_sample > 2 * _EXACT_PROBE_PIXELS:
+        # A strided subsample can only under-count distinct colors, so exceeding the limit
+        # here proves the full sample does too; noisy captures bail out before the full pass.
+        probe_keys = np.sort(_pack_rgb_keys(pixels[::total_pixels_in_sample // _EXACT_PROBE_PIXELS]))
+        if 1 + np.count_nonzero(probe_keys[1:] != probe_keys[:-1]) > max_distinct_colors:
+            logger.debug(f"get_top_n_exact_colors: subsample already exceeds {max_distinct_colors} distinct colors.")
+            return None
+
+    unique_packed, counts = np.unique(_pack_rgb_keys(pixels), return_counts=True)
+    if max_distinct_colors is not None and unique_packed.size > max_distinct_colors:
+        logger.debug(f"get_top_n_exact_colors: {unique_packed.size} distinct colors exceeds limit {max_distinct_colors}.")
+        return None
+
+    if unique_packed.size > n_colors:
+        top_idx = np.argpartition(-counts, n_colors - 1)[:n_colors]
+    else:
+        top_idx = np.arange(unique_packed.size)
+    top_idx = top_idx[np.argsort(-counts[top_idx], kind="stable")]
+
+    result: List[Tuple[Tuple[int, int, int], float]] = []
+    for key, count in zip(unique_packed[top_idx].tolist(), counts[top_idx].tolist()):
+        result.append((((key >> 16) & 0xFF, (key >> 8) & 0xFF, key & 0xFF), (count / total_pixels_in_sample) * 100.0))
+    logger.debug(f"Top {len(result)} exact colors: {result}")
+    return result
+
 def get_top_n_colors_kmeans(
     image_np_rgb: Optional[np.ndarray],
     n_colors: int,